@@ -0,0 +1,48 @@
+import pandas as pd
+
+def resample_to(s, freq, how):
+    """
+    Resamples one series to the target frequency with an explicit aggregation.
+    Args:
+        freq (str): pandas offset alias of the target calendar (e.g. 'QS', 'W-WED').
+        how (str): Aggregation applied within each period ('last', 'mean', 'sum', ...).
+    Returns:
+        pd.Series: One value per period that had observations.
+    """
+    return s.dropna().resample(freq).agg(how).dropna()
+
+def asof_align(series_dict, index):
+    """
+    As-of joins series onto a target index: each column takes the latest value
+    known at or before each label. No union of the input indexes is built.
+    """
+    return pd.DataFrame(
+        {name: s.reindex(index, method='ffill') for name, s in series_dict.items()},
+        index=index
+    )
+
+def build_panel(series_dict, freq, aggregations):
+    """
+    Builds a compact panel on a single calendar.
+    Every series is resampled to `freq` with its declared aggregation, then as-of
+    joined onto the regular period index spanning the resampled series.
+    Args:
+        series_dict (dict): name -> pd.Series indexed by date. Missing names are skipped.
+        aggregations (dict): name -> aggregation for every column of the panel.
+    Returns:
+        pd.DataFrame: One row per period, or an empty frame if no series is available.
+    """
+    resampled = {}
+    for name, how in aggregations.items():
+        if name in series_dict and series_dict[name] is not None:
+            s = resample_to(series_dict[name], freq, how)
+            if not s.empty:
+                resampled[name] = s
+
+    if not resampled:
+        return pd.DataFrame()
+
+    start = min(s.index[0] for s in resampled.values())
+    end = max(s.index[-1] for s in resampled.values())
+    index = pd.date_range(start, end, freq=freq, name='DATE')
+    return asof_align(resampled, index)
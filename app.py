@@ -0,0 +1,286 @@
+import json
+import math
+
+import flask
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Dash, dcc, html, Input, Output, State, MATCH
+from dash.exceptions import PreventUpdate
+
+import metrics
+from dashboard_state import SnapshotStore, BackgroundRefresher, DEFAULT_REFRESH_INTERVAL
+from downsampling import DEFAULT_POINTS, downsample
+from fiscal_projection import PERCENTILES as PROJECTION_PERCENTILES
+from snapshots import to_bytes, to_json
+
+# How often open pages re-read the in-memory snapshot (never the upstream APIs)
+PAGE_POLL_INTERVAL = 60  # seconds
+
+MODULE_TABS = {
+    'module_1': 'U.S. Fiscal & Monetary Health',
+    'module_2': 'De-Dollarization',
+    'module_3': 'Physical vs. Financial Economy',
+    'module_4': 'Geopolitical Realignment'
+}
+
+def _is_number(value):
+    try:
+        return value is not None and not math.isnan(float(value))
+    except (TypeError, ValueError):
+        return False
+
+def kpi_card(label, value, fmt="{:,.2f}"):
+    """A single headline indicator; missing values render as 'N/A'."""
+    text = fmt.format(float(value)) if _is_number(value) else "N/A"
+    return html.Div([
+        html.Div(label, className='kpi-label'),
+        html.Div(text, className='kpi-value')
+    ], className='kpi-card', style={'display': 'inline-block', 'margin': '0 24px 12px 0'})
+
+def line_figure(title, series, x_range=None, points=DEFAULT_POINTS):
+    """
+    Line chart with one trace per snapshots.TimeSeries in `series` (name -> series); None entries are skipped.
+    Each trace is downsampled to `points`, within `x_range` ((start, end) epoch seconds) when zoomed.
+    """
+    fig = go.Figure()
+    for name, s in series.items():
+        if s is not None and len(s):
+            dates, values = downsample(s.dates, s.values, points, x_range=x_range)
+            fig.add_trace(go.Scatter(x=dates.astype('datetime64[s]'), y=values, mode='lines', name=name))
+    fig.update_layout(title=title, margin={'l': 40, 'r': 20, 't': 50, 'b': 40}, hovermode='x unified',
+                      uirevision=title)
+    if x_range is not None:
+        fig.update_xaxes(range=[np.datetime64(int(bound), 's') for bound in x_range])
+    return fig
+
+def chart_figure(snapshot, chart_id, x_range=None):
+    """Builds the figure of a chart() from the snapshot's full-resolution series."""
+    module = snapshot.module(chart_id['module'])
+    series = {label: module.series.get(name) for label, name in json.loads(chart_id['series']).items()}
+    return line_figure(chart_id['title'], series, x_range)
+
+def chart(snapshot, module_name, title, series_names):
+    """
+    A chart of snapshot series, `series_names` mapping trace labels to series names of the module.
+    The id carries everything needed to rebuild the figure, so zooming re-decimates on any server worker.
+    """
+    chart_id = {'type': 'chart', 'module': module_name, 'title': title, 'series': json.dumps(series_names)}
+    return dcc.Graph(id=chart_id, figure=chart_figure(snapshot, chart_id))
+
+def zoom_range(relayout):
+    """
+    Returns the x range of a Plotly relayout event as (start, end) epoch seconds, None when the
+    axis was reset to autorange, or False when the event did not change the x axis.
+    """
+    relayout = relayout or {}
+    if relayout.get('xaxis.autorange'):
+        return None
+    bounds = relayout.get('xaxis.range') or [relayout.get('xaxis.range[0]'), relayout.get('xaxis.range[1]')]
+    if any(bound is None for bound in bounds):
+        return False
+    return tuple(pd.Timestamp(bound).value // 10 ** 9 for bound in bounds)
+
+def render_module_1(snapshot):
+    module = snapshot.module('module_1')
+    return html.Div([
+        html.Div([
+            kpi_card("Fiscal Unsustainability Ratio", module.value('Fiscal_Unsustainability_Ratio'), "{:.1%}"),
+            kpi_card("Interest / Revenue", module.value('Interest_Revenue_Ratio'), "{:.1%}"),
+            kpi_card("Public Debt / GDP", module.value('PublicDebt_GDP'), "{:.1f}%"),
+            kpi_card("Fed Balance Sheet YoY", module.value('FedBalanceSheet_YoY'), "{:+.1%}"),
+            kpi_card("10Y Yield", module.value('Yield10Y'), "{:.2f}%"),
+            kpi_card("P(Ratio > 100%, 30y)", module.value('FUR_Crossing_Probability'), "{:.0%}"),
+            kpi_card("Median Crossing Year", module.value('FUR_Crossing_Year'), "{:.0f}")
+        ]),
+        chart(snapshot, 'module_1', "Fiscal Unsustainability", {
+            'Fiscal Unsustainability Ratio': 'Fiscal_Unsustainability_Ratio',
+            'Interest / Revenue': 'Interest_Revenue_Ratio'
+        }),
+        chart(snapshot, 'module_1', "Projected Fiscal Unsustainability Ratio (Monte Carlo percentiles)", {
+            f'P{p}': f'FUR_Projection_P{p}' for p in PROJECTION_PERCENTILES
+        }),
+        chart(snapshot, 'module_1', "Cost of Debt (Treasury Yields, %)", {
+            '2Y': 'Yield2Y',
+            '10Y': 'Yield10Y'
+        })
+    ])
+
+def render_module_2(snapshot):
+    module = snapshot.module('module_2')
+    return html.Div([
+        html.Div([
+            kpi_card("Trade Weighted USD Index", module.value('Dollar_Index')),
+            kpi_card("China US Debt Holdings ($B)", module.value('TIC_China'), "{:,.1f}"),
+            kpi_card("Japan US Debt Holdings ($B)", module.value('TIC_Japan'), "{:,.1f}"),
+            kpi_card("Total Foreign Holdings ($B)", module.value('Foreign_Holdings_Total'), "{:,.0f}"),
+            kpi_card("China Reserves ($T)", module.value('China_Reserves')),
+            kpi_card("Gold", module.value('Gold'), "${:,.2f}"),
+            kpi_card("Bitcoin", module.value('Bitcoin'), "${:,.0f}")
+        ]),
+        chart(snapshot, 'module_2', "U.S. Dollar Dominance (DTWEXBGS)", {
+            'Dollar Index': 'Dollar_Index'
+        }),
+        chart(snapshot, 'module_2', "Neutral Assets (rebased to 100)", {
+            'Gold': 'Gold_Index',
+            'Bitcoin': 'Bitcoin_Index'
+        }),
+        html.Div([
+            kpi_card("Gold 1Y Z-Score", module.value('Gold_ZScore'), "{:+.2f}"),
+            kpi_card("Dollar Index 1Y Z-Score", module.value('Dollar_Index_ZScore'), "{:+.2f}"),
+            kpi_card("Gold YoY", module.value('Gold_YoY'), "{:+.1%}"),
+            kpi_card("Bitcoin Drawdown (1Y high)", module.value('Bitcoin_Drawdown'), "{:.1%}")
+        ]),
+        chart(snapshot, 'module_2', "Rolling Correlations (63-day log changes)", {
+            'Gold vs Dollar Index': 'Gold_Dollar_Correlation',
+            'Bitcoin vs 10Y Yield': 'Bitcoin_10Y_Correlation'
+        })
+    ])
+
+def render_module_3(snapshot):
+    module = snapshot.module('module_3')
+    return html.Div([
+        html.Div([
+            kpi_card("Oil Price (WTI)", module.value('Oil'), "${:,.2f}"),
+            kpi_card("Energy-Value of Money (Barrels/Bond)", module.value('Energy_Value')),
+            kpi_card("Copper", module.value('Copper'), "${:,.2f}"),
+            kpi_card("Wheat", module.value('Wheat'), "${:,.2f}"),
+            kpi_card("Corn", module.value('Corn'), "${:,.2f}")
+        ]),
+        chart(snapshot, 'module_3', "Energy-Value of Money (Barrels of Oil per 10Y Bond)", {
+            'Energy Value': 'Energy_Value'
+        }),
+        chart(snapshot, 'module_3', "Key Commodities (rebased to 100)", {
+            name: f'{name}_Index' for name in ['Copper', 'Wheat', 'Corn']
+        }),
+        chart(snapshot, 'module_3', "Copper vs Industrial Production (24-month correlation of log changes)", {
+            'Correlation': 'Copper_IndPro_Correlation'
+        })
+    ])
+
+def render_module_4(snapshot):
+    module = snapshot.module('module_4')
+    news_volume = {name.split('.', 1)[1]: name for name in module.series if name.startswith('News_Volume.')}
+    return html.Div([
+        html.Div([
+            kpi_card("US-China Trade Balance ($M)", module.value('US_China_Trade_Balance'), "{:,.0f}"),
+            kpi_card("US Manufacturing % of GDP", module.value('Manuf_GDP_Share'), "{:.1f}%"),
+            kpi_card("GDP Nominal USA ($T)", _scaled(module.value('GDP_Nominal_USA'), 1e12)),
+            kpi_card("GDP Nominal China ($T)", _scaled(module.value('GDP_Nominal_CHN'), 1e12)),
+            kpi_card("GDP PPP USA ($T)", _scaled(module.value('GDP_PPP_USA'), 1e12)),
+            kpi_card("GDP PPP China ($T)", _scaled(module.value('GDP_PPP_CHN'), 1e12))
+        ]),
+        chart(snapshot, 'module_4', "\"Prevailing Ism\" News Volume (articles)", news_volume)
+    ])
+
+def _scaled(value, divisor):
+    return float(value) / divisor if _is_number(value) else None
+
+RENDERERS = {
+    'module_1': render_module_1,
+    'module_2': render_module_2,
+    'module_3': render_module_3,
+    'module_4': render_module_4
+}
+
+def render_tab(tab, snapshot):
+    """Renders one module from the precomputed snapshot; never calls a fetcher."""
+    if snapshot is None:
+        return html.Div("Loading data... the first snapshot is still being built.")
+    return RENDERERS[tab](snapshot)
+
+def _age(seconds):
+    for unit, size in (('d', 86400), ('h', 3600), ('min', 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f} {unit} old"
+    return "just now"
+
+def snapshot_status(snapshot):
+    if snapshot is None:
+        return "Waiting for first data refresh"
+    status = f"Data as of {snapshot.built_at:%Y-%m-%d %H:%M}"
+    if snapshot.stale:
+        stale = ', '.join(f"{key} ({_age(age)})" for key, age in sorted(snapshot.stale.items()))
+        status += f" · last good data for {stale}"
+    return status
+
+def create_app(store, refresher=None):
+    """
+    Creates the Dash app. Every callback reads only `store`'s in-memory snapshot.
+    Args:
+        refresher (BackgroundRefresher): Started on the first request the app serves, so it runs
+            in every server process (including forked WSGI workers), not only under `python app.py`.
+    """
+    app = Dash(__name__, title="Polycrisis Dashboard")
+    app.layout = html.Div([
+        html.H1("Polycrisis Dashboard"),
+        html.Div(id='snapshot-status'),
+        dcc.Tabs(id='module-tabs', value='module_1',
+                 children=[dcc.Tab(label=label, value=tab) for tab, label in MODULE_TABS.items()]),
+        html.Div(id='tab-content'),
+        dcc.Interval(id='snapshot-poll', interval=PAGE_POLL_INTERVAL * 1000)
+    ])
+
+    if refresher is not None:
+        @app.server.before_request
+        def start_refresher():
+            refresher.start()
+
+    @app.callback(
+        Output('tab-content', 'children'),
+        Output('snapshot-status', 'children'),
+        Input('module-tabs', 'value'),
+        Input('snapshot-poll', 'n_intervals')
+    )
+    def update_tab(tab, _):
+        snapshot = store.get()
+        return render_tab(tab, snapshot), snapshot_status(snapshot)
+
+    # Zooming or panning re-decimates the chart's traces at full resolution within the new range
+    @app.callback(
+        Output({'type': 'chart', 'module': MATCH, 'title': MATCH, 'series': MATCH}, 'figure'),
+        Input({'type': 'chart', 'module': MATCH, 'title': MATCH, 'series': MATCH}, 'relayoutData'),
+        State({'type': 'chart', 'module': MATCH, 'title': MATCH, 'series': MATCH}, 'id'),
+        prevent_initial_call=True
+    )
+    def zoom_chart(relayout, chart_id):
+        x_range = zoom_range(relayout)
+        snapshot = store.get()
+        if x_range is False or snapshot is None:
+            raise PreventUpdate
+        return chart_figure(snapshot, chart_id, x_range)
+
+    # The typed snapshot for dashboard workers and web clients: compact binary, or JSON
+    @app.server.route('/snapshot.bin')
+    def binary_snapshot():
+        snapshot = store.get()
+        if snapshot is None:
+            return flask.Response(status=503)
+        return flask.Response(to_bytes(snapshot), mimetype='application/octet-stream')
+
+    @app.server.route('/snapshot.json')
+    def json_snapshot():
+        snapshot = store.get()
+        if snapshot is None:
+            return flask.Response(status=503)
+        return flask.Response(to_json(snapshot), mimetype='application/json')
+
+    @app.server.route('/metrics')
+    def prometheus_metrics():
+        return flask.Response(metrics.to_prometheus(), mimetype='text/plain')
+
+    @app.server.route('/metrics.json')
+    def json_metrics():
+        return flask.jsonify(metrics.snapshot())
+
+    return app
+
+store = SnapshotStore()
+refresher = BackgroundRefresher(store, interval=DEFAULT_REFRESH_INTERVAL)
+app = create_app(store, refresher)
+# WSGI entry point, e.g. `gunicorn app:server`
+server = app.server
+
+if __name__ == "__main__":
+    refresher.start()
+    app.run(debug=False)
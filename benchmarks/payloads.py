@@ -0,0 +1,237 @@
+"""
+Synthetic upstream payloads for the offline benchmarks.
+Base sizes match the real full-history responses; `scale` multiplies the number of
+observations (FRED, Yahoo, GDELT) or table rows (TIC, World Bank).
+"""
+import json
+import urllib.parse
+
+import numpy as np
+import pandas as pd
+
+from fred_cache import FRED_CSV_URL
+from vintage_store import ALFRED_URL
+from fetch_tic_data import TIC_URL
+from fetch_gdelt_news import GDELT_DOC_URL
+from world_bank import WB_API_URL, PER_PAGE
+
+# Last observation date of every synthetic history
+END_DATE = pd.Timestamp('2024-06-28')
+
+# pandas datetime64[ns] cannot represent dates before 1677
+EARLIEST_DATE = pd.Timestamp('1700-01-01')
+
+# Native frequency of each FRED series the dashboard uses; anything else is monthly
+FRED_FREQUENCIES = {
+    'DTWEXBGS': 'B',
+    'WALCL': 'W-WED',
+    'W006RC1Q027SBEA': 'QS',
+    'A091RC1Q027SBEA': 'QS',
+    'GFDEGDQ188S': 'QS',
+    'GDP': 'QS',
+    'FDHBFIN': 'QS'
+}
+
+# Rows in the real full history at each frequency
+BASE_ROWS = {
+    'B': 2610,      # Broad dollar index, 10 years
+    'W-WED': 1170,  # H.4.1 since 2002
+    'MS': 860,      # Monthly series since 1953
+    'QS': 310       # NIPA since 1947
+}
+
+BASE_TICKER_ROWS = 365
+
+# Releases after the first that still revise a synthetic ALFRED observation (advance, second, third estimate)
+ALFRED_REVISIONS = 3
+# Days from the end of a period to the release of its first estimate
+ALFRED_RELEASE_LAG = 30
+BASE_TIC_COUNTRIES = 40
+TIC_MONTHS = 13
+BASE_WB_YEARS = 11
+GDELT_BASE_POINTS = 8640  # 3 months at 15-minute resolution
+
+def synthetic_dates(freq, periods):
+    """
+    Returns `periods` dates ending at END_DATE at the native frequency. Histories that would
+    start before EARLIEST_DATE are spread evenly over the representable range instead.
+    """
+    try:
+        dates = pd.date_range(end=END_DATE, periods=periods, freq=freq)
+        if dates[0] >= EARLIEST_DATE:
+            return dates
+    except (OverflowError, pd.errors.OutOfBoundsDatetime):
+        pass
+    return pd.date_range(start=EARLIEST_DATE, end=END_DATE, periods=periods)
+
+def random_walk(n, start=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return start * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+def fred_csv(series_id, scale=1):
+    """A fredgraph.csv body for the full (scaled) history of `series_id`."""
+    freq = FRED_FREQUENCIES.get(series_id, 'MS')
+    dates = synthetic_dates(freq, BASE_ROWS[freq] * scale)
+    values = random_walk(len(dates), seed=len(series_id))
+    # FRED marks missing observations with '.'
+    text = np.char.mod('%.3f', values).astype(object)
+    text[::97] = '.'
+    # Evenly spread 100x histories are denser than one observation per day
+    fmt = '%Y-%m-%d' if (dates == dates.normalize()).all() else '%Y-%m-%d %H:%M:%S'
+    lines = [f"DATE,{series_id}"]
+    lines.extend(f"{d},{v}" for d, v in zip(dates.strftime(fmt), text))
+    return "\n".join(lines)
+
+def alfred_observations(series_id, scale=1):
+    """
+    An ALFRED observations response holding every vintage of a quarterly series. Each release,
+    ALFRED_RELEASE_LAG days after a period ends, publishes that period and revises the
+    ALFRED_REVISIONS periods before it.
+    """
+    periods = synthetic_dates('QS', BASE_ROWS['QS'] * scale)
+    # A period ends where the next one starts (evenly spread 100x histories are not quarterly)
+    ends = periods[1:].append(pd.DatetimeIndex([periods[-1] + (periods[-1] - periods[-2])]))
+    releases = (ends + pd.Timedelta(days=ALFRED_RELEASE_LAG)).strftime('%Y-%m-%d')
+    dates = periods.strftime('%Y-%m-%d')
+    values = random_walk(len(periods), seed=len(series_id))
+    rng = np.random.default_rng(4)
+    observations = []
+    for k, period in enumerate(dates):
+        last = min(k + ALFRED_REVISIONS, len(periods) - 1)
+        for j in range(k, last + 1):
+            end = (pd.Timestamp(releases[j + 1]) - pd.Timedelta(days=1)).strftime('%Y-%m-%d') if j < last else '9999-12-31'
+            value = values[k] * (1 + rng.normal(0, 0.002) * (last - j))
+            observations.append({"realtime_start": releases[j], "realtime_end": end, "date": period, "value": f"{value:.3f}"})
+    return {"realtime_start": "1776-07-04", "realtime_end": "9999-12-31", "count": len(observations),
+            "observations": observations}
+
+def yahoo_close(tickers, scale=1):
+    """A yf.download() result: 'Close' (and 'Volume') column levels over every ticker."""
+    dates = synthetic_dates('D', BASE_TICKER_ROWS * scale)
+    closes = {ticker: random_walk(len(dates), seed=i) for i, ticker in enumerate(tickers)}
+    # Futures do not trade on weekends
+    weekend = dates.dayofweek >= 5
+    for ticker in tickers:
+        if ticker != 'BTC-USD':
+            closes[ticker][weekend] = np.nan
+    close = pd.DataFrame(closes, index=dates)
+    return pd.concat({'Close': close, 'Volume': close * 1000}, axis=1)
+
+def yahoo_chart(ticker, scale=1):
+    """A v8 finance/chart response with daily closes for `ticker`."""
+    dates = synthetic_dates('D', BASE_TICKER_ROWS * scale)
+    closes = random_walk(len(dates), seed=sum(map(ord, ticker)))
+    timestamps = ((dates - pd.Timestamp(0)) // pd.Timedelta(seconds=1) + 14 * 3600).tolist()  # Session close, UTC
+    close = [round(float(v), 4) for v in closes]
+    return {"chart": {"result": [{
+        "meta": {"symbol": ticker, "currency": "USD", "dataGranularity": "1d"},
+        "timestamp": timestamps,
+        "indicators": {"quote": [{"close": close}], "adjclose": [{"adjclose": close}]}
+    }], "error": None}}
+
+def mfh_text(scale=1):
+    """A full mfh.txt release with BASE_TIC_COUNTRIES * scale country rows."""
+    months = pd.date_range(end=END_DATE, periods=TIC_MONTHS, freq='MS')[::-1]
+    width = 9
+    lines = [
+        "                        MAJOR FOREIGN HOLDERS OF TREASURY SECURITIES",
+        "                                 (in billions of dollars)",
+        "",
+        " " * 24 + "".join(f"{m.year:>{width}}" for m in months),
+        "        Country" + " " * 9 + "".join(f"{m.strftime('%b'):>{width}}" for m in months),
+        ""
+    ]
+    countries = ['Japan', 'China, Mainland'] + [f'Country {i}' for i in range(BASE_TIC_COUNTRIES * scale - 2)]
+    rng = np.random.default_rng(1)
+    for country in countries:
+        values = rng.uniform(1, 1200, TIC_MONTHS)
+        lines.append(f"        {country:<16}" + "".join(f"{v:>{width}.1f}" for v in values))
+    lines.append("        Grand Total     " + "".join(f"{8600.0:>{width}.1f}" for _ in months))
+    lines += ["", " Of which:", "        For. Official   " + "".join(f"{3800.0:>{width}.1f}" for _ in months)]
+    return "\n".join(lines)
+
+def world_bank_entries(indicators, countries, scale=1):
+    """Every entry a WDI request returns, padded with scale - 1 synthetic countries per requested one."""
+    countries = list(countries) + [f'X{i:02d}' for i in range(len(countries) * (scale - 1))]
+    years = range(END_DATE.year - BASE_WB_YEARS + 1, END_DATE.year + 1)
+    rng = np.random.default_rng(2)
+    return [
+        {"indicator": {"id": indicator}, "countryiso3code": country, "date": str(year),
+         "value": None if year == END_DATE.year else float(rng.uniform(1e9, 3e13))}
+        for indicator in indicators for country in countries for year in years
+    ]
+
+def world_bank_page(entries, page):
+    pages = max(1, -(-len(entries) // PER_PAGE))
+    rows = entries[(page - 1) * PER_PAGE:page * PER_PAGE]
+    return [{"page": page, "pages": pages, "per_page": PER_PAGE, "total": len(entries)}, rows]
+
+def gdelt_timeline(scale=1):
+    dates = pd.date_range(end=END_DATE, periods=GDELT_BASE_POINTS * scale, freq='15min')
+    values = np.random.default_rng(3).integers(0, 50, len(dates))
+    data = [{"date": d, "value": int(v)} for d, v in zip(dates.strftime('%Y%m%dT%H%M%SZ'), values)]
+    return {"query_details": {}, "timeline": [{"series": "Article Count", "data": data}]}
+
+GDELT_ARTICLES = {"articles": [{"url": "https://example.com/a", "title": "Tariffs and trade", "seendate": "20240628T120000Z"}]}
+
+class Payload:
+    """The subset of requests.Response the fetchers use."""
+
+    def __init__(self, body, status_code=200):
+        self.status_code = status_code
+        self.content = body if isinstance(body, bytes) else body.encode('utf-8')
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_lines(self):
+        return iter(self.content.splitlines())
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+class PayloadServer:
+    """
+    Stands in for http_client.get and yfinance.download, serving pre-rendered payloads.
+    Payloads are rendered once per scale, so benchmarks measure fetching and parsing only.
+    """
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        self._bodies = {}
+
+    def _body(self, key, render):
+        if key not in self._bodies:
+            body = render()
+            self._bodies[key] = body.encode('utf-8') if isinstance(body, str) else body
+        return self._bodies[key]
+
+    def get(self, url, params=None, **kwargs):
+        params = params or {}
+        if url.startswith(FRED_CSV_URL):
+            series_id = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)['id'][0]
+            return Payload(self._body(('fred', series_id), lambda: fred_csv(series_id, self.scale)))
+        if url.startswith(ALFRED_URL):
+            series_id = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)['series_id'][0]
+            return Payload(self._body(('alfred', series_id), lambda: json.dumps(alfred_observations(series_id, self.scale))))
+        if url == TIC_URL:
+            return Payload(self._body('tic', lambda: mfh_text(self.scale)))
+        if url.startswith(WB_API_URL):
+            path = url[len(WB_API_URL):].split('/')
+            countries, indicators = path[2].split(';'), path[4].split(';')
+            entries = self._body(('wb', url), lambda: world_bank_entries(indicators, countries, self.scale))
+            return Payload(json.dumps(world_bank_page(entries, params.get('page', 1))))
+        if url == GDELT_DOC_URL:
+            if params.get('mode', '').startswith('timeline'):
+                return Payload(self._body('gdelt', lambda: json.dumps(gdelt_timeline(self.scale))))
+            return Payload(json.dumps(GDELT_ARTICLES))
+        return Payload("Not found", status_code=404)
+
+    def download(self, tickers, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        return self._body(('yahoo', tuple(tickers)), lambda: yahoo_close(tickers, self.scale))
@@ -0,0 +1,331 @@
+"""
+Offline benchmarks for the parsers, the fetchers and the module aggregators.
+
+Every upstream call is served from synthetic payloads (see payloads.py), with a cold
+on-disk cache for each run. Reports wall time, tracemalloc peak and the memory blocks
+each function still holds when it returns, at each history scale.
+
+Usage (from the repository root):
+    python -m benchmarks.run                       # all benchmarks at 1x, 10x, 100x
+    python -m benchmarks.run --scales 1 10 -k parse
+    python -m benchmarks.run --json results.json --compare baseline.json
+    python -m benchmarks.run --profile fetch_fiscal_data --scales 10
+"""
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import http_client
+import market_data
+import fetch_gdelt_news
+from fred_cache import parse_fred_csv
+from tic_parser import parse_mfh_lines
+from parsing import read_fred_csv, world_bank_columns, pa
+from fetch_fiscal_data import fetch_fiscal_data
+from fetch_module_2_data import fetch_module_2_data
+from fetch_module_3_data import fetch_module_3_data
+from fetch_module_4_data import fetch_module_4_data, WB_SERIES, ECONOMIC_SCALE_COUNTRIES
+from fetch_tic_data import fetch_tic_data
+from fetch_all_data import fetch_all_modules
+from dashboard_state import build_snapshot
+import snapshots
+import vintage_store
+from rolling_analytics import DAILY_ANALYTICS, AnalyticsEngine
+import fiscal_projection
+import downsampling
+
+from benchmarks import payloads
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_REPEAT = 3
+
+# A benchmark whose median grows by more than this factor over the baseline is a regression
+DEFAULT_THRESHOLD = 1.25
+
+def legacy_fred_csv(body, series_id):
+    """The text path parse_fred_csv replaced: decode, StringIO, inferred dates and dtypes. Kept as the baseline."""
+    df = pd.read_csv(io.StringIO(body.decode('utf-8')), index_col=0, parse_dates=True, na_values='.')
+    return pd.to_numeric(df[series_id], errors='coerce')
+
+def parse_benchmarks(scale):
+    """
+    name -> zero-argument callable. Inputs are rendered up front, so only parsing is timed.
+    Daily DTWEXBGS is parsed by the legacy text path and by each engine of the bytes path
+    (tracemalloc does not see pyarrow's own memory pool, so its peak excludes the Arrow buffers).
+    """
+    fred_body = payloads.fred_csv('DTWEXBGS', scale).encode('utf-8')
+    tic_lines = payloads.mfh_text(scale).splitlines()
+    indicators = list(WB_SERIES.values())
+    entries = payloads.world_bank_entries(indicators, ECONOMIC_SCALE_COUNTRIES, scale)
+    wb_pages = [json.dumps(payloads.world_bank_page(entries, page))
+                for page in range(1, payloads.world_bank_page(entries, 1)[0]['pages'] + 1)]
+    gdelt_body = json.dumps(payloads.gdelt_timeline(scale))
+
+    def parse_world_bank():
+        return [world_bank_columns(json.loads(page)[1], indicators, ECONOMIC_SCALE_COUNTRIES) for page in wb_pages]
+
+    benchmarks = {
+        'parse:fred_csv_legacy': lambda: legacy_fred_csv(fred_body, 'DTWEXBGS'),
+        'parse:fred_csv': lambda: parse_fred_csv(fred_body, 'DTWEXBGS'),
+        'parse:fred_csv_c': lambda: read_fred_csv(fred_body, engine='c'),
+        'parse:tic_mfh': lambda: parse_mfh_lines(tic_lines),
+        'parse:world_bank_json': parse_world_bank,
+        'parse:gdelt_timeline_json': lambda: fetch_gdelt_news.parse_timeline(json.loads(gdelt_body))
+    }
+    if pa is not None:
+        benchmarks['parse:fred_csv_pyarrow'] = lambda: read_fred_csv(fred_body, engine='pyarrow')
+    return benchmarks
+
+def pandas_rolling_metrics(panel, spec):
+    """Full recomputation of the rolling metrics with pandas .rolling(), the baseline for the engine."""
+    window, lag = spec['window'], spec['lag']
+    out = {}
+    for name in spec['aggregations']:
+        s = panel[name].dropna()
+        out[f'{name}_ZScore'] = (s - s.rolling(window).mean()) / s.rolling(window).std()
+        out[f'{name}_YoY'] = s.pct_change(lag)
+        out[f'{name}_Drawdown'] = s / s.rolling(window).max() - 1
+    changes = np.log(panel).diff()
+    for pair, (a, b) in spec['pairs'].items():
+        out[f'{pair}_Correlation'] = changes[a].rolling(spec['correlation_window']).corr(changes[b])
+    return pd.DataFrame(out, index=panel.index)
+
+def analytics_benchmarks(scale):
+    """
+    Rolling metrics of the daily analytics panel over the (scaled) daily dollar-index history:
+    the vectorized backfill, the pandas full recomputation it replaces, and one streamed row.
+    """
+    dates = payloads.synthetic_dates('B', payloads.BASE_ROWS['B'] * scale)
+    panel = pd.DataFrame({name: payloads.random_walk(len(dates), seed=i)
+                          for i, name in enumerate(DAILY_ANALYTICS['aggregations'])}, index=dates)
+    engine = AnalyticsEngine(DAILY_ANALYTICS)
+    engine.backfill(panel)
+    row = panel.iloc[-1].to_dict()
+    return {
+        'analytics:backfill': lambda: AnalyticsEngine(DAILY_ANALYTICS).backfill(panel),
+        'analytics:pandas_rolling': lambda: pandas_rolling_metrics(panel, DAILY_ANALYTICS),
+        'analytics:update_row': lambda: engine.update(row)
+    }
+
+# Latest quarter the projection benchmarks start from (flows SAAR in $B)
+PROJECTION_START = {'Revenue': 5200.0, 'Interest': 1150.0, 'Mandatory_Proxy': 3900.0, 'PublicDebt_GDP': 120.0,
+                    'Yield2Y': 4.0, 'Yield10Y': 4.3, 'GDP': 30000.0, 'date': pd.Timestamp('2025-04-01')}
+
+def projection_benchmarks(scale):
+    """
+    A 30-year Monte Carlo projection of 1,000 paths per unit of scale (100,000 at 100x),
+    in-process and on the process pool.
+    """
+    paths = 1000 * scale
+    return {
+        'projection:in_process': lambda: fiscal_projection.project(PROJECTION_START, paths=paths, workers=1),
+        'projection:pool': lambda: fiscal_projection.project(PROJECTION_START, paths=paths)
+    }
+
+def downsampling_benchmarks(scale):
+    """Decimates a 10,000-point series per unit of scale (1,000,000 at 100x) to the chart budget."""
+    n = 10_000 * scale
+    dates = np.arange(n, dtype='int64') * 86400
+    values = payloads.random_walk(n, seed=0)
+    return {
+        f'downsample:{method}': lambda method=method: downsampling.downsample(dates, values, method=method)
+        for method in downsampling.METHODS
+    }
+
+FETCH_BENCHMARKS = {
+    'fetch_fiscal_data': fetch_fiscal_data,
+    'fetch_module_2_data': fetch_module_2_data,
+    'fetch_module_3_data': fetch_module_3_data,
+    'fetch_module_4_data': fetch_module_4_data,
+    'fetch_tic_data': fetch_tic_data,
+    'fetch_all_modules': fetch_all_modules
+}
+
+SNAPSHOT_BENCHMARKS = ['snapshot:to_bytes', 'snapshot:from_bytes', 'snapshot:to_json', 'snapshot:from_json']
+
+def snapshot_benchmarks(root):
+    """Serializes and loads one full dashboard snapshot, built from the synthetic payloads up front."""
+    cold_start(root)
+    snapshot = build_snapshot()
+    data = snapshots.to_bytes(snapshot)
+    text = snapshots.to_json(snapshot)
+    return dict(zip(SNAPSHOT_BENCHMARKS, [
+        lambda: snapshots.to_bytes(snapshot),
+        lambda: snapshots.from_bytes(data),
+        lambda: snapshots.to_json(snapshot),
+        lambda: snapshots.from_json(text)
+    ]))
+
+def vintage_benchmarks(root, scale):
+    """
+    Ingests every synthetic ALFRED vintage of one quarterly series into an empty store, and
+    queries the stored series as known three quarters of the way through its history.
+    Returns:
+        list: (name, func, setup) tuples.
+    """
+    observations = payloads.alfred_observations('GDPC1', scale)['observations']
+    periods = sorted({o['date'] for o in observations})
+    period, as_of = periods[len(periods) // 2], periods[len(periods) * 3 // 4]
+
+    def ingested():
+        # Builds the index up front, so the queries are timed without it
+        vintage_store.ingest_alfred('GDPC1', observations)
+
+    return [
+        ('vintage:ingest_alfred', lambda: vintage_store.ingest_alfred('GDPC1', observations), lambda: cold_start(root)),
+        ('vintage:value_as_of', lambda: vintage_store.value_as_of('GDPC1', period, as_of), ingested),
+        ('vintage:series_as_of', lambda: vintage_store.series_as_of('GDPC1', as_of), ingested)
+    ]
+
+@contextlib.contextmanager
+def offline(scale):
+    """Serves every HTTP and yfinance call from synthetic payloads and keeps fetcher output quiet."""
+    server = payloads.PayloadServer(scale)
+    with tempfile.TemporaryDirectory() as root, \
+            mock.patch.object(http_client, 'get', server.get), \
+            mock.patch.object(yf, 'download', server.download), \
+            mock.patch.dict(os.environ, {'POLYDASH_CACHE_DIR': root}), \
+            contextlib.redirect_stdout(io.StringIO()):
+        yield root
+
+def cold_start(root):
+    """Gives the next run an empty on-disk cache and empty in-memory caches."""
+    os.environ['POLYDASH_CACHE_DIR'] = tempfile.mkdtemp(dir=root)
+    market_data.clear_cache()
+    fetch_gdelt_news.clear_cache()
+    vintage_store.clear_cache()
+
+def measure(func, repeat, setup=None):
+    """
+    Times `repeat` runs of `func`, then traces one more run with tracemalloc
+    (tracing slows execution, so it is kept out of the timings).
+    Returns:
+        dict: min_ms, median_ms, peak_mib, retained_blocks. retained_blocks is the number of
+        blocks allocated during the run and still held after it (what the run leaves behind,
+        e.g. in caches), not the number of allocations it made.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+
+    return {
+        'min_ms': min(times) * 1000,
+        'median_ms': statistics.median(times) * 1000,
+        'peak_mib': peak / 2 ** 20,
+        'retained_blocks': retained_blocks
+    }
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, keyword=None):
+    """
+    Runs every benchmark whose name contains `keyword` at each scale.
+    Returns:
+        list: One result dict per (benchmark, scale).
+    """
+    results = []
+    for scale in scales:
+        scale_results = []
+        with offline(scale) as root:
+            benchmarks = [(name, func, None) for name, func in parse_benchmarks(scale).items()]
+            benchmarks += [(name, func, None) for name, func in analytics_benchmarks(scale).items()]
+            benchmarks += [(name, func, None) for name, func in projection_benchmarks(scale).items()]
+            benchmarks += [(name, func, None) for name, func in downsampling_benchmarks(scale).items()]
+            benchmarks += [(name, func, lambda: cold_start(root)) for name, func in FETCH_BENCHMARKS.items()]
+            # Building the snapshot takes a full offline refresh; skip it when filtered out
+            if any(keyword is None or keyword in name for name in SNAPSHOT_BENCHMARKS):
+                benchmarks += [(name, func, None) for name, func in snapshot_benchmarks(root).items()]
+            benchmarks += vintage_benchmarks(root, scale)
+            for name, func, setup in benchmarks:
+                if keyword and keyword not in name:
+                    continue
+                result = measure(func, repeat, setup)
+                scale_results.append(dict(name=name, scale=scale, **result))
+        for r in scale_results:
+            print(format_row(r))
+        results.extend(scale_results)
+    return results
+
+def profile(name, scale, limit=20):
+    """Prints the hottest functions of one fetch benchmark by cumulative time."""
+    profiler = cProfile.Profile()
+    with offline(scale) as root:
+        cold_start(root)
+        profiler.runcall(FETCH_BENCHMARKS[name])
+    stats = pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative')
+    stats.print_stats(limit)
+
+HEADER = f"{'benchmark':<28}{'scale':>7}{'min ms':>12}{'median ms':>12}{'peak MiB':>11}{'held blocks':>13}"
+
+def format_row(r):
+    return (f"{r['name']:<28}{str(r['scale']) + 'x':>7}{r['min_ms']:>12.1f}{r['median_ms']:>12.1f}"
+            f"{r['peak_mib']:>11.1f}{r['retained_blocks']:>13,}")
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Returns the results whose median is more than `threshold` times the baseline's."""
+    previous = {(r['name'], r['scale']): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get((r['name'], r['scale']))
+        if base and r['median_ms'] > base['median_ms'] * threshold:
+            regressions.append((r, base))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the dashboard fetchers.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="History size multipliers")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per benchmark")
+    parser.add_argument('-k', dest='keyword', help="Only run benchmarks whose name contains this")
+    parser.add_argument('--json', help="Write results to this file")
+    parser.add_argument('--compare', help="Baseline results file; exits non-zero on regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--profile', choices=sorted(FETCH_BENCHMARKS), help="Profile one fetcher instead")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profile(args.profile, args.scales[0])
+        return 0
+
+    print(HEADER)
+    results = run_benchmarks(args.scales, args.repeat, args.keyword)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for r, base in regressions:
+            print(f"REGRESSION {r['name']} at {r['scale']}x: {base['median_ms']:.1f} ms -> {r['median_ms']:.1f} ms")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import os
+import urllib.parse
+
+# Local data directory for the FRED cache and the indicator store (override with POLYDASH_CACHE_DIR)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# Points every upstream at one host (e.g. the local stand-in server), keeping each URL's path.
+# A single source can instead be redirected with its own variable: POLYDASH_FRED_URL,
+# POLYDASH_ALFRED_URL, POLYDASH_WORLDBANK_URL, POLYDASH_GDELT_URL, POLYDASH_TIC_URL or POLYDASH_YAHOO_URL.
+UPSTREAM_ENV = 'POLYDASH_UPSTREAM'
+
+def cache_dir():
+    """Returns the root directory of the local data cache."""
+    return os.environ.get('POLYDASH_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+def source_url(default, env=None):
+    """
+    Returns the URL to use for an upstream endpoint: the `env` variable when set,
+    else `default` moved onto the POLYDASH_UPSTREAM host, else `default` itself.
+    """
+    if env and os.environ.get(env):
+        return os.environ[env].rstrip('/')
+    upstream = os.environ.get(UPSTREAM_ENV)
+    if not upstream:
+        return default
+    base = urllib.parse.urlsplit(upstream)
+    parts = urllib.parse.urlsplit(default)
+    return urllib.parse.urlunsplit((base.scheme, base.netloc, base.path.rstrip('/') + parts.path, parts.query, ''))
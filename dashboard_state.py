@@ -0,0 +1,113 @@
+import threading
+import time
+from datetime import datetime
+
+from fetch_all_data import fetch_all_modules
+from fetch_energy_money import fetch_energy_money_history
+from fetch_module_2_data import DXY_SERIES, fetch_neutral_assets_history
+from fetch_module_3_data import fetch_commodity_history
+from fiscal_projection import project_fiscal_frame
+from fred_cache import get_fred_series
+import resilience
+from rolling_analytics import compute_analytics
+from snapshots import from_modules
+
+# How often the background worker rebuilds the dashboard snapshot
+DEFAULT_REFRESH_INTERVAL = 900  # seconds
+
+# Monte Carlo paths of the fiscal projection on every refresh, run in-process (about 0.1 s)
+PROJECTION_PATHS = 10_000
+
+def build_snapshot():
+    """
+    Builds a complete dashboard snapshot from the fetch functions.
+    Returns:
+        snapshots.DashboardSnapshot: Typed KPIs and chart series of every module.
+    """
+    modules = fetch_all_modules()
+
+    # Served from the market-data frame cache and the last good values of the refresh above
+    history = {
+        'Energy_Money': fetch_energy_money_history(),
+        'Neutral_Assets': fetch_neutral_assets_history(),
+        'Commodities': fetch_commodity_history(),
+        # Same key as the refresh's FRED leaf: never waits on a DTWEXBGS request still in flight
+        'Dollar_Index': resilience.call(f'fred:{DXY_SERIES}', 'fred', lambda: get_fred_series(DXY_SERIES)),
+        # Rolling metrics over the indicator store, which the refresh above has just appended to
+        'Analytics': compute_analytics(),
+        'Projection': project_fiscal_frame(modules.get('module_1'), paths=PROJECTION_PATHS, workers=1)
+    }
+
+    return from_modules(modules, history, datetime.now(), resilience.stale_keys())
+
+class SnapshotStore:
+    """
+    Holds the current dashboard snapshot in memory.
+    Readers always get a complete snapshot: a new one replaces the old in a single swap.
+    """
+
+    def __init__(self, snapshot=None):
+        self._snapshot = snapshot
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns the current snapshot, or None before the first build has finished."""
+        return self._snapshot
+
+    def swap(self, snapshot):
+        """Atomically replaces the current snapshot; returns the previous one."""
+        with self._lock:
+            previous, self._snapshot = self._snapshot, snapshot
+        return previous
+
+class BackgroundRefresher:
+    """
+    Rebuilds the snapshot on a daemon thread every `interval` seconds and swaps it into `store`.
+    A failed build keeps the previous snapshot in place.
+    """
+
+    def __init__(self, store, build=build_snapshot, interval=DEFAULT_REFRESH_INTERVAL):
+        self.store = store
+        self.build = build
+        self.interval = interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def refresh_once(self):
+        """Builds one snapshot and swaps it in. Returns True on success."""
+        start = time.perf_counter()
+        try:
+            snapshot = self.build()
+        except Exception as e:
+            print(f"Error refreshing dashboard snapshot: {e}")
+            return False
+        self.store.swap(snapshot)
+        print(f"Dashboard snapshot refreshed in {time.perf_counter() - start:.2f}s")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Starts the worker thread unless it is running; the first build begins immediately."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='snapshot-refresher', daemon=True)
+                self._thread.start()
+        return self
+
+    def trigger(self):
+        """Asks the worker to rebuild now instead of waiting for the next interval."""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
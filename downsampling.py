@@ -0,0 +1,124 @@
+"""
+Downsampling of long chart series to a pixel budget, before they are sent to the browser.
+
+    minmax  Keeps the lowest and highest point of each bucket: every spike and trough survives.
+    lttb    Largest-Triangle-Three-Buckets: keeps, per bucket, the point forming the largest
+            triangle with the point kept before it and the mean of the next bucket, which
+            preserves the visual shape of the line.
+
+Both are O(n) in the series length. The LTTB pass is sequential (each bucket depends on the
+point kept before it), so it runs over min/max candidates preselected with numpy
+(MinMaxLTTB): at most 4 per output point, however long the series.
+"""
+import numpy as np
+
+# Points per trace sent to the browser: about two per horizontal pixel of a full-width chart
+DEFAULT_POINTS = 2000
+
+# Min/max candidates per output point that the LTTB pass chooses from
+LTTB_CANDIDATES = 4
+
+def minmax(x, y, n):
+    """
+    Min/max decimation.
+    Args:
+        x, y: Sorted x values and their (finite) y values.
+        n (int): Point budget.
+    Returns:
+        np.ndarray: Sorted indices of at most `n` points: the first, the last, and the
+        minimum and maximum of (n - 2) / 2 equal buckets in between.
+    """
+    length = len(y)
+    if length <= n:
+        return np.arange(length)
+    inner = length - 2
+    width = -(-inner // max((n - 2) // 2, 1))
+    buckets = -(-inner // width)
+
+    # Pad the interior into a (buckets, width) grid; the padding never wins a min or max
+    grid = np.full(buckets * width, np.nan)
+    grid[:inner] = y[1:-1]
+    grid = grid.reshape(buckets, width)
+    offsets = np.arange(buckets) * width + 1
+    lows = np.where(np.isnan(grid), np.inf, grid).argmin(axis=1) + offsets
+    highs = np.where(np.isnan(grid), -np.inf, grid).argmax(axis=1) + offsets
+
+    chosen = np.concatenate([[0], lows, highs, [length - 1]])
+    chosen = chosen[chosen < length]
+    return np.unique(chosen[~np.isnan(y[chosen])])
+
+def lttb(x, y, n):
+    """
+    Largest-Triangle-Three-Buckets downsampling (over min/max preselected candidates).
+    Args:
+        x, y: Sorted x values and their (finite) y values.
+        n (int): Point budget.
+    Returns:
+        np.ndarray: Sorted indices of at most `n` points, including the first and last.
+    """
+    length = len(y)
+    if length <= n:
+        return np.arange(length)
+    if n < 3:
+        return np.array([0, length - 1])[:max(n, 0)]
+
+    candidates = minmax(x, y, LTTB_CANDIDATES * n)
+    if len(candidates) <= n:
+        return candidates
+    # Relative x keeps epoch seconds well conditioned in the area products
+    xs = np.asarray(x, dtype='float64')[candidates]
+    xs -= xs[0]
+    ys = np.asarray(y, dtype='float64')[candidates]
+
+    # n - 2 buckets over the candidates between the first and the last
+    edges = np.linspace(1, len(candidates) - 1, n - 1).astype('int64')
+    counts = np.diff(edges)
+    # Mean of each bucket; the bucket after the last one is the last point
+    next_x = np.append(np.add.reduceat(xs[:-1], edges[:-1])[1:] / counts[1:], xs[-1]).tolist()
+    next_y = np.append(np.add.reduceat(ys[:-1], edges[:-1])[1:] / counts[1:], ys[-1]).tolist()
+
+    xs_list, ys_list, edges_list = xs.tolist(), ys.tolist(), edges.tolist()
+    chosen = [0]
+    ax, ay = xs_list[0], ys_list[0]
+    for bucket in range(n - 2):
+        cx, cy = next_x[bucket], next_y[bucket]
+        best, best_area = edges_list[bucket], -1.0
+        for j in range(edges_list[bucket], edges_list[bucket + 1]):
+            # Twice the triangle area (a, j, c)
+            area = abs((ax - cx) * (ys_list[j] - ay) - (ax - xs_list[j]) * (cy - ay))
+            if area > best_area:
+                best, best_area = j, area
+        chosen.append(best)
+        ax, ay = xs_list[best], ys_list[best]
+    chosen.append(len(candidates) - 1)
+    return candidates[chosen]
+
+METHODS = {
+    'lttb': lttb,
+    'minmax': minmax
+}
+
+def downsample(x, y, n=DEFAULT_POINTS, method='lttb', x_range=None):
+    """
+    Reduces a series to at most `n` points, optionally within a zoomed x range.
+    Args:
+        x, y: Sorted x values (e.g. epoch seconds) and y values; NaN y values are gaps.
+        method (str): Key of METHODS.
+        x_range (tuple): (start, end) in x units; the points just outside it are kept too,
+            so the line runs to the edges of the view.
+    Returns:
+        tuple: (x, y) arrays. Series within the budget are returned whole, gaps included;
+        longer ones are downsampled without their gaps.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype='float64')
+    if x_range is not None:
+        start = max(np.searchsorted(x, x_range[0], side='left') - 1, 0)
+        stop = np.searchsorted(x, x_range[1], side='right') + 1
+        x, y = x[start:stop], y[start:stop]
+    if len(y) <= n:
+        return x, y
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    chosen = METHODS[method](x, y, n)
+    return x[chosen], y[chosen]
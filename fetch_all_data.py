@@ -0,0 +1,191 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from fetch_fiscal_data import SERIES_MAP, fetch_fred_series_csv, build_fiscal_frame
+from fetch_tic_data import fetch_tic_panel, tic_holdings_from_panel, fred_proxy_from_series
+from fetch_gold_data import gold_reserves_from_panel
+from fetch_module_2_data import dollar_index_from_series, fetch_neutral_assets, assemble_module_2_results
+from fetch_module_3_data import fetch_energy_money_data, fetch_commodity_prices, energy_production_from_series
+from fetch_module_4_data import (
+    FRED_SERIES, WB_START_YEAR, latest_fred_row, world_bank_results, compute_us_china_trade_balance,
+    assemble_module_4_results
+)
+from fetch_gdelt_news import fetch_gdelt_mentions, fetch_gdelt_timeline
+from indicators import plan_requests, request_series_map
+import market_data
+import metrics
+import resilience
+from world_bank import fetch_wb_panel
+
+# Every leaf fetch is I/O bound, so one thread per source call is enough.
+DEFAULT_MAX_WORKERS = 16
+
+def _run_task(name, func, args):
+    with metrics.timed('polydash_task_seconds', task=name):
+        return func(*args)
+
+def run_task_graph(tasks, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Runs a dependency graph of tasks on a thread pool.
+    Each task is submitted as soon as all of its dependencies have finished,
+    so derived values are computed the moment their inputs arrive.
+    Args:
+        tasks (dict): name -> (func, deps). `func` is called with the results of `deps`, in order.
+    Returns:
+        dict: name -> result. A task that raises yields None.
+    """
+    pending = dict(tasks)
+    for name, (_, deps) in pending.items():
+        missing = [d for d in deps if d not in tasks]
+        if missing:
+            raise ValueError(f"Task {name} depends on unknown tasks: {missing}")
+
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit_ready():
+            for name, (func, deps) in list(pending.items()):
+                if all(d in results for d in deps):
+                    del pending[name]
+                    running[pool.submit(_run_task, name, func, [results[d] for d in deps])] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"Error in task {name}: {e}")
+                    metrics.record_error('orchestrator', e, name)
+                    results[name] = None
+            submit_ready()
+
+    if pending:
+        raise ValueError(f"Circular dependencies between tasks: {sorted(pending)}")
+
+    return results
+
+def _has_data(results):
+    # GDELT answers every query even when throttled, with empty results
+    return results is not None and any(len(value) for value in results.values())
+
+def request_tasks(key, request):
+    """
+    Returns the leaf tasks that perform one planned request (see indicators.plan_requests).
+    Every request is a single task named by its key, except GDELT, whose queries are
+    fetched in two modes: '<key>:mentions' and '<key>:timeline'.
+    Each leaf goes through resilience.call, so a slow or failing source is served from its
+    last good value instead of holding up (or emptying) the modules that use it.
+    """
+    series_ids = list(request.series_ids)
+    source = request.source
+    if source == 'fred':
+        return {key: (lambda: resilience.call(key, source, lambda: fetch_fred_series_csv(series_ids[0])), [])}
+    if source == 'yahoo':
+        def download():
+            frame = resilience.call(key, source, lambda: market_data.download_close(series_ids))
+            # The module tasks read prices from the frame cache, which a stale frame has to fill too
+            if frame is not None:
+                market_data.cache_frame(series_ids, frame)
+            return frame
+        return {key: (download, [])}
+    if source == 'worldbank':
+        return {key: (lambda: resilience.call(
+            key, source, lambda: fetch_wb_panel(series_ids, list(request.countries), start_year=WB_START_YEAR)), [])}
+    if source == 'tic':
+        return {key: (lambda: resilience.call(key, source, fetch_tic_panel), [])}
+    if source == 'gdelt':
+        queries = request_series_map(request)
+        return {f'{key}:mentions': (lambda: resilience.call(f'{key}:mentions', source,
+                                                            lambda: fetch_gdelt_mentions(queries), _has_data), []),
+                f'{key}:timeline': (lambda: resilience.call(f'{key}:timeline', source,
+                                                            lambda: fetch_gdelt_timeline(queries), _has_data), [])}
+    raise ValueError(f"No fetcher for source {source}")
+
+def build_task_graph():
+    """
+    Builds the task graph for all four dashboard modules.
+    The leaves are the planned upstream requests, one per unique series or batched call,
+    and every module node depends on the requests serving its indicators.
+    The final nodes 'module_1' .. 'module_4' return the same values as
+    fetch_fiscal_data, fetch_module_2_data, fetch_module_3_data and fetch_module_4_data.
+    """
+    plan = plan_requests()
+    route = plan.routes
+
+    tasks = {}
+    for key, request in plan.requests.items():
+        tasks.update(request_tasks(key, request))
+
+    # Module 1: merged once every fiscal series has arrived
+    fiscal_names = list(SERIES_MAP)
+
+    def merge_fiscal(*series):
+        return build_fiscal_frame({name: s for name, s in zip(fiscal_names, series) if s is not None})
+
+    tasks['module_1'] = (merge_fiscal, [route[name] for name in fiscal_names])
+
+    # Module 2 (the market-data consumers read the frame cached by the Yahoo request)
+    tasks['m2:tic'] = (tic_holdings_from_panel, [route['TIC_China']])
+    tasks['m2:fred_tic'] = (fred_proxy_from_series, [route['Foreign_Holdings_Total']])
+    tasks['m2:gold_reserves'] = (gold_reserves_from_panel, [route['China_Reserves']])
+    tasks['m2:dxy'] = (dollar_index_from_series, [route['Dollar_Index']])
+    tasks['m2:neutral_assets'] = (lambda _: fetch_neutral_assets(), [route['Gold']])
+    tasks['module_2'] = (assemble_module_2_results,
+                         ['m2:tic', 'm2:fred_tic', 'm2:gold_reserves', 'm2:dxy', 'm2:neutral_assets'])
+
+    # Module 3 (Energy_Value is derived inside the energy-money leaf from a single download)
+    tasks['m3:energy_money'] = (lambda _: fetch_energy_money_data(), [route['Oil']])
+    tasks['m3:commodities'] = (lambda _: fetch_commodity_prices(), [route['Copper']])
+    tasks['m3:production'] = (energy_production_from_series, [route['Crude_Production']])
+
+    def assemble_module_3(evm_data, commodities, production):
+        return {
+            'Energy_Money': evm_data,
+            'Commodities': commodities,
+            'Energy_Production': production
+        }
+
+    tasks['module_3'] = (assemble_module_3, ['m3:energy_money', 'm3:commodities', 'm3:production'])
+
+    # Module 4
+    for name, series_id in FRED_SERIES.items():
+        tasks[f'm4:{name}'] = (lambda s, series_id=series_id: latest_fred_row(s, series_id), [route[name]])
+    tasks['m4:US_China_Trade_Balance'] = (compute_us_china_trade_balance,
+                                          ['m4:Imports_China', 'm4:Exports_China'])
+    tasks['m4:world_bank'] = (world_bank_results, [route['GDP_Nominal']])
+
+    def assemble_module_4(balance_ch, trade_total, indpro, world_bank, news, news_volume):
+        manuf_share, economic_scale = world_bank
+        return assemble_module_4_results(balance_ch, trade_total, indpro, manuf_share, economic_scale,
+                                         news, news_volume)
+
+    tasks['module_4'] = (assemble_module_4,
+                         ['m4:US_China_Trade_Balance', 'm4:TradeBalance_Total', 'm4:Industrial_Production',
+                          'm4:world_bank', route['Tariffs'] + ':mentions', route['Tariffs'] + ':timeline'])
+
+    return tasks
+
+def fetch_all_modules(max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Fetches all four dashboard modules concurrently.
+    Returns:
+        dict: 'module_1' (fiscal DataFrame or None) and 'module_2' .. 'module_4' result dicts.
+    """
+    print("Fetching all dashboard modules concurrently...")
+    market_data.clear_cache()
+    results = run_task_graph(build_task_graph(), max_workers=max_workers)
+    return {name: results[name] for name in ['module_1', 'module_2', 'module_3', 'module_4']}
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    data = fetch_all_modules()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n--- Full Dashboard Refresh: {elapsed:.2f}s ---")
+    for name, value in data.items():
+        status = "OK" if value is not None else "FAILED"
+        print(f"{name}: {status}")
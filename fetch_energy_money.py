@@ -1,5 +1,26 @@
-import yfinance as yf
-import pandas as pd
+from market_data import MARKET_TICKERS, get_close
+from market_kpis import energy_money_series
+
+def compute_energy_money(data):
+    """
+    Calculates the latest Energy-Value of Money from a Close price frame with 'CL=F' and '^TNX' columns.
+    Returns:
+        dict: containing 'Oil_Price', '10Y_Yield', 'Bond_Price', 'Energy_Value'.
+    """
+    # The whole aligned history is computed in one vectorized pass; the snapshot is its last row
+    return energy_money_series(data).iloc[-1].to_dict()
+
+def fetch_energy_money_history():
+    """
+    Fetches the daily Energy-Value of Money series for charting.
+    Returns:
+        pd.DataFrame: 'Oil_Price', '10Y_Yield', 'Bond_Price', 'Energy_Value' per trading day, or None.
+    """
+    try:
+        return energy_money_series(get_close(MARKET_TICKERS['energy_money']))
+    except Exception as e:
+        print(f"Error fetching market data: {e}")
+        return None
 
 def fetch_energy_money():
     """
@@ -9,32 +30,10 @@ def fetch_energy_money():
     """
     print("Fetching Market Data via yfinance...")
 
-    tickers = ["CL=F", "^TNX"]
-
     try:
-        # Fetch last 1 year of data
-        # Fix: explicit auto_adjust=True to silence warning
-        data = yf.download(tickers, period="1y", progress=False, auto_adjust=True)['Close']
-
-        oil_price = data['CL=F'].iloc[-1]
-        tnx_yield_index = data['^TNX'].iloc[-1]
-
-        # Convert TNX to actual yield decimal
-        # Verified: Raw ^TNX is percentage (e.g. 4.02 for 4.02%)
-        treasury_yield = tnx_yield_index / 100.0
-
-        # Calculate "Price of Theoretical 10Y Zero Coupon Bond" (Face 100)
-        bond_price = 100 / ((1 + treasury_yield) ** 10)
-
-        # Metric: Barrels of Oil per Bond
-        energy_value = bond_price / oil_price
-
-        return {
-            'Oil_Price': oil_price,
-            '10Y_Yield': treasury_yield,
-            'Bond_Price': bond_price,
-            'Energy_Value': energy_value
-        }
+        # Last 1 year of data, shared with the other modules through the market-data cache
+        data = get_close(MARKET_TICKERS['energy_money'])
+        return compute_energy_money(data)
 
     except Exception as e:
         print(f"Error fetching market data: {e}")
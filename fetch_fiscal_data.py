@@ -1,97 +1,178 @@
 import pandas as pd
-import requests
-import io
-
-# Define the FRED Series IDs
-SERIES_MAP = {
-    'Revenue': 'W006RC1Q027SBEA',        # Current Receipts
-    'Interest': 'A091RC1Q027SBEA',       # Interest Payments
-    'SocialSecurity': 'W823RC1',         # Social Security
-    'Medicare': 'W824RC1',               # Medicare
-    'Medicaid': 'W825RC1',               # Medicaid
-    'PublicDebt_GDP': 'GFDEGDQ188S',     # Federal Debt: Total Public Debt as Percent of GDP
-    'FedBalanceSheet': 'WALCL',          # Assets: Total Assets: Total Assets (Less Eliminations from Consolidation)
-    'Yield10Y': 'GS10',                  # 10-Year Treasury Constant Maturity Rate
-    'Yield2Y': 'GS2'                     # 2-Year Treasury Constant Maturity Rate
+from alignment import build_panel
+from fred_cache import get_fred_series
+from incremental import update_kpis
+from indicators import series_map
+from vintage_store import fetch_alfred, panel_as_of
+
+# FRED Series IDs of Module 1 (see indicators.REGISTRY)
+SERIES_MAP = series_map('module_1', 'fred')
+
+# Target calendar and explicit aggregation of each series in the fiscal panels
+QUARTERLY_PANEL = {
+    'freq': 'QS',
+    'aggregations': {
+        'Revenue': 'last',
+        'Interest': 'last',
+        'SocialSecurity': 'last',
+        'Medicare': 'last',
+        'Medicaid': 'last',
+        'PublicDebt_GDP': 'last',
+        'FedBalanceSheet': 'last',       # Level at quarter end
+        'FedBalanceSheet_YoY': 'last',   # Weekly YoY as of quarter end
+        'Yield10Y': 'mean',              # Quarterly average of monthly yields
+        'Yield2Y': 'mean',
+        'GDP': 'last'                    # Scales the debt ratio for fiscal_projection
+    }
+}
+
+WEEKLY_PANEL = {
+    'freq': 'W-WED',                     # H.4.1 week ending Wednesday
+    'aggregations': {
+        'FedBalanceSheet': 'last'
+    }
 }
 
 def fetch_fred_series_csv(series_id):
-    """Fetches a FRED series as a pandas Series using the direct CSV URL."""
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text), index_col=0, parse_dates=True)
-        # Check if column exists, otherwise it might be 'VALUE' or something else if mocked imperfectly
-        if series_id in df.columns:
-            return df[series_id]
-        elif 'VALUE' in df.columns:
-             return df['VALUE']
-        else:
-             # If index only, or weird format
-             return df.iloc[:, 0]
-    except Exception as e:
-        print(f"Error fetching {series_id}: {e}")
-        return None
+    """Fetches a FRED series as a pandas Series through the local FRED cache."""
+    return get_fred_series(series_id)
 
-def fetch_fiscal_data():
+def compute_weekly_kpis(weekly):
     """
-    Fetches fiscal data from FRED.
-    Returns:
-        pd.DataFrame: DataFrame with all series and calculated KPIs, or None if failure.
+    Calculates the weekly KPIs. Each row depends on the row 52 weeks before it.
     """
-    print("Fetching Fiscal Data from FRED (CSV method)...")
+    weekly = weekly.copy()
+    # KPI 4: Debt Monetization Proxy (Fed Balance Sheet Growth)
+    weekly['FedBalanceSheet_YoY'] = weekly['FedBalanceSheet'].pct_change(periods=52)
+    return weekly
 
-    data_frames = {}
-    for name, series_id in SERIES_MAP.items():
-        s = fetch_fred_series_csv(series_id)
-        if s is not None:
-            data_frames[name] = s
-        else:
-            print(f"Warning: Failed to fetch {name} ({series_id})")
+def compute_quarterly_kpis(df):
+    """
+    Calculates the quarterly KPIs. Every KPI depends on its own row only.
+    """
+    df = df.copy()
 
-    if not data_frames:
-        print("Failed to fetch data.")
-        return None
+    # Mandatory Spending Proxy
+    df['Mandatory_Proxy'] = df['SocialSecurity'] + df['Medicare'] + df['Medicaid']
+
+    # KPI 1: Fiscal Unsustainability Ratio
+    # (Mandatory + Interest) / Revenue
+    df['Fiscal_Unsustainability_Ratio'] = (df['Mandatory_Proxy'] + df['Interest']) / df['Revenue']
 
-    # Merge all series into a single DataFrame
-    # Note: Different series have different frequencies (Weekly, Monthly, Quarterly).
-    # We will forward-fill to match the most frequent or standard frequency for analysis.
-    df = pd.DataFrame(data_frames)
+    # KPI 2: Interest Burden (Interest / Revenue)
+    df['Interest_Revenue_Ratio'] = df['Interest'] / df['Revenue']
 
-    # Forward fill to handle different frequencies (e.g. Weekly WALCL vs Quarterly GDP)
-    df.ffill(inplace=True)
+    # KPI 3: Public Debt Burden (Directly from FRED 'PublicDebt_GDP')
+    # Already in df['PublicDebt_GDP']
 
-    # Fill NA if needed, or drop rows that are still NaN (start of data)
-    df.dropna(inplace=True)
+    # KPI 4: Debt Monetization Proxy (Fed Balance Sheet YoY), as of quarter end from the weekly panel
+    if 'FedBalanceSheet_YoY' not in df:
+        raise KeyError('FedBalanceSheet')
 
-    if df.empty:
+    return df
+
+def build_fiscal_panels(data_frames, incremental=True):
+    """
+    Aligns the fetched fiscal series into correctly-calendared panels and calculates the KPIs.
+    Args:
+        data_frames (dict): SERIES_MAP name -> pd.Series for every series that was fetched.
+        incremental (bool): Only recompute KPI rows affected by new or revised observations
+            since the previous refresh (the result is identical to a full recomputation).
+    Returns:
+        dict: 'quarterly' and 'weekly' DataFrames, or None if failure.
+    """
+    if not data_frames:
+        print("Failed to fetch data.")
         return None
 
-    # Calculate Mandatory Spending Proxy and KPIs
     try:
-        # Mandatory Spending Proxy
-        df['Mandatory_Proxy'] = df['SocialSecurity'] + df['Medicare'] + df['Medicaid']
+        # Weekly panel: the Fed balance sheet on its native H.4.1 calendar,
+        # so the 52-period change is exactly one year
+        weekly = build_panel(data_frames, WEEKLY_PANEL['freq'], WEEKLY_PANEL['aggregations'])
+        if 'FedBalanceSheet' in weekly:
+            weekly = update_kpis('fiscal_weekly', weekly, compute_weekly_kpis, lookback=52, incremental=incremental)
+
+        # Quarterly panel: NIPA series natively, monthly yields averaged, weekly values as of quarter end
+        quarterly_inputs = dict(data_frames)
+        if 'FedBalanceSheet_YoY' in weekly:
+            quarterly_inputs['FedBalanceSheet_YoY'] = weekly['FedBalanceSheet_YoY']
+        df = build_panel(quarterly_inputs, QUARTERLY_PANEL['freq'], QUARTERLY_PANEL['aggregations'])
+
+        # Drop leading periods before every fetched series has started. Later periods are kept:
+        # a series that has not printed the latest quarter yet is as-of filled by build_panel
+        starts = [df[name].first_valid_index() for name in data_frames if name in df.columns]
+        if df.empty or None in starts:
+            return None
+        df = df.loc[max(starts):]
+
+        df = update_kpis('fiscal_quarterly', df, compute_quarterly_kpis, lookback=0, incremental=incremental)
 
-        # KPI 1: Fiscal Unsustainability Ratio
-        # (Mandatory + Interest) / Revenue
-        df['Fiscal_Unsustainability_Ratio'] = (df['Mandatory_Proxy'] + df['Interest']) / df['Revenue']
+    except KeyError as e:
+        print(f"Missing columns for calculation: {e}")
+        return None
 
-        # KPI 2: Interest Burden (Interest / Revenue)
-        df['Interest_Revenue_Ratio'] = df['Interest'] / df['Revenue']
+    return {'quarterly': df, 'weekly': weekly}
 
-        # KPI 3: Public Debt Burden (Directly from FRED 'PublicDebt_GDP')
-        # Already in df['PublicDebt_GDP']
+def build_fiscal_frame(data_frames, incremental=True):
+    """
+    Builds the quarterly fiscal panel with all series and calculated KPIs.
+    Returns:
+        pd.DataFrame: Quarterly DataFrame, or None if failure.
+    """
+    panels = build_fiscal_panels(data_frames, incremental=incremental)
+    return panels['quarterly'] if panels is not None else None
 
-        # KPI 4: Debt Monetization Proxy (Fed Balance Sheet Growth)
-        # We can use raw level 'FedBalanceSheet' or calculate YoY change
-        df['FedBalanceSheet_YoY'] = df['FedBalanceSheet'].pct_change(periods=52) # approx 1 year for weekly data
+def fetch_fiscal_series():
+    """
+    Fetches every series in SERIES_MAP.
+    Returns:
+        dict: name -> pd.Series for every series that was fetched.
+    """
+    data_frames = {}
+    for name, series_id in SERIES_MAP.items():
+        s = fetch_fred_series_csv(series_id)
+        if s is not None:
+            data_frames[name] = s
+        else:
+            print(f"Warning: Failed to fetch {name} ({series_id})")
+    return data_frames
 
-    except KeyError as e:
-        print(f"Missing columns for calculation: {e}")
-        return None
+def fetch_fiscal_data():
+    """
+    Fetches fiscal data from FRED.
+    Returns:
+        pd.DataFrame: Quarterly DataFrame with all series and calculated KPIs, or None if failure.
+    """
+    print("Fetching Fiscal Data from FRED (CSV method)...")
+    return build_fiscal_frame(fetch_fiscal_series())
 
-    return df
+def fetch_fiscal_panels():
+    """
+    Fetches fiscal data from FRED as aligned panels.
+    Returns:
+        dict: 'quarterly' (ratios) and 'weekly' (Fed balance sheet) DataFrames, or None if failure.
+    """
+    print("Fetching Fiscal Data from FRED (CSV method)...")
+    return build_fiscal_panels(fetch_fiscal_series())
+
+def fetch_fiscal_vintages():
+    """
+    Loads every ALFRED vintage of the SERIES_MAP series into the vintage store.
+    Returns:
+        dict: name -> rows appended (None where the fetch failed).
+    """
+    return {name: fetch_alfred(series_id) for name, series_id in SERIES_MAP.items()}
+
+def fiscal_data_as_of(as_of):
+    """
+    Rebuilds the quarterly fiscal panel and KPIs from the series as they were published on `as_of`,
+    using only the vintage store (no network access and no look-ahead).
+    Returns:
+        pd.DataFrame: Quarterly DataFrame, or None if nothing was known on that date.
+    """
+    data_frames = panel_as_of(SERIES_MAP, as_of)
+    # Leave the incremental KPI state, which tracks the live refresh, untouched
+    return build_fiscal_frame(data_frames, incremental=False)
 
 if __name__ == "__main__":
     df = fetch_fiscal_data()
@@ -1,29 +1,48 @@
-import requests
-import json
-import urllib.parse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-def fetch_gdelt_mentions():
+import http_client
+from config import source_url
+from indicators import series_map
+import metrics
+
+GDELT_DOC_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
+
+# "Prevailing Ism" query set: protectionism vs. free trade / globalization
+QUERIES = series_map('module_4', 'gdelt')
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
+}
+
+# GDELT updates every 15 minutes, so a cached timeline is reused for that long
+TIMELINE_CACHE_TTL = 900  # seconds
+
+# (query, mode, timespan) -> (fetched_at, pd.Series)
+_timeline_cache = {}
+_cache_lock = threading.Lock()
+
+def clear_cache():
+    """Drops all cached GDELT timelines."""
+    with _cache_lock:
+        _timeline_cache.clear()
+
+def _run_queries(func, queries, max_workers=None):
+    """Runs `func(label, query)` for every query concurrently; returns label -> result in query order."""
+    with ThreadPoolExecutor(max_workers=max_workers or len(queries) or 1) as pool:
+        futures = {label: pool.submit(func, label, query) for label, query in queries.items()}
+        return {label: future.result() for label, future in futures.items()}
+
+def fetch_gdelt_mentions(queries=QUERIES):
     """
     Fetches GDELT article counts (or samples) for specific queries.
     Returns:
         dict: Keys are topics, values are lists of articles or empty list.
     """
-    base_url = "https://api.gdeltproject.org/api/v2/doc/doc"
-
-    queries = {
-        "Tariffs": 'tariffs',
-        "Protectionism": '(tariffs OR protectionism)'
-    }
-
     print("Fetching GDELT News Mentions (Last 24 Hours)...")
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-    }
-
-    results = {}
-
-    for label, query in queries.items():
+    def fetch_articles(label, query):
         params = {
             'query': f'{query} sourcelang:eng',
             'mode': 'artlist',
@@ -33,18 +52,78 @@ def fetch_gdelt_mentions():
         }
 
         try:
-            response = requests.get(base_url, params=params, headers=headers)
+            response = http_client.get(source_url(GDELT_DOC_URL, 'POLYDASH_GDELT_URL'), params=params, headers=HEADERS)
             data = response.json()
             if 'articles' in data and len(data['articles']) > 0:
-                results[label] = data['articles']
-            else:
-                results[label] = []
+                return data['articles']
+            return []
 
         except Exception as e:
             print(f"Error fetching GDELT for {label}: {e}")
-            results[label] = []
+            metrics.record_error('gdelt', e, label)
+            return []
+
+    return _run_queries(fetch_articles, queries)
+
+def parse_timeline(data):
+    """
+    Parses a GDELT timeline JSON response into a numeric series.
+    Returns:
+        pd.Series: Values indexed by UTC timestamp (empty if GDELT returned no timeline).
+    """
+    # pandas is imported here, so fetching article lists alone never loads it
+    import pandas as pd
+    from parsing import timeline_arrays
 
-    return results
+    index, values = timeline_arrays(data)
+    return pd.Series(values, index=index, dtype='float64')
+
+def fetch_gdelt_timeline(queries=QUERIES, timespan='3m', mode='timelinevolraw', max_workers=None):
+    """
+    Fetches a mention-volume time series per query, running all queries concurrently.
+    Args:
+        timespan (str): GDELT window, e.g. '1d', '7d', '3m'.
+        mode (str): 'timelinevolraw' for article counts, 'timelinevol' for share of all coverage (%).
+    Returns:
+        dict: Keys are topics, values are pd.Series (empty on failure). Results are cached
+        per (query, window) for TIMELINE_CACHE_TTL seconds.
+    """
+    import pandas as pd
+
+    print(f"Fetching GDELT News Volume Timelines ({timespan})...")
+
+    def fetch_timeline(label, query):
+        key = (query, mode, timespan)
+        with _cache_lock:
+            cached = _timeline_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < TIMELINE_CACHE_TTL:
+            metrics.record_cache('gdelt', True, label)
+            return cached[1]
+        metrics.record_cache('gdelt', False, label)
+
+        params = {
+            'query': f'{query} sourcelang:eng',
+            'mode': mode,
+            'format': 'json',
+            'timespan': timespan
+        }
+
+        try:
+            response = http_client.get(source_url(GDELT_DOC_URL, 'POLYDASH_GDELT_URL'), params=params, headers=HEADERS)
+            response.raise_for_status()
+            with metrics.timed('polydash_parse_seconds', source='gdelt', series=label):
+                series = parse_timeline(response.json())
+        except Exception as e:
+            print(f"Error fetching GDELT timeline for {label}: {e}")
+            metrics.record_error('gdelt', e, label)
+            return pd.Series(dtype='float64')
+
+        series.name = label
+        with _cache_lock:
+            _timeline_cache[key] = (time.monotonic(), series)
+        return series
+
+    return _run_queries(fetch_timeline, queries, max_workers)
 
 if __name__ == "__main__":
     data = fetch_gdelt_mentions()
@@ -54,3 +133,7 @@ if __name__ == "__main__":
             print(f"Sample Title: {articles[0]['title']}")
         else:
             print(f"Topic '{label}': No articles found.")
+
+    timelines = fetch_gdelt_timeline()
+    for label, series in timelines.items():
+        print(f"Topic '{label}': {series.sum():,.0f} articles over {len(series)} intervals.")
@@ -1,5 +1,25 @@
-import requests
-import json
+from datetime import datetime
+from indicators import INDICATORS
+from world_bank import fetch_wb_panel, latest_entry
+
+# Total Reserves (incl. Gold), current US$
+RESERVES_INDICATOR = INDICATORS['China_Reserves'].series_id
+RESERVES_COUNTRIES = list(INDICATORS['China_Reserves'].countries)
+
+def gold_reserves_from_panel(panel, country_code='CHN'):
+    """
+    Extracts the latest reserves value from a World Bank panel that includes RESERVES_INDICATOR.
+    Returns:
+        dict: {'value': float (Trillions), 'year': str, 'source': str} or None.
+    """
+    latest_valid = latest_entry(panel, RESERVES_INDICATOR, country_code)
+    if latest_valid is None:
+        return None
+    return {
+        'value': float(latest_valid['value']) / 1e12, # Convert to Trillions
+        'year': latest_valid['date'],
+        'source': f"World Bank (Indicator {RESERVES_INDICATOR})"
+    }
 
 def fetch_gold_data():
     """
@@ -8,30 +28,9 @@ def fetch_gold_data():
         dict: {'value': float (Trillions), 'year': str, 'source': str} or None.
     """
     print("Fetching World Bank Data (Total Reserves incl. Gold) for China...")
-    url = "https://api.worldbank.org/v2/country/CHN/indicator/FI.RES.TOTL.CD?format=json&per_page=10"
-
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        if len(data) > 1 and len(data[1]) > 0:
-            latest_valid = None
-            for entry in data[1]:
-                if entry['value'] is not None:
-                    latest_valid = entry
-                    break
-
-            if latest_valid:
-                return {
-                    'value': float(latest_valid['value']) / 1e12, # Convert to Trillions
-                    'year': latest_valid['date'],
-                    'source': "World Bank (Indicator FI.RES.TOTL.CD)"
-                }
-    except Exception as e:
-        print(f"Error fetching World Bank data: {e}")
-
-    return None
+    current_year = datetime.now().year
+    panel = fetch_wb_panel([RESERVES_INDICATOR], RESERVES_COUNTRIES, start_year=current_year - 10, end_year=current_year)
+    return gold_reserves_from_panel(panel)
 
 if __name__ == "__main__":
     result = fetch_gold_data()
@@ -1,43 +1,68 @@
-import pandas as pd
-import requests
-import io
-import yfinance as yf
-from fetch_tic_data import fetch_tic_data, fetch_fred_proxy
-from fetch_gold_data import fetch_gold_data
+from market_data import MARKET_TICKERS, get_close
+from market_kpis import neutral_asset_series
+from fred_cache import get_fred_series
+from indicators import series_id
 
 # FRED Series ID for Dollar Index
-DXY_SERIES = 'DTWEXBGS' # Trade Weighted U.S. Dollar Index: Broad, Goods and Services
+DXY_SERIES = series_id('Dollar_Index') # Trade Weighted U.S. Dollar Index: Broad, Goods and Services
 
 def fetch_dollar_index():
     """
     Fetches the Trade Weighted U.S. Dollar Index from FRED.
     """
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={DXY_SERIES}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text), index_col=0, parse_dates=True)
-        return df
-    except Exception as e:
-        print(f"Error fetching Dollar Index: {e}")
+    return dollar_index_from_series(get_fred_series(DXY_SERIES))
+
+def dollar_index_from_series(s):
+    """Returns an already fetched DXY_SERIES as a one-column frame, or None if it is missing."""
+    if s is None:
+        print("Error fetching Dollar Index")
         return None
+    return s.to_frame()
 
 def fetch_neutral_assets():
     """
     Fetches Gold and Bitcoin prices from Yahoo Finance.
     """
-    tickers = ["GC=F", "BTC-USD"]
     try:
-        data = yf.download(tickers, period="1y", progress=False, auto_adjust=True)['Close']
-        return data
+        # Gold's last close is carried over the weekends BTC-USD trades (see get_close)
+        return get_close(MARKET_TICKERS['neutral_assets'])
     except Exception as e:
         print(f"Error fetching Neutral Assets: {e}")
         return None
 
+def fetch_neutral_assets_history():
+    """
+    Fetches the daily Gold/Bitcoin KPI series (prices, BTC in gold ounces, rebased indices).
+    """
+    try:
+        return neutral_asset_series(get_close(MARKET_TICKERS['neutral_assets']))
+    except Exception as e:
+        print(f"Error fetching Neutral Assets: {e}")
+        return None
+
+def assemble_module_2_results(tic_data, fred_tic, gold_reserves, dxy_data, neutral_assets):
+    """
+    Builds the Module 2 results dict from the individual fetch results.
+    """
+    results = {
+        'Foreign_Confidence_TIC': tic_data,
+        'Foreign_Confidence_Total': fred_tic,
+        'China_Gold_Reserves': gold_reserves,
+        'Dollar_Index': dxy_data.iloc[-1].item() if dxy_data is not None and not dxy_data.empty else None,
+        'Gold_Price': neutral_assets['GC=F'].iloc[-1] if neutral_assets is not None else None,
+        'Bitcoin_Price': neutral_assets['BTC-USD'].iloc[-1] if neutral_assets is not None else None
+    }
+
+    return results
+
 def fetch_module_2_data():
     """
     Aggregates all data for Module 2: De-Dollarization.
     """
+    # Only the full module needs the TIC and World Bank fetchers; importers of the helpers above do not
+    from fetch_tic_data import fetch_tic_data, fetch_fred_proxy
+    from fetch_gold_data import fetch_gold_data
+
     print("Fetching Module 2 Data (De-Dollarization)...")
 
     # 1. Foreign Confidence (TIC Data)
@@ -53,16 +78,7 @@ def fetch_module_2_data():
     # 4. Performance of Neutral Assets
     neutral_assets = fetch_neutral_assets()
 
-    results = {
-        'Foreign_Confidence_TIC': tic_data,
-        'Foreign_Confidence_Total': fred_tic,
-        'China_Gold_Reserves': gold_reserves,
-        'Dollar_Index': dxy_data.iloc[-1].item() if dxy_data is not None and not dxy_data.empty else None,
-        'Gold_Price': neutral_assets['GC=F'].iloc[-1] if neutral_assets is not None else None,
-        'Bitcoin_Price': neutral_assets['BTC-USD'].iloc[-1] if neutral_assets is not None else None
-    }
-
-    return results
+    return assemble_module_2_results(tic_data, fred_tic, gold_reserves, dxy_data, neutral_assets)
 
 if __name__ == "__main__":
     data = fetch_module_2_data()
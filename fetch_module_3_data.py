@@ -1,33 +1,24 @@
-import yfinance as yf
-import pandas as pd
-import requests
-import io
+from market_data import MARKET_TICKERS, get_close
+from fetch_energy_money import compute_energy_money
+from market_kpis import commodity_series
+from fred_cache import get_fred_series, latest_row
+from indicators import series_id
+
+PRODUCTION_SERIES = series_id('Crude_Production')  # Industrial Production: Mining: Crude Oil
 
 def fetch_energy_money_data():
     """
     Fetches Oil and Treasury Yield data to calculate Energy-Value of Money.
-    Reused from original fetch_energy_money.py logic.
+    Shares the calculation in fetch_energy_money.py and the cached market-data frame.
     """
-    tickers = ["CL=F", "^TNX"]
     try:
-        data = yf.download(tickers, period="1y", progress=False, auto_adjust=True)['Close']
+        data = get_close(MARKET_TICKERS['energy_money'])
 
         # Check if data is valid
         if data.empty or 'CL=F' not in data or '^TNX' not in data:
             return None
 
-        oil_price = data['CL=F'].iloc[-1]
-        tnx_yield_index = data['^TNX'].iloc[-1]
-        treasury_yield = tnx_yield_index / 100.0
-        bond_price = 100 / ((1 + treasury_yield) ** 10)
-        energy_value = bond_price / oil_price
-
-        return {
-            'Oil_Price': oil_price,
-            '10Y_Yield': treasury_yield,
-            'Bond_Price': bond_price,
-            'Energy_Value': energy_value
-        }
+        return compute_energy_money(data)
     except Exception as e:
         print(f"Error fetching Energy-Money data: {e}")
         return None
@@ -37,10 +28,18 @@ def fetch_commodity_prices():
     Fetches Copper and Food (Wheat/Corn) prices.
     """
     # HG=F: Copper, ZW=F: Wheat, ZC=F: Corn
-    tickers = ["HG=F", "ZW=F", "ZC=F"]
     try:
-        data = yf.download(tickers, period="1y", progress=False, auto_adjust=True)['Close']
-        return data.iloc[-1]
+        return get_close(MARKET_TICKERS['commodities']).iloc[-1]
+    except Exception as e:
+        print(f"Error fetching Commodity prices: {e}")
+        return None
+
+def fetch_commodity_history():
+    """
+    Fetches the daily Copper/Wheat/Corn price series and their rebased indices.
+    """
+    try:
+        return commodity_series(get_close(MARKET_TICKERS['commodities']))
     except Exception as e:
         print(f"Error fetching Commodity prices: {e}")
         return None
@@ -51,16 +50,14 @@ def fetch_us_energy_production():
     Series: IPG211111CN (Industrial Production: Mining: Crude Oil, Index 2017=100)
     Note: MCRFPUS2 (Barrels/Day) was returning 404, so using IndPro Index as proxy.
     """
-    series_id = 'IPG211111CN'
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text), index_col=0, parse_dates=True)
-        return df.iloc[-1]
-    except Exception as e:
-        print(f"Error fetching US Energy Production: {e}")
-        return None
+    return energy_production_from_series(get_fred_series(PRODUCTION_SERIES))
+
+def energy_production_from_series(s):
+    """Returns the latest observation of an already fetched PRODUCTION_SERIES, or None if it is missing."""
+    row = latest_row(s)
+    if row is None:
+        print("Error fetching US Energy Production")
+    return row
 
 def fetch_module_3_data():
     print("Fetching Module 3 Data (Physical Economy)...")
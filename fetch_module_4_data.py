@@ -1,82 +1,102 @@
-import pandas as pd
-import requests
-import io
-from fetch_gdelt_news import fetch_gdelt_mentions
-
-# FRED Series
-FRED_SERIES = {
-    'TradeBalance_Total': 'BOPGSTB', # Trade Balance: Goods and Services, Balance of Payments Basis
-    'Imports_China': 'IMPCH',        # U.S. Imports of Goods by Customs Basis from China
-    'Exports_China': 'EXPCH',        # U.S. Exports of Goods by F.A.S. Basis to China
-    'Industrial_Production': 'INDPRO' # Industrial Production: Total Index
-}
-
-# World Bank Series
-WB_SERIES = {
-    'GDP_Nominal': 'NY.GDP.MKTP.CD',
-    'GDP_PPP': 'NY.GDP.MKTP.PP.CD',
-    'Manuf_GDP_Share': 'NV.IND.MANF.ZS' # Manufacturing, value added (% of GDP)
-}
+from datetime import datetime
+from fred_cache import get_fred_series, latest_row
+from indicators import INDICATORS, series_map
+from world_bank import fetch_wb_panel, latest_entry
+from fetch_gdelt_news import fetch_gdelt_mentions, fetch_gdelt_timeline
+
+# FRED and World Bank series of Module 4 (see indicators.REGISTRY)
+FRED_SERIES = series_map('module_4', 'fred')
+WB_SERIES = series_map('module_4', 'worldbank')
+
+# U.S. vs China Economic Scale comparison
+ECONOMIC_SCALE_METRICS = ['GDP_Nominal', 'GDP_PPP']
+ECONOMIC_SCALE_COUNTRIES = list(INDICATORS['GDP_Nominal'].countries)
+
+# World Bank data is annual and lags; a decade of history is enough for the latest values
+WB_START_YEAR = datetime.now().year - 10
+
+def latest_fred_row(s, series_id):
+    """Returns the latest observation of an already fetched FRED series, or None if it is missing."""
+    row = latest_row(s)
+    if row is None:
+        print(f"Error fetching FRED {series_id}")
+    return row
 
 def fetch_fred_series(series_id):
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text), index_col=0, parse_dates=True)
-        return df.iloc[-1]
-    except Exception as e:
-        print(f"Error fetching FRED {series_id}: {e}")
-        return None
+    return latest_fred_row(get_fred_series(series_id), series_id)
 
 def fetch_world_bank_data(indicator, country_code):
     """
     Fetches latest available data from World Bank API.
     """
-    url = f"https://api.worldbank.org/v2/country/{country_code}/indicator/{indicator}?format=json&per_page=1"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        if len(data) > 1 and len(data[1]) > 0:
-            return data[1][0]
-    except Exception as e:
-        print(f"Error fetching World Bank {indicator} for {country_code}: {e}")
-    return None
+    return latest_entry(fetch_wb_panel([indicator], [country_code], start_year=WB_START_YEAR), indicator, country_code)
 
-def fetch_module_4_data():
-    print("Fetching Module 4 Data (Geopolitics)...")
+def fetch_world_bank_panel(countries=ECONOMIC_SCALE_COUNTRIES, start_year=None):
+    """
+    Fetches every WB_SERIES indicator for `countries` in one batched World Bank call.
+    Args:
+        countries (list): ISO3 codes, e.g. world_bank.G20_COUNTRIES for G20-wide comparisons.
+        start_year (int): First year of history; full history when None.
+    Returns:
+        pd.DataFrame: Tidy indicator/country/year/value panel, or None if failure.
+    """
+    return fetch_wb_panel(list(WB_SERIES.values()), countries, start_year=start_year)
+
+def world_bank_results(panel):
+    """
+    Extracts the Module 4 World Bank inputs from a panel.
+    Returns:
+        tuple: (USA manufacturing share entry, economic scale dict of metric -> {country: entry}).
+    """
+    manuf_share = latest_entry(panel, WB_SERIES['Manuf_GDP_Share'], 'USA')
+    economic_scale = {
+        metric_name: {country: latest_entry(panel, WB_SERIES[metric_name], country)
+                      for country in ECONOMIC_SCALE_COUNTRIES}
+        for metric_name in ECONOMIC_SCALE_METRICS
+    }
+    return manuf_share, economic_scale
+
+def compute_us_china_trade_balance(imp_ch, exp_ch):
+    """
+    Calculates the US-China trade balance (Exports - Imports) from the latest FRED rows.
+    Returns:
+        float: Balance in Millions, or None if either input is missing.
+    """
+    if imp_ch is None or exp_ch is None:
+        return None
+    # Note: Imports/Exports are usually monthly millions. Balance = Exp - Imp
+    # Imports are positive numbers in FRED, representing outflow of cash?
+    # Usually Trade Balance = Exports - Imports.
+    return exp_ch.item() - imp_ch.item()
 
+def assemble_module_4_results(balance_ch, trade_total, indpro, manuf_share, economic_scale, news, news_volume=None):
+    """
+    Builds the Module 4 results dict from the individual fetch results.
+    Args:
+        economic_scale (dict): metric name -> {country code: World Bank entry or None}.
+        news_volume (dict): topic -> GDELT article-count pd.Series.
+    """
     results = {}
 
     # 1. Trade Conflict Monitor
-    # Calculate US-China Trade Balance
-    imp_ch = fetch_fred_series(FRED_SERIES['Imports_China'])
-    exp_ch = fetch_fred_series(FRED_SERIES['Exports_China'])
-
-    if imp_ch is not None and exp_ch is not None:
-        # Note: Imports/Exports are usually monthly millions. Balance = Exp - Imp
-        # Imports are positive numbers in FRED, representing outflow of cash?
-        # Usually Trade Balance = Exports - Imports.
-        balance_ch = exp_ch.item() - imp_ch.item()
+    if balance_ch is not None:
         results['US_China_Trade_Balance'] = balance_ch
 
     # Total Trade Balance
-    results['Trade_Balance_Total'] = fetch_fred_series(FRED_SERIES['TradeBalance_Total'])
+    results['Trade_Balance_Total'] = trade_total
 
     # 2. Industrial Onshoring
-    results['Industrial_Production'] = fetch_fred_series(FRED_SERIES['Industrial_Production'])
+    results['Industrial_Production'] = indpro
 
     # Manufacturing Share of GDP (USA)
-    manuf_share = fetch_world_bank_data(WB_SERIES['Manuf_GDP_Share'], 'USA')
     if manuf_share:
         results['Manuf_GDP_Share'] = manuf_share['value']
         results['Manuf_GDP_Share_Year'] = manuf_share['date']
 
     # 3. U.S. vs China Economic Scale
-    for metric_name, indicator in [('GDP_Nominal', WB_SERIES['GDP_Nominal']), ('GDP_PPP', WB_SERIES['GDP_PPP'])]:
-        usa = fetch_world_bank_data(indicator, 'USA')
-        chn = fetch_world_bank_data(indicator, 'CHN')
+    for metric_name, entries in economic_scale.items():
+        usa = entries.get('USA')
+        chn = entries.get('CHN')
 
         if usa:
             results[f'{metric_name}_USA'] = usa['value']
@@ -84,11 +104,35 @@ def fetch_module_4_data():
             results[f'{metric_name}_CHN'] = chn['value']
 
     # 4. Prevailing Ism (GDELT)
-    # We call the existing function
-    results['News_Mentions'] = fetch_gdelt_mentions()
+    results['News_Mentions'] = news
+    results['News_Volume'] = news_volume
 
     return results
 
+def fetch_module_4_data():
+    print("Fetching Module 4 Data (Geopolitics)...")
+
+    # 1. Trade Conflict Monitor
+    # Calculate US-China Trade Balance
+    imp_ch = fetch_fred_series(FRED_SERIES['Imports_China'])
+    exp_ch = fetch_fred_series(FRED_SERIES['Exports_China'])
+    balance_ch = compute_us_china_trade_balance(imp_ch, exp_ch)
+
+    trade_total = fetch_fred_series(FRED_SERIES['TradeBalance_Total'])
+
+    # 2. Industrial Onshoring
+    indpro = fetch_fred_series(FRED_SERIES['Industrial_Production'])
+
+    # Manufacturing share and 3. U.S. vs China Economic Scale: one World Bank call
+    manuf_share, economic_scale = world_bank_results(fetch_world_bank_panel(start_year=WB_START_YEAR))
+
+    # 4. Prevailing Ism (GDELT)
+    # We call the existing function
+    news = fetch_gdelt_mentions()
+    news_volume = fetch_gdelt_timeline()
+
+    return assemble_module_4_results(balance_ch, trade_total, indpro, manuf_share, economic_scale, news, news_volume)
+
 if __name__ == "__main__":
     data = fetch_module_4_data()
 
@@ -111,3 +155,7 @@ if __name__ == "__main__":
 
     if 'News_Mentions' in data:
         print(f"News Tracker: {len(data['News_Mentions'])} topics tracked.")
+
+    if data.get('News_Volume'):
+        for topic, series in data['News_Volume'].items():
+            print(f"  {topic}: {series.sum():,.0f} articles")
@@ -1,49 +1,73 @@
-import requests
-import re
 import pandas as pd
-from datetime import datetime
-import io
+import http_client
+from config import source_url
+import metrics
+from tic_parser import parse_mfh_lines
+from fred_cache import get_fred_series
+from indicator_store import store_series
+from indicators import series_id
 
 # URL for Major Foreign Holders of Treasury Securities (Text File)
 TIC_URL = "https://ticdata.treasury.gov/resource-center/data-chart-center/tic/Documents/mfh.txt"
 
-def fetch_tic_data():
+# Federal Debt Held by Foreign and International Investors
+FRED_PROXY_SERIES = series_id('Foreign_Holdings_Total')
+
+# Dashboard keys -> row labels in the TIC table
+TIC_COUNTRIES = {
+    'China': series_id('TIC_China'),
+    'Japan': series_id('TIC_Japan')
+}
+
+def fetch_tic_panel():
     """
-    Fetches TIC data and returns a dictionary with the results.
+    Fetches the TIC "Major Foreign Holders" table, streaming and parsing it line by line.
     Returns:
-        dict: containing 'China', 'Japan' holdings (in Billions) or None if failed.
+        pd.DataFrame: Holdings in Billions, country x month, or None if failed.
     """
-    print(f"Fetching TIC Data from {TIC_URL}...")
-    results = {}
-
     try:
-        response = requests.get(TIC_URL)
+        response = http_client.get(source_url(TIC_URL, 'POLYDASH_TIC_URL'), stream=True)
         response.raise_for_status()
-        raw_text = response.text
-
-        lines = raw_text.split('\n')
-
-        china_line = None
-        japan_line = None
+        # Includes reading the streamed body, which is parsed as it arrives
+        with metrics.timed('polydash_parse_seconds', source='tic'):
+            panel = parse_mfh_lines(response.iter_lines())
+    except Exception as e:
+        print(f"Error fetching TIC data: {e}")
+        metrics.record_error('tic', e)
+        return None
 
-        for line in lines:
-            if "China, Mainland" in line:
-                china_line = line
-            if "Japan" in line:
-                japan_line = line
+    if isinstance(panel.columns, pd.DatetimeIndex):
+        for country, row in panel.iterrows():
+            store_series('tic', country, row)
 
-        if china_line:
-            parts = china_line.split()
-            results['China'] = parts[-1]
+    return panel
 
-        if japan_line:
-            parts = japan_line.split()
-            results['Japan'] = parts[-1]
+def fetch_tic_data():
+    """
+    Fetches TIC data and returns a dictionary with the results.
+    Returns:
+        dict: containing 'China', 'Japan' holdings (in Billions) for the latest month, or None if failed.
+    """
+    print(f"Fetching TIC Data from {TIC_URL}...")
+    return tic_holdings_from_panel(fetch_tic_panel())
 
-    except Exception as e:
-        print(f"Error fetching TIC data: {e}")
+def tic_holdings_from_panel(panel):
+    """
+    Extracts the latest TIC_COUNTRIES holdings from a fetch_tic_panel() result.
+    Returns:
+        dict: containing 'China', 'Japan' holdings (in Billions), or None if the panel is missing.
+    """
+    if panel is None:
         return None
 
+    results = {}
+    if not panel.empty:
+        # Columns are in ascending month order
+        latest = panel.iloc[:, -1]
+        for key, label in TIC_COUNTRIES.items():
+            if label in latest.index and pd.notna(latest[label]):
+                results[key] = str(latest[label])
+
     return results
 
 def fetch_fred_proxy():
@@ -52,17 +76,14 @@ def fetch_fred_proxy():
     Returns:
         float: Total holdings in Billions, or None.
     """
-    url = "https://fred.stlouisfed.org/graph/fredgraph.csv?id=FDHBFIN"
-    try:
-        # Refactored to use requests so it can be mocked easily
-        response = requests.get(url)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text), index_col=0, parse_dates=True)
-        latest_val = df['FDHBFIN'].iloc[-1]
-        return latest_val
-    except Exception as e:
-        print(f"Error fetching FRED proxy: {e}")
+    return fred_proxy_from_series(get_fred_series(FRED_PROXY_SERIES))
+
+def fred_proxy_from_series(s):
+    """Returns the latest value of an already fetched FRED_PROXY_SERIES, or None if it is missing."""
+    if s is None or s.empty:
+        print("Error fetching FRED proxy")
         return None
+    return s.iloc[-1]
 
 if __name__ == "__main__":
     tic_data = fetch_tic_data()
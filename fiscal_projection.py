@@ -0,0 +1,234 @@
+"""
+Monte Carlo projection of the Fiscal Unsustainability Ratio.
+
+Starting from the latest quarter of the fiscal frame, every path simulates annual Treasury
+yields, nominal growth, mandatory-spending growth and deficits. The simulation is vectorized
+across paths; large runs are split into fixed-size chunks on a process pool.
+
+Per year and path:
+    yields and growth       mean-reverting, with correlated shocks
+    effective rate on debt  moves towards the new-issue rate by 1 / average maturity
+    revenue, GDP            grow with nominal growth
+    mandatory spending      grows with nominal growth plus an excess (aging, health costs)
+    debt                    grows by interest plus the primary deficit
+"""
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Latest values the projection starts from (flows SAAR in $B; debt ratio and yields in %)
+START_COLUMNS = ['Revenue', 'Interest', 'Mandatory_Proxy', 'PublicDebt_GDP', 'Yield2Y', 'Yield10Y', 'GDP']
+
+# Rates and growth in % per year; volatilities are the std of annual shocks in percentage points
+DEFAULT_ASSUMPTIONS = {
+    'short_yield_target': 3.0,       # Long-run 2Y yield
+    'long_yield_target': 4.0,        # Long-run 10Y yield
+    'yield_reversion': 0.25,         # Share of the gap to target closed per year
+    'short_yield_vol': 0.9,
+    'long_yield_vol': 0.7,
+    'yield_correlation': 0.8,
+    'growth_target': 4.0,            # Nominal GDP growth, which revenue tracks
+    'growth_reversion': 0.5,
+    'growth_vol': 1.5,
+    'growth_yield_correlation': 0.3,
+    'mandatory_excess_growth': 1.0,  # Mandatory spending growth above nominal GDP
+    'mandatory_excess_vol': 0.5,
+    'primary_deficit': 3.0,          # % of GDP, before the extra mandatory spending
+    'primary_deficit_vol': 1.0,
+    'short_issuance_share': 0.5,     # New debt issued at the 2Y rate; the rest at the 10Y rate
+    'average_maturity': 6.0          # Years
+}
+
+# Overrides of DEFAULT_ASSUMPTIONS
+SCENARIOS = {
+    'baseline': {},
+    'higher_for_longer': {'short_yield_target': 4.5, 'long_yield_target': 5.0, 'yield_reversion': 0.15},
+    'low_growth': {'growth_target': 3.0},
+    'consolidation': {'primary_deficit': 1.0}
+}
+
+DEFAULT_PATHS = 100_000
+DEFAULT_YEARS = 30
+
+# Paths per random stream and pool task. Fixed, so a seeded run gives the same result on any number of workers.
+CHUNK_PATHS = 25_000
+
+# Runs with fewer paths stay in-process: starting workers costs more than it saves
+POOL_MIN_PATHS = 50_000
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# The ratio at which mandatory spending plus interest consume all revenue
+CROSSING_LEVEL = 1.0
+
+# Simulated ratio per year (rows) and path (columns)
+PROJECTED = ['Fiscal_Unsustainability_Ratio', 'Interest_Revenue_Ratio', 'PublicDebt_GDP']
+
+# fans: name -> DataFrame of PERCENTILES by year. crossing: see crossing_summary().
+Projection = namedtuple('Projection', ['start', 'fans', 'crossing', 'paths'])
+
+def starting_point(df):
+    """
+    Returns the latest quarter of the fiscal frame with every START_COLUMNS value, as a dict
+    (plus 'date'), or None if there is none.
+    """
+    if df is None or any(column not in df for column in START_COLUMNS):
+        return None
+    complete = df[START_COLUMNS].dropna()
+    if complete.empty:
+        return None
+    start = {column: float(value) for column, value in complete.iloc[-1].items()}
+    start['date'] = complete.index[-1]
+    return start
+
+def _shock_matrix(a):
+    # Cholesky factor of the (short yield, long yield, growth) shock correlations
+    rho_y, rho_g = a['yield_correlation'], a['growth_yield_correlation']
+    correlation = np.array([[1.0, rho_y, rho_g], [rho_y, 1.0, rho_g], [rho_g, rho_g, 1.0]])
+    return np.linalg.cholesky(correlation).T * np.array([a['short_yield_vol'], a['long_yield_vol'], a['growth_vol']])
+
+def simulate_paths(start, assumptions, paths, years, seed):
+    """
+    Simulates `paths` paths from one random stream, vectorized across paths.
+    Returns:
+        dict: PROJECTED name -> float32 array of shape (years + 1, paths); row 0 is the start.
+    """
+    a = assumptions
+    rng = np.random.default_rng(seed)
+    shocks = _shock_matrix(a)
+
+    revenue = np.full(paths, start['Revenue'], dtype='float64')
+    mandatory = np.full(paths, start['Mandatory_Proxy'], dtype='float64')
+    gdp = np.full(paths, start['GDP'], dtype='float64')
+    debt = gdp * start['PublicDebt_GDP'] / 100
+    # Effective rate implied by the latest interest bill
+    effective_rate = np.full(paths, start['Interest'] / debt[0], dtype='float64')
+    short_yield = np.full(paths, start['Yield2Y'], dtype='float64')
+    long_yield = np.full(paths, start['Yield10Y'], dtype='float64')
+    growth = np.full(paths, a['growth_target'], dtype='float64')
+    # Mandatory spending as a share of GDP at the start; growth above it widens the deficit
+    mandatory_share = start['Mandatory_Proxy'] / start['GDP']
+
+    out = {name: np.empty((years + 1, paths), dtype='float32') for name in PROJECTED}
+    out['Fiscal_Unsustainability_Ratio'][0] = (start['Mandatory_Proxy'] + start['Interest']) / start['Revenue']
+    out['Interest_Revenue_Ratio'][0] = start['Interest'] / start['Revenue']
+    out['PublicDebt_GDP'][0] = start['PublicDebt_GDP']
+
+    for year in range(1, years + 1):
+        z = rng.standard_normal((paths, 3)) @ shocks
+        short_yield += a['yield_reversion'] * (a['short_yield_target'] - short_yield) + z[:, 0]
+        long_yield += a['yield_reversion'] * (a['long_yield_target'] - long_yield) + z[:, 1]
+        np.maximum(short_yield, 0.0, out=short_yield)
+        np.maximum(long_yield, 0.0, out=long_yield)
+        growth += a['growth_reversion'] * (a['growth_target'] - growth) + z[:, 2]
+
+        new_issue_rate = (a['short_issuance_share'] * short_yield + (1 - a['short_issuance_share']) * long_yield) / 100
+        effective_rate += (new_issue_rate - effective_rate) / a['average_maturity']
+        interest = effective_rate * debt
+
+        g = growth / 100
+        gdp *= 1 + g
+        revenue *= 1 + g
+        excess = (a['mandatory_excess_growth'] + a['mandatory_excess_vol'] * rng.standard_normal(paths)) / 100
+        mandatory *= 1 + g + excess
+        primary = (a['primary_deficit'] + a['primary_deficit_vol'] * rng.standard_normal(paths)) / 100
+        debt += interest + (primary + mandatory / gdp - mandatory_share) * gdp
+
+        out['Fiscal_Unsustainability_Ratio'][year] = (mandatory + interest) / revenue
+        out['Interest_Revenue_Ratio'][year] = interest / revenue
+        out['PublicDebt_GDP'][year] = debt / gdp * 100
+    return out
+
+def _simulate_chunk(args):
+    return simulate_paths(*args)
+
+def _chunks(paths):
+    sizes = [CHUNK_PATHS] * (paths // CHUNK_PATHS)
+    if paths % CHUNK_PATHS:
+        sizes.append(paths % CHUNK_PATHS)
+    return sizes
+
+def run_paths(start, assumptions, paths=DEFAULT_PATHS, years=DEFAULT_YEARS, seed=0, workers=None):
+    """
+    Simulates every path, in CHUNK_PATHS chunks with independent random streams.
+    Args:
+        workers (int): Worker processes; None uses one per CPU (up to the number of chunks),
+            1 runs in-process. Runs below POOL_MIN_PATHS always run in-process.
+    Returns:
+        dict: PROJECTED name -> float32 array of shape (years + 1, paths).
+    """
+    sizes = _chunks(paths)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(start, assumptions, size, years, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1 and paths >= POOL_MIN_PATHS:
+        # Spawned workers: the dashboard runs this next to other threads, which fork would copy mid-lock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+    else:
+        results = [_simulate_chunk(task) for task in tasks]
+    return {name: np.concatenate([r[name] for r in results], axis=1) for name in PROJECTED}
+
+def fan_chart(values, index):
+    """Returns the PERCENTILES of every year across paths, as a DataFrame with columns P5 .. P95."""
+    bands = np.percentile(values, PERCENTILES, axis=1)
+    return pd.DataFrame(bands.T, index=index, columns=[f'P{p}' for p in PERCENTILES])
+
+def crossing_years(ratio, level=CROSSING_LEVEL):
+    """Returns the first year index at which each path reaches `level` (0 if it starts there), NaN if never."""
+    crossed = ratio >= level
+    first = crossed.argmax(axis=0).astype('float64')
+    first[~crossed.any(axis=0)] = np.nan
+    return first
+
+def crossing_summary(years_to_cross, index):
+    """
+    Summarizes when the paths cross CROSSING_LEVEL.
+    Returns:
+        dict: 'probability' (share of paths crossing within the horizon), 'percentiles'
+        (percentile -> date of crossing, None where fewer paths cross) and 'by_year'
+        (pd.Series: cumulative share of paths crossed by each projected year).
+    """
+    n_paths = len(years_to_cross)
+    counts = np.bincount(years_to_cross[~np.isnan(years_to_cross)].astype('int64'), minlength=len(index))
+    by_year = pd.Series(np.cumsum(counts) / n_paths, index=index, name='Crossed')
+    # Paths that never cross sort last, so a percentile beyond the crossing share has no date
+    ordered = np.sort(np.where(np.isnan(years_to_cross), np.inf, years_to_cross))
+    percentiles = {}
+    for p in PERCENTILES:
+        year = ordered[min(int(np.ceil(p / 100 * n_paths)) - 1, n_paths - 1)] if n_paths else np.inf
+        percentiles[p] = index[int(year)] if np.isfinite(year) else None
+    return {'probability': float(by_year.iloc[-1]) if len(by_year) else 0.0, 'percentiles': percentiles,
+            'by_year': by_year}
+
+def project(start, paths=DEFAULT_PATHS, years=DEFAULT_YEARS, scenario='baseline', assumptions=None,
+            seed=0, workers=None):
+    """
+    Projects the fiscal ratios from `start` (see starting_point()).
+    Args:
+        scenario (str): Key of SCENARIOS, applied over DEFAULT_ASSUMPTIONS.
+        assumptions (dict): Further overrides of DEFAULT_ASSUMPTIONS.
+    Returns:
+        Projection: Fan charts of every PROJECTED ratio and the distribution of the year the
+        Fiscal Unsustainability Ratio crosses 100%.
+    """
+    merged = dict(DEFAULT_ASSUMPTIONS, **SCENARIOS[scenario], **(assumptions or {}))
+    simulated = run_paths(start, merged, paths, years, seed, workers)
+    index = pd.DatetimeIndex([pd.Timestamp(start['date']) + pd.DateOffset(years=year) for year in range(years + 1)],
+                             name='DATE')
+    fans = {name: fan_chart(values, index) for name, values in simulated.items()}
+    crossing = crossing_summary(crossing_years(simulated['Fiscal_Unsustainability_Ratio']), index)
+    return Projection(start, fans, crossing, paths)
+
+def project_fiscal_frame(df, **kwargs):
+    """Projects from the latest quarter of the fiscal frame. Returns a Projection, or None if failure."""
+    start = starting_point(df)
+    if start is None:
+        print("Missing fiscal series for the projection.")
+        return None
+    return project(start, **kwargs)
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import urllib.parse
+from datetime import datetime
+
+import pandas as pd
+import http_client
+import metrics
+from config import cache_dir, source_url
+from indicator_store import store_series
+from parsing import read_fred_csv
+from releases import RECHECK_INTERVAL, SERIES_RELEASE_LAG, release_window
+from vintage_store import record_vintage
+
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+
+# Native observation period of each release frequency, in days
+FREQUENCY_PERIOD_DAYS = {
+    'D': 1,
+    'W': 7,
+    'M': 31,
+    'Q': 92,
+    'A': 366
+}
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+def _series_paths(series_id):
+    directory = os.path.join(cache_dir(), 'fred')
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, series_id)
+    return base + '.csv', base + '.json'
+
+def _series_lock(series_id):
+    with _locks_guard:
+        return _locks.setdefault(series_id, threading.Lock())
+
+def infer_frequency(index):
+    """
+    Infers the release frequency ('D', 'W', 'M', 'Q' or 'A') from the spacing of observation dates.
+    """
+    if len(index) < 2:
+        return 'D'
+    median_days = pd.Series(index).diff().dt.days.median()
+    for freq in ['D', 'W', 'M', 'Q']:
+        if median_days <= FREQUENCY_PERIOD_DAYS[freq] * 1.5:
+            return freq
+    return 'A'
+
+def parse_fred_csv(body, series_id):
+    """
+    Parses a fredgraph.csv body (bytes or str) into a float Series indexed by observation date.
+    """
+    s = read_fred_csv(body)
+    s.name = series_id
+    return s
+
+def _read_cache(series_id):
+    csv_path, meta_path = _series_paths(series_id)
+    if not (os.path.exists(csv_path) and os.path.exists(meta_path)):
+        return None, None
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(csv_path, 'rb') as f:
+            s = parse_fred_csv(f.read(), series_id)
+        return s, meta
+    except Exception as e:
+        print(f"Discarding unreadable cache for {series_id}: {e}")
+        return None, None
+
+def _write_cache(series_id, s, meta):
+    csv_path, meta_path = _series_paths(series_id)
+    # Write to temp files and rename, so readers never see a partial file
+    s.to_frame().to_csv(csv_path + '.tmp')
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(csv_path + '.tmp', csv_path)
+    os.replace(meta_path + '.tmp', meta_path)
+
+def is_fresh(s, meta, now=None):
+    """
+    Returns True while a cached series cannot have a new observation yet and was
+    checked less than RECHECK_INTERVAL ago.
+    The observation after the last cached one cannot be published before its release
+    window (see releases.release_window, the calendar the scheduler follows too). Before
+    then the series is still re-checked every RECHECK_INTERVAL for its frequency, to pick
+    up revisions.
+    """
+    now = now or datetime.now()
+    freq = meta.get('frequency', 'D')
+    last_checked = datetime.fromisoformat(meta['last_checked'])
+    if s.empty or now - last_checked >= RECHECK_INTERVAL[freq]:
+        return False
+    return now < release_window(s.index[-1], freq, SERIES_RELEASE_LAG.get(meta.get('series_id')))
+
+def build_fred_url(series_id, start_date=None):
+    """Builds the fredgraph.csv URL, optionally limited to observations on or after `start_date`."""
+    params = {'id': series_id}
+    if start_date is not None:
+        params['cosd'] = start_date.strftime('%Y-%m-%d')
+    return f"{source_url(FRED_CSV_URL, 'POLYDASH_FRED_URL')}?{urllib.parse.urlencode(params)}"
+
+def latest_row(s):
+    """Returns the latest observation of a series as a one-row Series named by its date, or None if empty."""
+    if s is None or s.empty:
+        return None
+    return s.to_frame().iloc[-1]
+
+def get_fred_series(series_id, force=False):
+    """
+    Returns the full history of a FRED series, using the local cache.
+    Only observations from the last cached date onwards are downloaded, and no
+    request is made at all while the cached copy is still fresh.
+    Args:
+        force (bool): Ignore freshness and check FRED for new observations.
+    Returns:
+        pd.Series: Float values indexed by date; the cached copy if the request fails,
+        or None if nothing is cached either.
+    """
+    with _series_lock(series_id):
+        cached, meta = _read_cache(series_id)
+
+        if cached is not None and not force and is_fresh(cached, meta):
+            metrics.record_cache('fred', True, series_id)
+            return cached
+        metrics.record_cache('fred', False, series_id)
+
+        # Re-request the last cached observation too, so its revision is picked up
+        start_date = cached.index[-1] if cached is not None and not cached.empty else None
+        url = build_fred_url(series_id, start_date)
+
+        try:
+            response = http_client.get(url)
+            response.raise_for_status()
+            with metrics.timed('polydash_parse_seconds', source='fred', series=series_id):
+                new = parse_fred_csv(response.content, series_id)
+        except Exception as e:
+            print(f"Error fetching {series_id}: {e}")
+            metrics.record_error('fred', e, series_id)
+            return cached
+
+        if cached is not None:
+            s = pd.concat([cached[cached.index < new.index.min()] if not new.empty else cached, new])
+        else:
+            s = new
+        s = s[~s.index.duplicated(keep='last')].sort_index()
+
+        meta = {
+            'series_id': series_id,
+            'frequency': infer_frequency(s.index),
+            'last_checked': datetime.now().isoformat()
+        }
+        _write_cache(series_id, s, meta)
+        store_series('fred', series_id, new)
+        # Point-in-time record: the fetched observations as known today (unchanged ones are skipped)
+        record_vintage(series_id, new)
+        return s
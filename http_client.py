@@ -0,0 +1,122 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# (connect, read) timeouts in seconds. No request may block a refresh forever.
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Retry policy: rate limits and server errors are retried with jittered exponential backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5   # seconds
+BACKOFF_MAX = 8.0    # seconds
+
+# Connection pools: one pool per host, each keeping this many keep-alive connections
+POOL_HOSTS = 10
+POOL_MAXSIZE = 16
+
+DEFAULT_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# requests.get as imported; anything else there is a test double (see get())
+_REQUESTS_GET = requests.get
+
+def get_session():
+    """
+    Returns the shared requests.Session used by every fetcher.
+    Connections to each host (FRED, World Bank, GDELT, Treasury) are pooled and reused.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+def reset_session():
+    """Closes the shared session and its pooled connections (e.g. after a fork)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Returns the delay before retry number `attempt` (0-based), using full jitter.
+    A numeric Retry-After header from the server takes precedence.
+    """
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+def _response_bytes(response, stream):
+    if not stream:
+        return len(response.content)
+    # Reading a streamed body here would consume it, so trust the declared length
+    try:
+        return int(response.headers.get('Content-Length', 0))
+    except (TypeError, ValueError):
+        return 0
+
+def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, stream=False, max_retries=MAX_RETRIES):
+    """
+    GET a URL through the shared pooled session.
+    Retries connection errors, timeouts, 429 and 5xx responses with jittered backoff.
+    Latency, status, bytes and retries are recorded per source (and FRED series) in metrics.
+    When requests.get has been patched (e.g. mocker.patch("requests.get")), the call goes to
+    the patch instead, with only the arguments the caller gave, and without retries; so tests
+    written against requests.get never reach the network.
+    Returns:
+        requests.Response: The final response (callers still call raise_for_status()).
+    """
+    if requests.get is not _REQUESTS_GET:
+        kwargs = {'params': params, 'headers': headers,
+                  'timeout': timeout if timeout != DEFAULT_TIMEOUT else None, 'stream': stream or None}
+        return requests.get(url, **{key: value for key, value in kwargs.items() if value is not None})
+
+    session = get_session()
+    source = metrics.source_for_url(url)
+    series = metrics.series_for_url(url)
+    with metrics.timed('polydash_request_seconds', source=source, series=series):
+        for attempt in range(max_retries + 1):
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.inc('polydash_requests_total', source=source, status=type(e).__name__)
+                if attempt == max_retries:
+                    raise
+                metrics.inc('polydash_retries_total', source=source)
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            metrics.inc('polydash_requests_total', source=source, status=response.status_code)
+            if response.status_code in RETRY_STATUSES and attempt < max_retries:
+                retry_after = response.headers.get('Retry-After')
+                response.close()
+                metrics.inc('polydash_retries_total', source=source)
+                time.sleep(backoff_delay(attempt, retry_after))
+                continue
+
+            metrics.inc('polydash_response_bytes_total', _response_bytes(response, stream), source=source, series=series)
+            metrics.log_event('http_response', source=source, series=series, status=response.status_code,
+                              attempts=attempt + 1)
+            return response
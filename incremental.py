@@ -0,0 +1,194 @@
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+from config import cache_dir
+
+# Saved outputs: two append-only files per KPI computation, rows in the order of the index
+INDEX_FILE = '{name}.index'     # index values in their own datetime64 dtype
+VALUES_FILE = '{name}.values'   # float64 rows of every output column
+
+_lock = threading.Lock()
+
+def _kpi_path(filename):
+    directory = os.path.join(cache_dir(), 'kpi')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+def _state_path(name):
+    return _kpi_path(f'{name}.pkl')
+
+def load_state(name):
+    """Returns the saved state of a KPI computation, or None."""
+    path = _state_path(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"Discarding unreadable KPI state {name}: {e}")
+        return None
+
+def save_state(name, state):
+    path = _state_path(name)
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+def discard_state(name):
+    """Deletes the saved state of a KPI computation (its saved outputs are then ignored)."""
+    if os.path.exists(_state_path(name)):
+        os.remove(_state_path(name))
+
+def row_hashes(frame):
+    """Returns a uint64 hash of every row of `frame`, index included (NaNs hash alike)."""
+    return pd.util.hash_pandas_object(frame, index=True).to_numpy()
+
+def _output_paths(name):
+    return _kpi_path(INDEX_FILE.format(name=name)), _kpi_path(VALUES_FILE.format(name=name))
+
+def read_outputs(name, layout, rows):
+    """
+    Reads the first `rows` saved output rows of a KPI computation.
+    Args:
+        layout (dict): 'columns', 'dtypes', 'index_dtype' and 'index_name' of the saved frame.
+    Returns:
+        pd.DataFrame: The rows, or None if the files hold fewer.
+    """
+    index_path, values_path = _output_paths(name)
+    index_dtype = np.dtype(layout['index_dtype'])
+    width = len(layout['columns'])
+    if rows == 0:
+        index, values = np.empty(0, dtype=index_dtype), np.empty((0, width))
+    else:
+        if (not os.path.exists(index_path) or os.path.getsize(index_path) < rows * index_dtype.itemsize
+                or os.path.getsize(values_path) < rows * width * 8):
+            return None
+        index = np.memmap(index_path, dtype=index_dtype, mode='r', shape=(rows,))
+        values = np.memmap(values_path, dtype='float64', mode='r', shape=(rows, width))
+    frame = pd.DataFrame(np.array(values), index=pd.Index(np.array(index), name=layout['index_name']),
+                         columns=layout['columns'])
+    return frame.astype(layout['dtypes'])
+
+def write_outputs(name, outputs, start):
+    """
+    Keeps the first `start` saved output rows and appends `outputs` after them.
+    Returns:
+        dict: The layout of the saved frame (see read_outputs).
+    """
+    index_path, values_path = _output_paths(name)
+    index_dtype = outputs.index.dtype
+    width = len(outputs.columns)
+    for path, row_bytes in [(index_path, index_dtype.itemsize), (values_path, width * 8)]:
+        with open(path, 'ab') as f:
+            f.truncate(start * row_bytes)
+    with open(values_path, 'ab') as f:
+        f.write(outputs.to_numpy(dtype='float64').tobytes())
+    with open(index_path, 'ab') as f:
+        f.write(outputs.index.to_numpy().tobytes())
+    return {'columns': list(outputs.columns), 'dtypes': outputs.dtypes.astype(str).to_dict(),
+            'index_dtype': str(index_dtype), 'index_name': outputs.index.name}
+
+def first_changed_position(prev, new):
+    """
+    Returns the first row position of `new` that differs from `prev`
+    (a revised value, a new row, or a different date), or None if `new` is an unchanged prefix of `prev`.
+    Both frames must have the same columns; NaNs compare equal.
+    """
+    common = min(len(prev), len(new))
+    prev_index = prev.index[:common]
+    new_index = new.index[:common]
+
+    changed = np.asarray(prev_index != new_index)
+    prev_values = prev.to_numpy(dtype='float64')[:common]
+    new_values = new.to_numpy(dtype='float64')[:common]
+    same = (prev_values == new_values) | (np.isnan(prev_values) & np.isnan(new_values))
+    changed |= ~same.all(axis=1)
+
+    if changed.any():
+        return int(np.argmax(changed))
+    if len(new) > common:
+        return common
+    return None
+
+def recompute_incremental(prev_inputs, prev_outputs, new_inputs, compute, lookback):
+    """
+    Recomputes only the output rows affected by new or revised inputs.
+    Args:
+        compute (callable): inputs frame -> outputs frame on the same index. Each output
+            row may only depend on the same input row and the `lookback` rows before it.
+        lookback (int): Trailing window of the rolling/YoY metrics (0 for row-wise KPIs).
+    Returns:
+        pd.DataFrame: Identical to compute(new_inputs).
+    """
+    if prev_inputs is None or prev_outputs is None or list(prev_inputs.columns) != list(new_inputs.columns):
+        return compute(new_inputs)
+
+    pos = first_changed_position(prev_inputs, new_inputs)
+    if pos is None:
+        # Nothing new; history may only have been truncated
+        return prev_outputs.iloc[:len(new_inputs)].copy()
+
+    return pd.concat([prev_outputs.iloc[:pos], recompute_tail(new_inputs, pos, compute, lookback)])
+
+def recompute_tail(inputs, pos, compute, lookback):
+    """Returns the output rows of `inputs` from position `pos` on, computed over just the rows they depend on."""
+    start = max(pos - lookback, 0)
+    return compute(inputs.iloc[start:]).iloc[pos - start:]
+
+def first_changed_row(state, new):
+    """
+    Like first_changed_position, but compares `new` with the row hashes saved in `state`
+    instead of the previous inputs themselves.
+    Returns 0 when the columns differ, so that everything is recomputed.
+    """
+    if list(new.columns) != state['columns']:
+        return 0
+    rows = state['rows']
+    common = min(rows, len(new))
+    changed = row_hashes(new.iloc[:common]) != state['hashes'][:common]
+    if changed.any():
+        return int(np.argmax(changed))
+    return common if len(new) != rows else None
+
+def update_kpis(name, inputs, compute, lookback, incremental=True):
+    """
+    Computes a KPI frame, reusing the outputs saved by the previous refresh.
+    Every input row is compared, by hash, with the previous refresh; only the rows from the
+    first change on are recomputed (a typical refresh adds one period, so `lookback` + 1 rows)
+    and written to disk. The result is identical to compute(inputs).
+    """
+    if not incremental:
+        return compute(inputs)
+
+    with _lock:
+        state = load_state(name)
+        pos = first_changed_row(state, inputs) if state is not None else 0
+        prefix = read_outputs(name, state['layout'], pos or state['rows']) if pos != 0 else None
+        if prefix is None:
+            pos = 0
+        elif pos is None:
+            # Outputs share the index of the inputs, whose frequency the saved index does not keep
+            prefix.index = inputs.index
+            return prefix
+
+        tail = recompute_tail(inputs, pos, compute, lookback)
+        # Drop the state first when saved rows are rewritten: an interrupted write then means a full recompute
+        if state is not None and pos < state['rows']:
+            discard_state(name)
+        layout = write_outputs(name, tail, pos)
+        save_state(name, {
+            'columns': list(inputs.columns),
+            'rows': len(inputs),
+            'hashes': row_hashes(inputs),
+            'layout': layout
+        })
+    if not pos:
+        return tail
+    outputs = pd.concat([prefix, tail])
+    outputs.index = inputs.index
+    return outputs
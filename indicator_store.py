@@ -0,0 +1,137 @@
+import os
+import threading
+import urllib.parse
+
+import numpy as np
+import pandas as pd
+
+from config import cache_dir
+
+# Sources partitioning the store: <cache_dir>/store/<source>/<series>/
+SOURCES = ['fred', 'worldbank', 'yahoo', 'tic']
+
+# Each series is two append-only column files of equal length
+DATES_FILE = 'dates.M8'    # datetime64[ns], strictly increasing
+VALUES_FILE = 'values.f8'  # float64
+
+DATE_DTYPE = np.dtype('M8[ns]')
+VALUE_DTYPE = np.dtype('f8')
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+def store_dir():
+    """Returns the root directory of the indicator store."""
+    return os.path.join(cache_dir(), 'store')
+
+def _series_dir(source, series_id):
+    # Tickers and World Bank codes contain characters such as '^', '=' and '.'
+    return os.path.join(store_dir(), source, urllib.parse.quote(series_id, safe=''))
+
+def _series_lock(source, series_id):
+    with _locks_guard:
+        return _locks.setdefault((source, series_id), threading.Lock())
+
+def _memmap(path, dtype, length):
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+
+def _read_columns(source, series_id):
+    directory = _series_dir(source, series_id)
+    dates_path = os.path.join(directory, DATES_FILE)
+    values_path = os.path.join(directory, VALUES_FILE)
+    if not os.path.exists(dates_path) or not os.path.exists(values_path):
+        return np.empty(0, dtype=DATE_DTYPE), np.empty(0, dtype=VALUE_DTYPE)
+
+    # Values are written before dates, so a row only counts once both columns hold it
+    length = _common_length(dates_path, values_path)
+    return _memmap(dates_path, DATE_DTYPE, length), _memmap(values_path, VALUE_DTYPE, length)
+
+def _common_length(dates_path, values_path):
+    return min(os.path.getsize(dates_path) // DATE_DTYPE.itemsize,
+               os.path.getsize(values_path) // VALUE_DTYPE.itemsize)
+
+def _truncate_columns(directory):
+    """
+    Cuts both column files to the rows they have in common. An append interrupted between
+    the two writes leaves values without dates, which would misalign every later row.
+    """
+    dates_path = os.path.join(directory, DATES_FILE)
+    values_path = os.path.join(directory, VALUES_FILE)
+    if not os.path.exists(dates_path) or not os.path.exists(values_path):
+        for path in [dates_path, values_path]:
+            if os.path.exists(path):
+                os.truncate(path, 0)
+        return
+    length = _common_length(dates_path, values_path)
+    for path, dtype in [(dates_path, DATE_DTYPE), (values_path, VALUE_DTYPE)]:
+        if os.path.getsize(path) != length * dtype.itemsize:
+            os.truncate(path, length * dtype.itemsize)
+
+def last_date(source, series_id):
+    """Returns the date of the last stored observation, or None if the series is empty."""
+    dates, _ = _read_columns(source, series_id)
+    return pd.Timestamp(dates[-1]) if len(dates) else None
+
+def append_series(source, series_id, s):
+    """
+    Appends the observations of `s` that are newer than the last stored date.
+    Stored history is never rewritten; missing values are skipped.
+    Args:
+        s (pd.Series): Values indexed by date.
+    Returns:
+        int: Number of observations appended.
+    """
+    s = pd.to_numeric(s, errors='coerce').dropna()
+    if s.empty:
+        return 0
+    s = s.copy()
+    s.index = pd.DatetimeIndex(s.index)
+    s = s[~s.index.duplicated(keep='last')].sort_index()
+
+    with _series_lock(source, series_id):
+        last = last_date(source, series_id)
+        if last is not None:
+            s = s[s.index > last]
+        if s.empty:
+            return 0
+
+        directory = _series_dir(source, series_id)
+        os.makedirs(directory, exist_ok=True)
+        _truncate_columns(directory)
+        with open(os.path.join(directory, VALUES_FILE), 'ab') as f:
+            f.write(s.to_numpy(dtype=VALUE_DTYPE).tobytes())
+        with open(os.path.join(directory, DATES_FILE), 'ab') as f:
+            f.write(s.index.values.astype(DATE_DTYPE).tobytes())
+        return len(s)
+
+def store_series(source, series_id, s):
+    """
+    Appends to the store from a fetcher. Store errors are reported but never fail the fetch.
+    """
+    try:
+        return append_series(source, series_id, s)
+    except Exception as e:
+        print(f"Error storing {source}/{series_id}: {e}")
+        return 0
+
+def read_series(source, series_id, start=None, end=None):
+    """
+    Reads a stored series from memory-mapped column files, without any network access.
+    Args:
+        start, end: Optional inclusive date bounds, resolved by binary search on the date column.
+    Returns:
+        pd.Series: Float values indexed by date (empty if nothing is stored).
+    """
+    dates, values = _read_columns(source, series_id)
+    lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left') if start is not None else 0
+    hi = np.searchsorted(dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right') if end is not None else len(dates)
+    return pd.Series(values[lo:hi], index=pd.DatetimeIndex(dates[lo:hi], name='DATE'), name=series_id)
+
+def list_series(source):
+    """Returns the ids of every series stored for `source`."""
+    directory = os.path.join(store_dir(), source)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(urllib.parse.unquote(name) for name in os.listdir(directory))
@@ -0,0 +1,125 @@
+from collections import namedtuple
+
+# One dashboard input. `series_id` is the source's own key: a FRED series ID, a Yahoo ticker,
+# a World Bank indicator code, a TIC table row label or a GDELT query.
+Indicator = namedtuple('Indicator', ['name', 'module', 'source', 'series_id', 'countries', 'description'])
+
+# One upstream call of the refresh plan, serving every indicator in `indicators`
+Request = namedtuple('Request', ['source', 'series_ids', 'countries', 'indicators'])
+
+# requests: request key -> Request. routes: indicator name -> request key.
+Plan = namedtuple('Plan', ['requests', 'routes'])
+
+def _indicator(name, module, source, series_id, description, countries=()):
+    return Indicator(name, module, source, series_id, tuple(countries), description)
+
+US_CHINA = ('USA', 'CHN')
+
+REGISTRY = [
+    # Module 1: U.S. Fiscal & Monetary Health
+    _indicator('Revenue', 'module_1', 'fred', 'W006RC1Q027SBEA', "Federal Government Current Receipts"),
+    _indicator('Interest', 'module_1', 'fred', 'A091RC1Q027SBEA', "Federal Government Interest Payments"),
+    _indicator('SocialSecurity', 'module_1', 'fred', 'W823RC1', "Social Security Benefits"),
+    _indicator('Medicare', 'module_1', 'fred', 'W824RC1', "Medicare Benefits"),
+    _indicator('Medicaid', 'module_1', 'fred', 'W825RC1', "Medicaid Benefits"),
+    _indicator('PublicDebt_GDP', 'module_1', 'fred', 'GFDEGDQ188S', "Federal Debt: Total Public Debt as Percent of GDP"),
+    _indicator('FedBalanceSheet', 'module_1', 'fred', 'WALCL', "Fed Total Assets (Less Eliminations from Consolidation)"),
+    _indicator('Yield10Y', 'module_1', 'fred', 'GS10', "10-Year Treasury Constant Maturity Rate"),
+    _indicator('Yield2Y', 'module_1', 'fred', 'GS2', "2-Year Treasury Constant Maturity Rate"),
+    _indicator('GDP', 'module_1', 'fred', 'GDP', "Gross Domestic Product (nominal, SAAR)"),
+
+    # Module 2: De-Dollarization
+    _indicator('TIC_China', 'module_2', 'tic', 'China, Mainland', "China holdings of U.S. Treasuries"),
+    _indicator('TIC_Japan', 'module_2', 'tic', 'Japan', "Japan holdings of U.S. Treasuries"),
+    _indicator('Foreign_Holdings_Total', 'module_2', 'fred', 'FDHBFIN',
+               "Federal Debt Held by Foreign and International Investors"),
+    _indicator('China_Reserves', 'module_2', 'worldbank', 'FI.RES.TOTL.CD', "Total Reserves (incl. Gold), current US$",
+               countries=['CHN']),
+    _indicator('Dollar_Index', 'module_2', 'fred', 'DTWEXBGS',
+               "Trade Weighted U.S. Dollar Index: Broad, Goods and Services"),
+    _indicator('Gold', 'module_2', 'yahoo', 'GC=F', "Gold futures"),
+    _indicator('Bitcoin', 'module_2', 'yahoo', 'BTC-USD', "Bitcoin"),
+
+    # Module 3: Physical vs. Financial Economy
+    _indicator('Oil', 'module_3', 'yahoo', 'CL=F', "WTI Crude futures"),
+    _indicator('Treasury_10Y', 'module_3', 'yahoo', '^TNX', "10-Year Treasury Yield Index"),
+    _indicator('Copper', 'module_3', 'yahoo', 'HG=F', "Copper futures"),
+    _indicator('Wheat', 'module_3', 'yahoo', 'ZW=F', "Wheat futures"),
+    _indicator('Corn', 'module_3', 'yahoo', 'ZC=F', "Corn futures"),
+    _indicator('Crude_Production', 'module_3', 'fred', 'IPG211111CN',
+               "Industrial Production: Mining: Crude Oil (proxy for U.S. oil output)"),
+
+    # Module 4: Geopolitical Realignment
+    _indicator('TradeBalance_Total', 'module_4', 'fred', 'BOPGSTB', "Trade Balance: Goods and Services, BOP Basis"),
+    _indicator('Imports_China', 'module_4', 'fred', 'IMPCH', "U.S. Imports of Goods from China"),
+    _indicator('Exports_China', 'module_4', 'fred', 'EXPCH', "U.S. Exports of Goods to China"),
+    _indicator('Industrial_Production', 'module_4', 'fred', 'INDPRO', "Industrial Production: Total Index"),
+    _indicator('GDP_Nominal', 'module_4', 'worldbank', 'NY.GDP.MKTP.CD', "GDP, current US$", countries=US_CHINA),
+    _indicator('GDP_PPP', 'module_4', 'worldbank', 'NY.GDP.MKTP.PP.CD', "GDP, PPP", countries=US_CHINA),
+    _indicator('Manuf_GDP_Share', 'module_4', 'worldbank', 'NV.IND.MANF.ZS', "Manufacturing, value added (% of GDP)",
+               countries=['USA']),
+    _indicator('Tariffs', 'module_4', 'gdelt', 'tariffs', "News coverage of tariffs"),
+    _indicator('Protectionism', 'module_4', 'gdelt', '(tariffs OR protectionism)', "News coverage of protectionism"),
+    _indicator('Free_Trade', 'module_4', 'gdelt', '("free trade" OR globalization)', "News coverage of free trade"),
+]
+
+INDICATORS = {indicator.name: indicator for indicator in REGISTRY}
+
+# Sources that serve every requested series in one call; the others take one call per series
+BATCHED_SOURCES = {'yahoo', 'worldbank', 'tic', 'gdelt'}
+
+def select(module=None, source=None):
+    """Returns the registered indicators of `module` and/or `source`, in registry order."""
+    return [indicator for indicator in REGISTRY
+            if (module is None or indicator.module == module) and (source is None or indicator.source == source)]
+
+def series_map(module, source):
+    """Returns {indicator name: series_id} for one module and source."""
+    return {indicator.name: indicator.series_id for indicator in select(module, source)}
+
+def series_id(name):
+    """Returns the source key of a registered indicator."""
+    return INDICATORS[name].series_id
+
+def request_series_map(request):
+    """Returns {indicator name: series_id} for every indicator served by a planned request."""
+    return {name: INDICATORS[name].series_id for name in request.indicators}
+
+def request_key(indicator):
+    return indicator.source if indicator.source in BATCHED_SOURCES else f"{indicator.source}:{indicator.series_id}"
+
+def plan_requests(names=None):
+    """
+    Collapses the requested indicators into the fewest upstream calls.
+    Indicators sharing a series are fetched once; batched sources get a single call
+    covering the union of their series (and countries).
+    Args:
+        names (iterable): Indicator names; every registered indicator when None.
+    Returns:
+        Plan: `requests` (request key -> Request) and `routes` (indicator name -> request key).
+    """
+    selected = REGISTRY if names is None else [INDICATORS[name] for name in names]
+    grouped = {}
+    routes = {}
+    for indicator in selected:
+        key = request_key(indicator)
+        routes[indicator.name] = key
+        group = grouped.setdefault(key, {'source': indicator.source, 'series_ids': {}, 'countries': {}, 'indicators': []})
+        group['series_ids'][indicator.series_id] = None
+        group['countries'].update(dict.fromkeys(indicator.countries))
+        group['indicators'].append(indicator.name)
+
+    requests = {key: Request(group['source'], tuple(group['series_ids']), tuple(group['countries']),
+                             tuple(group['indicators']))
+                for key, group in grouped.items()}
+    return Plan(requests, routes)
+
+def describe_plan(plan):
+    """Returns a one-line-per-source summary: indicators requested vs. upstream calls planned."""
+    lines = []
+    for source in dict.fromkeys(request.source for request in plan.requests.values()):
+        requests = [r for r in plan.requests.values() if r.source == source]
+        indicators = sum(len(r.indicators) for r in requests)
+        series = sum(len(r.series_ids) for r in requests)
+        lines.append(f"{source}: {indicators} indicators, {series} series, {len(requests)} requests")
+    return '\n'.join(lines)
@@ -0,0 +1,149 @@
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import http_client
+import metrics
+from config import source_url
+from indicator_store import store_series
+from indicators import series_id
+from market_kpis import ffill_columns
+
+# Every Yahoo Finance ticker used by any module, so a refresh needs a single batched download
+MARKET_TICKERS = {
+    'energy_money': [series_id('Oil'), series_id('Treasury_10Y')],
+    'commodities': [series_id('Copper'), series_id('Wheat'), series_id('Corn')],
+    'neutral_assets': [series_id('Gold'), series_id('Bitcoin')]
+}
+
+ALL_TICKERS = [ticker for tickers in MARKET_TICKERS.values() for ticker in tickers]
+
+DEFAULT_PERIOD = "1y"
+
+# Yahoo chart endpoint, used instead of yfinance when redirected (e.g. to the local stand-in server)
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart"
+
+# A cached frame is only reused within one refresh; this bounds its age in long-running processes
+MAX_FRAME_AGE = 300  # seconds
+
+# (tickers, period) -> (fetched_at, Close frame)
+_frames = {}
+_lock = threading.Lock()
+# Serializes downloads, so concurrent misses share one round trip; _lock is never held across one
+_download_lock = threading.Lock()
+
+def clear_cache():
+    """Drops all cached frames, so the next request downloads fresh prices."""
+    with _lock:
+        _frames.clear()
+
+def cache_frame(tickers, frame, period=DEFAULT_PERIOD):
+    """Puts a Close frame obtained elsewhere (e.g. a last good frame) into the frame cache."""
+    with _lock:
+        _frames[(tuple(sorted(set(tickers))), period)] = (time.monotonic(), frame)
+
+def _cached_frame(tickers, period):
+    now = time.monotonic()
+    for (cached_tickers, cached_period), (fetched_at, frame) in _frames.items():
+        if cached_period == period and now - fetched_at < MAX_FRAME_AGE and set(tickers) <= set(cached_tickers):
+            return frame
+    return None
+
+def _store_completed_sessions(frame):
+    # Today's bar is still moving, and the store never rewrites an observation
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        return
+    completed = frame[frame.index.normalize() < pd.Timestamp.now(tz=frame.index.tz).normalize()]
+    for ticker in completed.columns:
+        store_series('yahoo', ticker, completed[ticker])
+
+def chart_url():
+    """Returns the redirected Yahoo chart endpoint, or None to use yfinance."""
+    url = source_url(YAHOO_CHART_URL, 'POLYDASH_YAHOO_URL')
+    return url if url != YAHOO_CHART_URL else None
+
+def parse_chart(data, ticker):
+    """Parses a v8 chart response into a daily Close series (split/dividend adjusted when available)."""
+    result = data['chart']['result'][0]
+    index = pd.to_datetime(result['timestamp'], unit='s').normalize()
+    indicators = result['indicators']
+    adjclose = indicators.get('adjclose')
+    values = adjclose[0]['adjclose'] if adjclose else indicators['quote'][0]['close']
+    return pd.Series(values, index=index, name=ticker, dtype='float64')
+
+def download_chart_close(tickers, period=DEFAULT_PERIOD, base_url=None):
+    """Downloads Close prices from the chart endpoint, one concurrent request per ticker."""
+    base_url = base_url or chart_url() or YAHOO_CHART_URL
+
+    def fetch(ticker):
+        url = f"{base_url}/{urllib.parse.quote(ticker)}"
+        response = http_client.get(url, params={'range': period, 'interval': '1d'})
+        response.raise_for_status()
+        return parse_chart(response.json(), ticker)
+
+    with ThreadPoolExecutor(max_workers=len(tickers) or 1) as pool:
+        series = list(pool.map(fetch, tickers))
+    return pd.concat(series, axis=1).sort_index()
+
+def download_close(tickers, period=DEFAULT_PERIOD):
+    """
+    Downloads the Close prices of `tickers` in one batched yfinance call and caches the frame.
+    Returns:
+        pd.DataFrame: Close prices, one column per ticker.
+    """
+    frame, hit = _download_close(tickers, period)
+    metrics.record_cache('yahoo', hit)
+    return frame
+
+def _download_close(tickers, period):
+    # Returns (frame, True if it was served from the frame cache)
+    key = (tuple(sorted(set(tickers))), period)
+    with _lock:
+        frame = _cached_frame(key[0], period)
+    if frame is not None:
+        return frame, True
+
+    with _download_lock:
+        # Another thread may have downloaded it while this one waited
+        with _lock:
+            frame = _cached_frame(key[0], period)
+        if frame is not None:
+            return frame, True
+        try:
+            with metrics.timed('polydash_request_seconds', source='yahoo'):
+                if chart_url():
+                    frame = download_chart_close(list(key[0]), period)
+                else:
+                    # yfinance is slow to import, so only the processes that download with it pay for it
+                    import yfinance as yf
+                    frame = yf.download(list(key[0]), period=period, progress=False, auto_adjust=True)['Close']
+        except Exception as e:
+            metrics.record_error('yahoo', e)
+            raise
+        with _lock:
+            _frames[key] = (time.monotonic(), frame)
+        _store_completed_sessions(frame)
+    return frame, False
+
+def get_close(tickers, period=DEFAULT_PERIOD):
+    """
+    Returns the Close prices of `tickers`, served from the shared frame cache.
+    A cache miss downloads every ticker in ALL_TICKERS at once, so the other
+    modules are served from the same Yahoo round trip.
+    Returns:
+        pd.DataFrame: Close prices for the requested tickers that Yahoo returned, on the days
+        any of them traded. A ticker's last close is carried forward over the days it did not
+        trade (e.g. futures on the weekends BTC-USD trades).
+    """
+    with _lock:
+        frame = _cached_frame(tickers, period)
+    metrics.record_cache('yahoo', frame is not None)
+    if frame is None:
+        frame, _ = _download_close(list(ALL_TICKERS) + list(tickers), period)
+    data = frame[[ticker for ticker in tickers if ticker in frame.columns]]
+    # Drop calendar days on which none of the requested tickers traded
+    data = data.dropna(how='all')
+    return pd.DataFrame(ffill_columns(data.to_numpy(dtype='float64')), index=data.index, columns=data.columns)
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# Face value and maturity of the theoretical zero-coupon Treasury used by the Energy-Value of Money
+BOND_FACE_VALUE = 100.0
+BOND_MATURITY_YEARS = 10
+
+# Column names of the Yahoo tickers in each KPI frame
+COMMODITY_NAMES = {'HG=F': 'Copper', 'ZW=F': 'Wheat', 'ZC=F': 'Corn'}
+
+def ffill_columns(values):
+    """
+    Forward-fills NaNs down each column of a 2-D array without Python-level loops.
+    Leading NaNs (before a column's first observation) are left as NaN.
+    """
+    values = np.asarray(values, dtype='float64')
+    n_rows = values.shape[0]
+    if n_rows == 0:
+        return values.copy()
+    # For every cell, the row of the latest valid observation at or above it
+    last_valid = np.where(np.isnan(values), 0, np.arange(n_rows)[:, None])
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return values[last_valid, np.arange(values.shape[1])]
+
+def align_prices(close, tickers):
+    """
+    Aligns the Close prices of `tickers` onto one calendar.
+    Days where an asset did not trade (e.g. futures on weekends while BTC-USD trades)
+    carry its last close forward; rows before every ticker has traded are dropped.
+    Returns:
+        pd.DataFrame: One float column per ticker.
+    """
+    frame = close.reindex(columns=tickers)
+    filled = ffill_columns(frame.to_numpy(dtype='float64'))
+    aligned = pd.DataFrame(filled, index=frame.index, columns=tickers)
+    return aligned[~np.isnan(filled).any(axis=1)]
+
+def energy_money_series(close):
+    """
+    Calculates the Energy-Value of Money for every row of a Close frame with 'CL=F' and '^TNX'.
+    Returns:
+        pd.DataFrame: 'Oil_Price', '10Y_Yield', 'Bond_Price', 'Energy_Value' columns.
+    """
+    aligned = align_prices(close, ['CL=F', '^TNX'])
+    oil_price = aligned['CL=F'].to_numpy()
+
+    # Raw ^TNX is percentage (e.g. 4.02 for 4.02%)
+    treasury_yield = aligned['^TNX'].to_numpy() / 100.0
+
+    # Price of Theoretical 10Y Zero Coupon Bond (Face 100)
+    bond_price = BOND_FACE_VALUE / ((1 + treasury_yield) ** BOND_MATURITY_YEARS)
+
+    return pd.DataFrame({
+        'Oil_Price': oil_price,
+        '10Y_Yield': treasury_yield,
+        'Bond_Price': bond_price,
+        # Barrels of Oil per Bond
+        'Energy_Value': bond_price / oil_price
+    }, index=aligned.index)
+
+def rebase(values):
+    """Rebases each column of a 2-D array to 100 at its first row."""
+    return values / values[:1] * 100.0
+
+def neutral_asset_series(close):
+    """
+    Calculates the Gold and Bitcoin KPI series from a Close frame with 'GC=F' and 'BTC-USD'.
+    Returns:
+        pd.DataFrame: Prices, Bitcoin priced in ounces of gold, and both assets rebased to 100.
+    """
+    aligned = align_prices(close, ['GC=F', 'BTC-USD'])
+    prices = aligned.to_numpy()
+    rebased = rebase(prices)
+
+    return pd.DataFrame({
+        'Gold_Price': prices[:, 0],
+        'Bitcoin_Price': prices[:, 1],
+        'Bitcoin_Gold_Ratio': prices[:, 1] / prices[:, 0],
+        'Gold_Index': rebased[:, 0],
+        'Bitcoin_Index': rebased[:, 1]
+    }, index=aligned.index)
+
+def commodity_series(close):
+    """
+    Calculates the Copper/Wheat/Corn KPI series from a Close frame with 'HG=F', 'ZW=F' and 'ZC=F'.
+    Returns:
+        pd.DataFrame: Prices and each commodity rebased to 100.
+    """
+    tickers = list(COMMODITY_NAMES)
+    aligned = align_prices(close, tickers)
+    prices = aligned.to_numpy()
+    rebased = rebase(prices)
+
+    columns = {}
+    for i, ticker in enumerate(tickers):
+        columns[COMMODITY_NAMES[ticker]] = prices[:, i]
+        columns[f'{COMMODITY_NAMES[ticker]}_Index'] = rebased[:, i]
+    return pd.DataFrame(columns, index=aligned.index)
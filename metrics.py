@@ -0,0 +1,219 @@
+import json
+import logging
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float('inf'))
+
+# Upstream hosts -> source label
+SOURCE_HOSTS = {
+    'fred.stlouisfed.org': 'fred',
+    'api.stlouisfed.org': 'fred',
+    'api.worldbank.org': 'worldbank',
+    'api.gdeltproject.org': 'gdelt',
+    'ticdata.treasury.gov': 'tic',
+    'query1.finance.yahoo.com': 'yahoo',
+    'query2.finance.yahoo.com': 'yahoo'
+}
+
+# Path fragments that identify a source on other hosts (e.g. the local stand-in server)
+SOURCE_PATHS = {
+    'fredgraph.csv': 'fred',
+    '/fred/series/observations': 'fred',
+    '/v2/country/': 'worldbank',
+    '/api/v2/doc/doc': 'gdelt',
+    'mfh.txt': 'tic',
+    '/finance/chart/': 'yahoo'
+}
+
+# Help text of every metric, in exposition order
+METRICS = {
+    'polydash_requests_total': ('counter', "HTTP responses by source and status code"),
+    'polydash_request_seconds': ('histogram', "Upstream request latency, including retries"),
+    'polydash_response_bytes_total': ('counter', "Response body bytes received"),
+    'polydash_retries_total': ('counter', "Retried upstream requests"),
+    'polydash_parse_seconds': ('histogram', "Time spent parsing upstream payloads"),
+    'polydash_cache_total': ('counter', "Cache lookups by result (hit or miss)"),
+    'polydash_errors_total': ('counter', "Failed fetches"),
+    'polydash_task_seconds': ('histogram', "Orchestrator task duration"),
+    'polydash_stale_total': ('counter', "Requests served from the last good value, by reason"),
+    'polydash_circuit_open_total': ('counter', "Circuit breaker openings by source")
+}
+
+DEFAULT_METRICS_PORT = 9108
+
+logger = logging.getLogger('polydash')
+logger.addHandler(logging.NullHandler())
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+_counters = {}
+_histograms = {}
+_lock = threading.Lock()
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def source_for_url(url):
+    """Returns the source label of an upstream URL (its host when unknown)."""
+    parts = urllib.parse.urlparse(url)
+    host = parts.hostname or 'unknown'
+    if host in SOURCE_HOSTS:
+        return SOURCE_HOSTS[host]
+    for fragment, source in SOURCE_PATHS.items():
+        if fragment in parts.path:
+            return source
+    return host
+
+def series_for_url(url):
+    """Returns the series a request URL is for (FRED's `id` or ALFRED's `series_id` parameter), or None."""
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    ids = query.get('id') or query.get('series_id')
+    return ids[0] if ids else None
+
+def inc(name, value=1, **labels):
+    """Adds `value` to a counter."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, **labels):
+    """Records one observation in a histogram."""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _Histogram()
+        histogram.observe(value)
+
+@contextmanager
+def timed(name, **labels):
+    """Records the duration of the block in histogram `name`, whether or not it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+def record_error(source, error, series=None):
+    """Counts a failed fetch and logs it as a structured event."""
+    inc('polydash_errors_total', source=source, series=series)
+    log_event('fetch_error', level=logging.WARNING, source=source, series=series,
+              error=type(error).__name__, message=str(error))
+
+def record_cache(source, hit, series=None):
+    inc('polydash_cache_total', source=source, series=series, result='hit' if hit else 'miss')
+
+def log_event(event, level=logging.INFO, **fields):
+    """Emits one JSON log line on the 'polydash' logger (silent unless logging is configured)."""
+    if logger.isEnabledFor(level):
+        fields = {k: v for k, v in fields.items() if v is not None}
+        logger.log(level, json.dumps(dict(event=event, **fields), default=str))
+
+def enable_json_logs(level=logging.INFO, stream=None):
+    """Writes the structured events to `stream` (stderr by default), one JSON object per line."""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('{"ts": "%(asctime)s", "level": "%(levelname)s", "data": %(message)s}'))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+def reset():
+    """Drops every recorded value."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def snapshot():
+    """
+    Returns all metrics as plain data.
+    Returns:
+        dict: metric name -> list of {'labels': {...}, 'value': n} for counters, or
+        {'labels', 'count', 'sum', 'buckets'} for histograms (cumulative bucket counts).
+    """
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(h.counts), h.total, h.count) for key, h in _histograms.items()}
+
+    result = {}
+    for (name, labels), value in sorted(counters.items()):
+        result.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+    for (name, labels), (counts, total, count) in sorted(histograms.items()):
+        cumulative, running = {}, 0
+        for bound, n in zip(LATENCY_BUCKETS, counts):
+            running += n
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+        result.setdefault(name, []).append({'labels': dict(labels), 'count': count, 'sum': total,
+                                            'buckets': cumulative})
+    return result
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    escaped = ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in items)
+    return '{' + escaped + '}'
+
+def to_prometheus():
+    """Renders all metrics in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        samples = data.get(name)
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample in samples:
+            labels = sample['labels']
+            if kind == 'counter':
+                lines.append(f"{name}{_format_labels(labels)} {sample['value']}")
+                continue
+            for bound, n in sample['buckets'].items():
+                lines.append(f"{name}_bucket{_format_labels(labels, {'le': bound})} {n}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {sample['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+    return '\n'.join(lines) + '\n'
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') == '/metrics':
+            body, content_type = to_prometheus(), 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body, content_type = json.dumps(snapshot()), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_http_server(port=DEFAULT_METRICS_PORT, host='127.0.0.1'):
+    """Serves /metrics (Prometheus text) and /metrics.json on a daemon thread. Returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
@@ -0,0 +1,113 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # Optional: the pandas C engine is used instead
+    pa = None
+
+# FRED marks missing observations with "."; the local cache writes them as empty fields
+FRED_NA_VALUES = ['.', '']
+
+# fredgraph.csv has a date column and one value column, whatever their header names
+FRED_COLUMNS = ['DATE', 'VALUE']
+
+# Resolution of parsed dates, matching what pandas infers for date strings
+DATE_UNIT = 'us'
+
+def default_engine():
+    """Returns 'pyarrow' when pyarrow is installed, otherwise 'c'."""
+    return 'pyarrow' if pa is not None else 'c'
+
+def _as_bytes(body):
+    return body.encode('utf-8') if isinstance(body, str) else body
+
+def _read_fred_pyarrow(body):
+    # FRED bodies are small and the fetchers already run on their own threads, so Arrow's pool is not used
+    table = pa_csv.read_csv(
+        pa.py_buffer(body),
+        read_options=pa_csv.ReadOptions(column_names=FRED_COLUMNS, skip_rows=1, use_threads=False),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={'DATE': pa.timestamp(DATE_UNIT), 'VALUE': pa.float64()},
+            null_values=FRED_NA_VALUES,
+            timestamp_parsers=[pa_csv.ISO8601]
+        )
+    )
+    dates = table.column('DATE').to_numpy()
+    # Nulls become NaN; float columns without nulls are handed over without a copy
+    values = table.column('VALUE').to_numpy()
+    return dates, values
+
+def _read_fred_c(body):
+    df = pd.read_csv(io.BytesIO(body), header=0, names=FRED_COLUMNS, usecols=[0, 1],
+                     dtype={'VALUE': 'float64'}, na_values=FRED_NA_VALUES, keep_default_na=False,
+                     parse_dates=['DATE'], date_format='ISO8601')
+    return df['DATE'].to_numpy(), df['VALUE'].to_numpy()
+
+def _read_fred_tolerant(body):
+    # Slow path for bodies with unexpected value markers: anything non-numeric becomes NaN
+    df = pd.read_csv(io.BytesIO(body), index_col=0, parse_dates=True, na_values='.')
+    return df.index.to_numpy(), pd.to_numeric(df.iloc[:, 0], errors='coerce').to_numpy(dtype='float64')
+
+def read_fred_csv(body, engine=None):
+    """
+    Parses a fredgraph.csv body straight from its bytes, with explicit ISO dates and float64 values.
+    Args:
+        body (bytes or str): Response body (or cached file contents).
+        engine (str): 'pyarrow' or 'c'; default_engine() when None.
+    Returns:
+        pd.Series: float64 values (NaN for '.') indexed by a DatetimeIndex named 'DATE'.
+    """
+    body = _as_bytes(body)
+    engine = engine or default_engine()
+    try:
+        dates, values = _read_fred_pyarrow(body) if engine == 'pyarrow' else _read_fred_c(body)
+    except ValueError:
+        # Also raised by pyarrow (ArrowInvalid) for values that are not numbers or '.'
+        dates, values = _read_fred_tolerant(body)
+    index = pd.DatetimeIndex(dates.astype(f'datetime64[{DATE_UNIT}]'), name='DATE')
+    return pd.Series(values, index=index, dtype='float64')
+
+def world_bank_columns(entries, indicators, countries):
+    """
+    Decodes World Bank API entries into typed columns, skipping entries without a year.
+    Entries without an indicator or country id take the only requested one.
+    Returns:
+        dict: 'indicator', 'country' (object arrays), 'year' (int64) and 'value' (float64, NaN when empty).
+    """
+    default_indicator = indicators[0] if len(indicators) == 1 else None
+    default_country = countries[0] if len(countries) == 1 else None
+    indicator_ids, country_ids, years, values = [], [], [], []
+    for entry in entries:
+        indicator = (entry.get('indicator') or {}).get('id') or default_indicator
+        country = entry.get('countryiso3code') or default_country
+        date = str(entry.get('date', ''))
+        if indicator is None or country is None or not date.isdigit():
+            continue
+        indicator_ids.append(indicator)
+        country_ids.append(country)
+        years.append(int(date))
+        values.append(entry.get('value'))
+
+    return {
+        'indicator': np.array(indicator_ids, dtype=object),
+        'country': np.array(country_ids, dtype=object),
+        'year': np.array(years, dtype='int64'),
+        # None -> NaN in the float64 conversion
+        'value': np.array(values, dtype='float64')
+    }
+
+def timeline_arrays(data):
+    """
+    Decodes a GDELT timeline response into typed arrays.
+    Returns:
+        tuple: (UTC DatetimeIndex, float64 values) of the first timeline, empty if there is none.
+    """
+    timeline = data.get('timeline') or []
+    points = timeline[0].get('data', []) if timeline else []
+    values = np.fromiter((p['value'] for p in points), dtype='float64', count=len(points))
+    # GDELT dates are ISO 8601 basic format (20240628T120000Z); pandas' ISO parser is much faster than strptime
+    return pd.to_datetime([p['date'] for p in points], format='ISO8601', utc=True), values
@@ -0,0 +1,223 @@
+"""
+Command-line entry point for the dashboard's data pipeline.
+
+Every subcommand imports only the modules it uses, so a single lightweight fetch
+(e.g. GDELT article lists) does not pay for pandas or yfinance at start-up.
+
+Usage:
+    python polydash.py fetch module2
+    python polydash.py fetch tic --timings
+    python polydash.py startup            # cold-start import time of every fetch target
+    python polydash.py plan               # upstream requests of a full refresh
+    python polydash.py asof 2020-06-30 [--fetch-vintages]   # fiscal KPIs as published on a past date
+    python polydash.py project [--paths 100000 --years 30 --scenario baseline]   # Monte Carlo fan chart
+    python polydash.py serve | schedule | standin [args]
+"""
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import time
+
+# fetch target -> (module, function)
+FETCH_TARGETS = {
+    'fiscal': ('fetch_fiscal_data', 'fetch_fiscal_data'),
+    'module1': ('fetch_fiscal_data', 'fetch_fiscal_data'),
+    'module2': ('fetch_module_2_data', 'fetch_module_2_data'),
+    'module3': ('fetch_module_3_data', 'fetch_module_3_data'),
+    'module4': ('fetch_module_4_data', 'fetch_module_4_data'),
+    'tic': ('fetch_tic_data', 'fetch_tic_data'),
+    'gold': ('fetch_gold_data', 'fetch_gold_data'),
+    'gdelt': ('fetch_gdelt_news', 'fetch_gdelt_mentions'),
+    'news-volume': ('fetch_gdelt_news', 'fetch_gdelt_timeline'),
+    'energy': ('fetch_energy_money', 'fetch_energy_money'),
+    'all': ('fetch_all_data', 'fetch_all_modules')
+}
+
+# Third-party packages worth reporting in the start-up breakdown
+HEAVY_PACKAGES = ['pandas', 'numpy', 'requests', 'yfinance', 'dash', 'plotly']
+
+def load(module_name, attr):
+    """Imports `module_name` and returns (attribute, import seconds)."""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    return getattr(module, attr), time.perf_counter() - start
+
+def _summarize(value):
+    # Frames and series print their tail; everything else goes through JSON
+    if hasattr(value, 'tail') and hasattr(value, 'to_string'):
+        return value.tail().to_string()
+    return json.dumps(value, indent=2, default=_json_default)
+
+def _json_default(value):
+    if hasattr(value, 'tail') and hasattr(value, 'to_json'):
+        return json.loads(value.tail().to_json(date_format='iso'))
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def cmd_fetch(args):
+    module_name, func_name = FETCH_TARGETS[args.target]
+    func, import_seconds = load(module_name, func_name)
+
+    start = time.perf_counter()
+    result = func()
+    fetch_seconds = time.perf_counter() - start
+
+    print(_summarize(result))
+    if args.timings:
+        loaded = [name for name in HEAVY_PACKAGES if name in sys.modules]
+        print(f"\nimports {import_seconds:.3f}s ({', '.join(loaded) or 'stdlib only'}), fetch {fetch_seconds:.3f}s",
+              file=sys.stderr)
+    return 0 if result is not None else 1
+
+def measure_import(module_name, python=sys.executable):
+    """
+    Imports `module_name` in a fresh interpreter with -X importtime.
+    Returns:
+        dict: 'total' (seconds, all imports) and 'packages' (package -> cumulative seconds,
+        for every package imported at any depth).
+    """
+    proc = subprocess.run([python, '-X', 'importtime', '-c', f'import {module_name}'],
+                          capture_output=True, text=True, check=True)
+    packages = {}
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seconds = int(cumulative) / 1e6
+        packages.setdefault(name.strip(), seconds)
+        # Nested imports are indented; only top-level entries count towards the total
+        if not name.startswith('  '):
+            total += seconds
+    return {'total': total, 'packages': packages}
+
+def cmd_startup(args):
+    unknown = [target for target in args.targets if target not in FETCH_TARGETS]
+    if unknown:
+        print(f"Unknown targets: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    print(f"{'target':<14}{'module':<22}{'import s':>10}  third-party packages")
+    for target in args.targets or list(FETCH_TARGETS):
+        module_name, _ = FETCH_TARGETS[target]
+        report = measure_import(module_name)
+        packages = report['packages']
+        breakdown = ', '.join(f"{name} {packages[name]:.2f}s" for name in HEAVY_PACKAGES if name in packages)
+        print(f"{target:<14}{module_name:<22}{report['total']:>10.3f}  {breakdown or '-'}")
+    return 0
+
+def cmd_plan(args):
+    from indicators import describe_plan, plan_requests
+    plan = plan_requests()
+    for key, request in plan.requests.items():
+        print(f"{key:<24}{', '.join(request.indicators)}")
+    print(f"\n{describe_plan(plan)}")
+    return 0
+
+def cmd_asof(args):
+    from fetch_fiscal_data import fetch_fiscal_vintages, fiscal_data_as_of
+    if args.fetch_vintages:
+        for name, rows in fetch_fiscal_vintages().items():
+            print(f"{name:<18}{'failed' if rows is None else f'{rows} vintage rows'}", file=sys.stderr)
+    df = fiscal_data_as_of(args.date)
+    if df is None:
+        print(f"No fiscal vintages known on {args.date}", file=sys.stderr)
+        return 1
+    print(df.tail(1).T.to_string())
+    return 0
+
+def cmd_project(args):
+    from fetch_fiscal_data import fetch_fiscal_data
+    from fiscal_projection import project_fiscal_frame
+    projection = project_fiscal_frame(fetch_fiscal_data(), paths=args.paths, years=args.years,
+                                      scenario=args.scenario, seed=args.seed, workers=args.workers)
+    if projection is None:
+        return 1
+    print(projection.fans['Fiscal_Unsustainability_Ratio'].to_string(float_format='{:.3f}'.format))
+    crossing = projection.crossing
+    print(f"\nPaths reaching 100% within {args.years} years: {crossing['probability']:.1%}")
+    for p, date in crossing['percentiles'].items():
+        print(f"P{p:<3} crossing: {date.year if date is not None else 'beyond horizon'}")
+    return 0
+
+def cmd_serve(args):
+    # The app's own refresher (also started by its first request; start() is idempotent)
+    from app import app, refresher
+    refresher.start()
+    app.run(host=args.host, port=args.port, debug=False)
+    return 0
+
+def cmd_schedule(args):
+    import metrics
+    from scheduler import RefreshScheduler, build_jobs
+    metrics.enable_json_logs()
+    metrics.start_http_server(args.metrics_port)
+    scheduler = RefreshScheduler(build_jobs()).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+def cmd_standin(args):
+    from standin_server import main
+    main(args.standin_args)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='polydash', description="Polycrisis dashboard data pipeline.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('fetch', help="Fetch one module or source and print the result")
+    fetch.add_argument('target', choices=list(FETCH_TARGETS))
+    fetch.add_argument('--timings', action='store_true', help="Report import and fetch time on stderr")
+    fetch.set_defaults(handler=cmd_fetch)
+
+    startup = commands.add_parser('startup', help="Measure the cold-start import time of fetch targets")
+    startup.add_argument('targets', nargs='*', metavar='target', help="Fetch targets (default: all)")
+    startup.set_defaults(handler=cmd_startup)
+
+    plan = commands.add_parser('plan', help="Show the upstream requests of a full refresh and the indicators they serve")
+    plan.set_defaults(handler=cmd_plan)
+
+    asof = commands.add_parser('asof', help="Show the fiscal KPIs as they were published on a past date")
+    asof.add_argument('date', help="As-of date (YYYY-MM-DD)")
+    asof.add_argument('--fetch-vintages', action='store_true', help="Load every ALFRED vintage first (needs FRED_API_KEY)")
+    asof.set_defaults(handler=cmd_asof)
+
+    project = commands.add_parser('project', help="Monte Carlo projection of the Fiscal Unsustainability Ratio")
+    # Defaults mirror fiscal_projection, which is only imported when the command runs
+    project.add_argument('--paths', type=int, default=100_000)
+    project.add_argument('--years', type=int, default=30)
+    project.add_argument('--scenario', choices=['baseline', 'higher_for_longer', 'low_growth', 'consolidation'],
+                         default='baseline')
+    project.add_argument('--seed', type=int, default=0)
+    project.add_argument('--workers', type=int, help="Worker processes (default: one per CPU; 1 runs in-process)")
+    project.set_defaults(handler=cmd_project)
+
+    serve = commands.add_parser('serve', help="Run the dashboard with its background refresher")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8050)
+    serve.set_defaults(handler=cmd_serve)
+
+    schedule = commands.add_parser('schedule', help="Run the cadence-aware refresh scheduler")
+    schedule.add_argument('--metrics-port', type=int, default=9108)
+    schedule.set_defaults(handler=cmd_schedule)
+
+    standin = commands.add_parser('standin', help="Run the local stand-in upstream server")
+    standin.add_argument('standin_args', nargs=argparse.REMAINDER)
+    standin.set_defaults(handler=cmd_standin)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
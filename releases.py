@@ -0,0 +1,59 @@
+"""
+Release calendar shared by the FRED cache (is the cached copy fresh?) and the refresh
+scheduler (when is a source next due?).
+"""
+from datetime import timedelta
+
+import pandas as pd
+
+# Offset from the date of the latest observation to the end of the period covered by the next one.
+# FRED dates daily and weekly observations at the end of their period, and monthly,
+# quarterly and annual observations at the start.
+NEXT_PERIOD_END = {
+    'D': pd.DateOffset(days=1),
+    'W': pd.DateOffset(days=7),
+    'M': pd.DateOffset(months=2),
+    'Q': pd.DateOffset(months=6),
+    'A': pd.DateOffset(years=2)
+}
+
+# Typical delay between the end of a period and the publication of its observation
+RELEASE_LAG = {
+    'D': timedelta(days=1),
+    'W': timedelta(days=1),      # H.4.1 is published the day after its Wednesday
+    'M': timedelta(days=14),
+    'Q': timedelta(days=28),     # NIPA advance estimate
+    'A': timedelta(days=180)     # World Development Indicators mid-year update
+}
+
+# Series whose release lag differs from the default of their frequency
+SERIES_RELEASE_LAG = {
+    'GS10': timedelta(days=1),
+    'GS2': timedelta(days=1),
+    'W823RC1': timedelta(days=28),     # Personal Income and Outlays
+    'W824RC1': timedelta(days=28),
+    'W825RC1': timedelta(days=28),
+    'BOPGSTB': timedelta(days=35),     # International Trade in Goods and Services
+    'IMPCH': timedelta(days=35),
+    'EXPCH': timedelta(days=35),
+    'GFDEGDQ188S': timedelta(days=60),
+    'FDHBFIN': timedelta(days=75)
+}
+
+# The TIC release for a month comes out around the 18th of the month after the next, i.e.
+# a month and 18 days after the end of the period that follows the latest month
+TIC_RELEASE_LAG = pd.DateOffset(months=1, days=18)
+
+# Even when the next observation cannot be out yet, re-check this often to pick up revisions
+RECHECK_INTERVAL = {
+    'D': timedelta(hours=6),
+    'W': timedelta(days=1),
+    'M': timedelta(days=7),
+    'Q': timedelta(days=30),
+    'A': timedelta(days=90)
+}
+
+def release_window(last_observation, frequency, release_lag=None):
+    """Returns the earliest time the observation after `last_observation` can be published."""
+    release_lag = RELEASE_LAG[frequency] if release_lag is None else release_lag
+    return last_observation + NEXT_PERIOD_END[frequency] + release_lag
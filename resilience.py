@@ -0,0 +1,244 @@
+"""
+Stale-while-revalidate fetching with per-source circuit breakers.
+
+Every upstream call of a dashboard refresh goes through fetch(). When a last good value
+exists, fetch() returns it at once, with its age and a stale flag, and revalidates it with
+a call in the background once it is REVALIDATE_SECONDS old. The call replaces the last good
+value when it succeeds. A value is flagged stale when the latest call for it failed or its
+source's circuit is open. Only without a last good value does fetch() wait for the call.
+
+After FAILURE_THRESHOLD consecutive failures a source's circuit opens. Its calls are then
+skipped and served from the last good value. After OPEN_SECONDS, one trial call decides
+whether the circuit closes again.
+
+Last good values are kept in memory and pickled under <cache_dir>/last_good/, so a restarted
+process can serve them before its first upstream call returns.
+"""
+import os
+import pickle
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+from concurrent.futures import Future, TimeoutError
+
+import metrics
+from config import cache_dir
+
+# Consecutive failures of one source that open its circuit
+FAILURE_THRESHOLD = 3
+
+# How long an open circuit skips its source before a trial call
+OPEN_SECONDS = 120
+
+# Last good values younger than this are served without a call
+REVALIDATE_SECONDS = 60
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# value: fresh or last good value (None if neither). age: seconds since the value was
+# fetched (None without a value). stale: True when the latest call failed or was skipped.
+Result = namedtuple('Result', ['value', 'age', 'stale'])
+
+class CircuitBreaker:
+    """
+    Failure counter of one source. Closed: calls go through. Open: calls are skipped.
+    Half-open (after `open_seconds`): one trial call goes through; its outcome closes
+    or re-opens the circuit.
+    """
+
+    __slots__ = ('source', 'threshold', 'open_seconds', 'failures', 'opened_at', 'trial', '_lock')
+
+    def __init__(self, source, threshold=FAILURE_THRESHOLD, open_seconds=OPEN_SECONDS):
+        self.source = source
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self._lock = threading.Lock()
+
+    def state(self, now=None):
+        if self.opened_at is None:
+            return CLOSED
+        now = time.monotonic() if now is None else now
+        return OPEN if now - self.opened_at < self.open_seconds else HALF_OPEN
+
+    def allow(self, now=None):
+        """Returns True if a call may go to the source now (claiming the trial when half-open)."""
+        with self._lock:
+            state = self.state(now)
+            if state == CLOSED:
+                return True
+            if state == OPEN or self.trial:
+                return False
+            self.trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self, now=None):
+        with self._lock:
+            self.failures += 1
+            if self.trial or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.monotonic() if now is None else now
+                self.trial = False
+                metrics.inc('polydash_circuit_open_total', source=self.source)
+                metrics.log_event('circuit_open', source=self.source, failures=self.failures)
+
+_breakers = {}
+_lock = threading.Lock()
+# last good file -> (value, fetched_at epoch seconds)
+_last_good = {}
+# last good file -> Future of the call in flight
+_inflight = {}
+# last good files whose latest call failed
+_failed = set()
+# key -> Result (without the value) of its latest fetch()
+_served = {}
+
+def breaker(source):
+    """Returns the circuit breaker of a source."""
+    with _lock:
+        if source not in _breakers:
+            _breakers[source] = CircuitBreaker(source)
+        return _breakers[source]
+
+def reset():
+    """Closes every circuit and forgets the in-memory last good values (the files are kept)."""
+    with _lock:
+        _breakers.clear()
+        _last_good.clear()
+        _inflight.clear()
+        _failed.clear()
+        _served.clear()
+
+def _path(key):
+    return os.path.join(cache_dir(), 'last_good', urllib.parse.quote(key, safe='') + '.pkl')
+
+def last_good(key):
+    """Returns (value, fetched_at epoch seconds) of the last good value of `key`, or None."""
+    path = _path(key)
+    with _lock:
+        entry = _last_good.get(path)
+    if entry is not None or not os.path.exists(path):
+        return entry
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except Exception as e:
+        print(f"Discarding unreadable last good value {key}: {e}")
+        return None
+    with _lock:
+        return _last_good.setdefault(path, entry)
+
+def _remember(path, value):
+    entry = (value, time.time())
+    with _lock:
+        _last_good[path] = entry
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+    except Exception as e:
+        print(f"Error saving last good value to {path}: {e}")
+
+def _start(key, source, func, usable):
+    """Starts `func` in the background unless a call for `key` is already in flight. Returns its Future."""
+    path = _path(key)
+    with _lock:
+        future = _inflight.get(path)
+        if future is not None:
+            return future
+        future = _inflight[path] = Future()
+
+    def run():
+        try:
+            value = func()
+            ok = usable(value)
+        except Exception as e:
+            print(f"Error fetching {key}: {e}")
+            value, ok = None, False
+        if ok:
+            _remember(path, value)
+            breaker(source).record_success()
+        else:
+            breaker(source).record_failure()
+        with _lock:
+            if ok:
+                _failed.discard(path)
+            else:
+                _failed.add(path)
+            _inflight.pop(path, None)
+        future.set_result(value if ok else None)
+
+    threading.Thread(target=run, name=f'fetch:{key}', daemon=True).start()
+    return future
+
+def _not_none(value):
+    return value is not None
+
+def _serve(key, result):
+    with _lock:
+        _served[key] = result._replace(value=None)
+    return result
+
+def fetch(key, source, func, usable=_not_none):
+    """
+    Returns the last good value of `key` (a request of `source`) at once, revalidating it in
+    the background; calls `func` and waits only when there is no last good value yet.
+    Args:
+        usable (callable): value -> True if it is good; by default anything but None.
+    Returns:
+        Result: The value, its age and whether it is stale (the latest call failed or the
+        source's circuit is open). Result(None, None, False) when nothing good is known.
+    """
+    entry = last_good(key)
+    path = _path(key)
+    age = max(time.time() - entry[1], 0.0) if entry is not None else None
+    # Only ask the breaker when a call is due: a half-open breaker hands out its single trial
+    due = entry is None or age >= REVALIDATE_SECONDS
+    allowed = due and breaker(source).allow()
+
+    if entry is None:
+        value = _start(key, source, func, usable).result() if allowed else None
+        return _serve(key, Result(value, 0.0 if value is not None else None, False))
+
+    if allowed:
+        _start(key, source, func, usable)
+    with _lock:
+        failed = path in _failed
+    stale = failed or (due and not allowed)
+    if stale:
+        reason = 'error' if failed else 'circuit_open'
+        metrics.inc('polydash_stale_total', source=source, reason=reason)
+        metrics.log_event('stale_value', source=source, key=key, reason=reason, age=round(age))
+    return _serve(key, Result(entry[0], age, stale))
+
+def call(key, source, func, usable=_not_none):
+    """Like fetch(), returning only the value."""
+    return fetch(key, source, func, usable).value
+
+def stale_keys():
+    """Returns {key: age in seconds} of every key whose latest fetch() served a stale value."""
+    with _lock:
+        return {key: result.age for key, result in _served.items() if result.stale}
+
+def wait_idle(timeout=None):
+    """Waits for the calls still in flight (e.g. before exiting). Returns True if none is left."""
+    with _lock:
+        futures = list(_inflight.values())
+    end = None if timeout is None else time.monotonic() + timeout
+    for future in futures:
+        try:
+            future.result(timeout=None if end is None else max(end - time.monotonic(), 0))
+        except TimeoutError:
+            return False
+    return True
@@ -0,0 +1,424 @@
+"""
+Rolling analytics over the aligned indicator panels: z-scores, YoY changes, drawdowns
+and rolling correlations.
+
+The engine keeps running-window state (Welford mean/variance, windowed covariance and
+monotonic-deque min/max), so each new observation updates every metric in constant time.
+The initial history is computed in one vectorized pass instead (AnalyticsEngine.backfill).
+"""
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from alignment import build_panel
+from incremental import discard_state, load_state, read_outputs, save_state, write_outputs
+from indicator_store import read_series
+from indicators import INDICATORS
+
+# Daily market panel on weekdays, shown on Module 2
+DAILY_ANALYTICS = {
+    'module': 'module_2',
+    # A daily calendar without weekends, rather than 'B': pandas builds business-day ranges one date
+    # at a time, and 'B' bins would put Bitcoin's weekend closes on the Friday before
+    'freq': 'D',
+    'weekdays_only': True,
+    'aggregations': {
+        'Gold': 'last',
+        'Dollar_Index': 'last',
+        'Bitcoin': 'last',
+        'Treasury_10Y': 'last'
+    },
+    'window': 252,             # Z-scores and drawdowns over one trading year
+    'lag': 252,                # YoY change
+    'correlation_window': 63,  # One quarter of daily log changes
+    'pairs': {
+        'Gold_Dollar': ('Gold', 'Dollar_Index'),
+        'Bitcoin_10Y': ('Bitcoin', 'Treasury_10Y')
+    }
+}
+
+# Monthly real-economy panel (INDPRO is monthly), shown on Module 3
+MONTHLY_ANALYTICS = {
+    'module': 'module_3',
+    'freq': 'MS',
+    'aggregations': {
+        'Copper': 'mean',                # Monthly average of daily closes
+        'Industrial_Production': 'last'
+    },
+    'window': 36,
+    'lag': 12,
+    'correlation_window': 24,
+    'pairs': {
+        'Copper_IndPro': ('Copper', 'Industrial_Production')
+    }
+}
+
+ANALYTICS = {
+    'analytics_daily': DAILY_ANALYTICS,
+    'analytics_monthly': MONTHLY_ANALYTICS
+}
+
+_lock = threading.Lock()
+
+class RollingWindow:
+    """
+    Mean, variance, min and max of the last `window` values, updated in O(1) (amortized for min/max).
+    Mean and variance use Welford's update with the removal of the value leaving the window.
+    """
+
+    __slots__ = ('window', 'values', 'mean', 'm2', 'maxima', 'minima', 'count')
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        # Monotonic deques of (position, value): the head is the window's max / min
+        self.maxima = deque()
+        self.minima = deque()
+        self.count = 0
+
+    def update(self, x):
+        self.values.append(x)
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+        if n > self.window:
+            old = self.values.popleft()
+            n -= 1
+            delta = old - self.mean
+            self.mean -= delta / n
+            self.m2 -= delta * (old - self.mean)
+
+        while self.maxima and self.maxima[-1][1] <= x:
+            self.maxima.pop()
+        self.maxima.append((self.count, x))
+        while self.minima and self.minima[-1][1] >= x:
+            self.minima.pop()
+        self.minima.append((self.count, x))
+        expired = self.count - self.window
+        if self.maxima[0][0] <= expired:
+            self.maxima.popleft()
+        if self.minima[0][0] <= expired:
+            self.minima.popleft()
+        self.count += 1
+
+    @property
+    def full(self):
+        return len(self.values) == self.window
+
+    def variance(self):
+        """Sample variance (ddof=1)."""
+        n = len(self.values)
+        return max(self.m2, 0.0) / (n - 1) if n > 1 else math.nan
+
+    def max(self):
+        return self.maxima[0][1] if self.maxima else math.nan
+
+    def min(self):
+        return self.minima[0][1] if self.minima else math.nan
+
+class RollingCovariance:
+    """Covariance and correlation of the last `window` (x, y) pairs, updated in O(1)."""
+
+    __slots__ = ('window', 'pairs', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c')
+
+    def __init__(self, window):
+        self.window = window
+        self.pairs = deque()
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c = 0.0
+
+    def _add(self, x, y, n, sign):
+        # sign=1 adds a pair to a window of n - 1; sign=-1 removes one from a window of n + 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += sign * dx / n
+        self.mean_y += sign * dy / n
+        self.m2_x += sign * dx * (x - self.mean_x)
+        self.m2_y += sign * dy * (y - self.mean_y)
+        self.c += sign * dx * (y - self.mean_y)
+
+    def update(self, x, y):
+        self.pairs.append((x, y))
+        self._add(x, y, len(self.pairs), 1)
+        if len(self.pairs) > self.window:
+            old_x, old_y = self.pairs.popleft()
+            self._add(old_x, old_y, len(self.pairs), -1)
+
+    @property
+    def full(self):
+        return len(self.pairs) == self.window
+
+    def correlation(self):
+        denominator = math.sqrt(max(self.m2_x, 0.0) * max(self.m2_y, 0.0))
+        return self.c / denominator if denominator > 0 else math.nan
+
+class SeriesState:
+    """Streaming state of one panel column: its rolling window, the values `lag` observations back, and the last value."""
+
+    __slots__ = ('stats', 'lagged', 'last')
+
+    def __init__(self, window, lag):
+        self.stats = RollingWindow(window)
+        self.lagged = deque(maxlen=lag + 1)
+        self.last = math.nan
+
+def metric_columns(spec):
+    """Returns the output columns of a panel spec, in order."""
+    columns = []
+    for name in spec['aggregations']:
+        columns += [f'{name}_ZScore', f'{name}_YoY', f'{name}_Drawdown']
+    columns += [f'{pair}_Correlation' for pair in spec['pairs']]
+    return columns
+
+class AnalyticsEngine:
+    """
+    Rolling metrics of one panel spec (see DAILY_ANALYTICS). Missing values are skipped, so every
+    window holds the last `window` observations of its series; a metric is NaN until its window is full.
+        <name>_ZScore: (value - window mean) / window sample std
+        <name>_YoY: change over the last `lag` observations
+        <name>_Drawdown: value / window max - 1
+        <pair>_Correlation: correlation of the two series' log changes over `correlation_window`
+    """
+
+    __slots__ = ('spec', 'series', 'covariances')
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.reset()
+
+    def reset(self):
+        """Drops all streaming state."""
+        spec = self.spec
+        self.series = {name: SeriesState(spec['window'], spec['lag']) for name in spec['aggregations']}
+        self.covariances = {pair: RollingCovariance(spec['correlation_window']) for pair in spec['pairs']}
+
+    def update(self, row):
+        """
+        Adds one panel row (name -> value) and returns its metrics (column -> value). O(1) per metric.
+        """
+        metrics = {}
+        changes = {}
+        for name, state in self.series.items():
+            x = row.get(name, math.nan)
+            if x is None or math.isnan(x):
+                metrics.update({f'{name}_ZScore': math.nan, f'{name}_YoY': math.nan, f'{name}_Drawdown': math.nan})
+                changes[name] = math.nan
+                continue
+            changes[name] = math.log(x / state.last) if not math.isnan(state.last) else math.nan
+            state.last = x
+            stats = state.stats
+            stats.update(x)
+            state.lagged.append(x)
+
+            std = math.sqrt(stats.variance())
+            metrics[f'{name}_ZScore'] = (x - stats.mean) / std if stats.full and std > 0 else math.nan
+            full_lag = len(state.lagged) == state.lagged.maxlen
+            metrics[f'{name}_YoY'] = x / state.lagged[0] - 1 if full_lag else math.nan
+            metrics[f'{name}_Drawdown'] = x / stats.max() - 1 if stats.full else math.nan
+
+        for pair, (a, b) in self.spec['pairs'].items():
+            covariance = self.covariances[pair]
+            if not (math.isnan(changes[a]) or math.isnan(changes[b])):
+                covariance.update(changes[a], changes[b])
+                metrics[f'{pair}_Correlation'] = covariance.correlation() if covariance.full else math.nan
+            else:
+                metrics[f'{pair}_Correlation'] = math.nan
+        return metrics
+
+    def backfill(self, panel):
+        """
+        Computes the metrics of every row of `panel` in vectorized passes, and leaves the engine
+        in the same state as if each row had been passed to update() in turn.
+        Returns:
+            pd.DataFrame: metric_columns(spec), indexed like `panel`.
+        """
+        window, lag = self.spec['window'], self.spec['lag']
+        self.reset()
+        out = {}
+        changes = {}
+        for name, state in self.series.items():
+            x = panel[name].to_numpy(dtype='float64') if name in panel else np.full(len(panel), np.nan)
+            valid = ~np.isnan(x)
+            values = x[valid]
+
+            mean, variance = _rolling_moments(values, window)
+            std = np.sqrt(variance)
+            zscore = np.full(len(values), np.nan)
+            ok = std > 0
+            zscore[ok] = (values[ok] - mean[ok]) / std[ok]
+            yoy = np.full(len(values), np.nan)
+            yoy[lag:] = values[lag:] / values[:-lag] - 1
+            drawdown = values / _rolling_max(values, window) - 1
+
+            for metric, result in [('ZScore', zscore), ('YoY', yoy), ('Drawdown', drawdown)]:
+                column = np.full(len(x), np.nan)
+                column[valid] = result
+                out[f'{name}_{metric}'] = column
+
+            change = np.full(len(x), np.nan)
+            change[np.flatnonzero(valid)[1:]] = np.diff(np.log(values))
+            changes[name] = change
+
+            # Prime the streaming state with the tail of the history
+            for v in values[-window:]:
+                state.stats.update(v)
+            state.stats.count = len(values)
+            state.stats.maxima = deque((len(values) - len(state.stats.values) + i, v)
+                                       for i, v in state.stats.maxima)
+            state.stats.minima = deque((len(values) - len(state.stats.values) + i, v)
+                                       for i, v in state.stats.minima)
+            state.lagged.extend(values[-(lag + 1):])
+            state.last = values[-1] if len(values) else np.nan
+
+        for pair, (a, b) in self.spec['pairs'].items():
+            both = ~(np.isnan(changes[a]) | np.isnan(changes[b]))
+            xs, ys = changes[a][both], changes[b][both]
+            column = np.full(len(panel), np.nan)
+            column[both] = _rolling_correlation(xs, ys, self.spec['correlation_window'])
+            out[f'{pair}_Correlation'] = column
+
+            covariance = self.covariances[pair]
+            for x, y in zip(xs[-covariance.window:], ys[-covariance.window:]):
+                covariance.update(x, y)
+
+        return pd.DataFrame(out, index=panel.index, columns=metric_columns(self.spec))
+
+def _window_sums(values, window):
+    # Sums of every full window, from cumulative sums (NaN before the first full window)
+    sums = np.full(len(values), np.nan)
+    if len(values) >= window:
+        cumulative = np.concatenate([[0.0], np.cumsum(values)])
+        sums[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+def _rolling_max(values, window):
+    """
+    Rolling max of full windows in O(n), NaN before the first one (van Herk/Gil-Werman):
+    every window spans at most two blocks of `window` values, so its max is the max of a
+    suffix max of one block and a prefix max of the next.
+    """
+    n = len(values)
+    result = np.full(n, np.nan)
+    if n < window:
+        return result
+    blocks = np.concatenate([values, np.full(-n % window, -np.inf)]).reshape(-1, window)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()[:n]
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()[:n]
+    result[window - 1:] = np.maximum(suffix[:n - window + 1], prefix[window - 1:])
+    return result
+
+def _rolling_moments(values, window):
+    """Rolling mean and sample variance of full windows, NaN before the first one."""
+    # Centering first keeps the cumulative sums of squares from cancelling catastrophically
+    shift = values[0] if len(values) else 0.0
+    centered = values - shift
+    sums = _window_sums(centered, window)
+    squares = _window_sums(centered * centered, window)
+    mean = sums / window + shift
+    variance = np.maximum(squares - sums * sums / window, 0.0) / (window - 1)
+    return mean, variance
+
+def _rolling_correlation(xs, ys, window):
+    """Rolling Pearson correlation of full windows, NaN before the first one."""
+    xs = xs - (xs[0] if len(xs) else 0.0)
+    ys = ys - (ys[0] if len(ys) else 0.0)
+    sx, sy = _window_sums(xs, window), _window_sums(ys, window)
+    cxy = _window_sums(xs * ys, window) - sx * sy / window
+    cxx = _window_sums(xs * xs, window) - sx * sx / window
+    cyy = _window_sums(ys * ys, window) - sy * sy / window
+    denominator = np.sqrt(np.maximum(cxx, 0.0) * np.maximum(cyy, 0.0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, cxy / denominator, np.nan)
+
+def analytics_panel(spec):
+    """
+    Builds the aligned panel of a spec from the indicator store (no network access).
+    The panel spans the periods every series has reached: it starts once all of them have
+    begun, and ends where the shortest one ends, so later refreshes append rows instead of
+    revising the forward-filled tail.
+    Returns:
+        pd.DataFrame: One row per period, or an empty frame if a series has no stored history.
+    """
+    series = {}
+    for name in spec['aggregations']:
+        indicator = INDICATORS[name]
+        s = read_series(indicator.source, indicator.series_id)
+        if s.empty:
+            return pd.DataFrame()
+        series[name] = s
+    start = max(s.index[0] for s in series.values())
+    end = min(s.index[-1] for s in series.values())
+    panel = build_panel({name: s.loc[start:] for name, s in series.items()}, spec['freq'], spec['aggregations'])
+    if spec.get('weekdays_only'):
+        panel = panel[panel.index.dayofweek < 5]
+    return panel.loc[:end]
+
+def _same_row(a, b):
+    return bool(np.all((a == b) | (np.isnan(a) & np.isnan(b))))
+
+def update_analytics(name, panel, spec):
+    """
+    Returns the metrics of every row of `panel`, reusing the engine saved by the previous refresh.
+    Panels from the indicator store only grow, so the saved state is the engine, the panel's
+    first key and its last key and row. Rows appended after that last row are streamed through
+    AnalyticsEngine.update() and their metrics appended to the saved outputs; any other panel
+    (a changed start or last row, a different spec) is backfilled and its outputs rewritten.
+    """
+    with _lock:
+        state = load_state(name) or {}
+        engine, rows = state.get('engine'), state.get('rows', 0)
+        reusable = (engine is not None and engine.spec == spec and state.get('columns') == list(panel.columns)
+                    and 0 < rows <= len(panel) and panel.index[0] == state['first_key']
+                    and panel.index[rows - 1] == state['last_key']
+                    and _same_row(panel.iloc[rows - 1].to_numpy(dtype='float64'), state['last_row']))
+        outputs = read_outputs(name, state['layout'], rows) if reusable else None
+
+        if outputs is not None and rows == len(panel):
+            outputs.index = panel.index
+            return outputs
+
+        if outputs is not None:
+            new_rows = [engine.update(row) for row in panel.iloc[rows:].to_dict('records')]
+            appended = pd.DataFrame(new_rows, index=panel.index[rows:], columns=outputs.columns)
+            layout = write_outputs(name, appended, rows)
+            outputs = pd.concat([outputs, appended])
+            outputs.index = panel.index
+        else:
+            engine = AnalyticsEngine(spec)
+            outputs = engine.backfill(panel)
+            # Saved rows are rewritten: without a state an interrupted write means another backfill
+            discard_state(name)
+            layout = write_outputs(name, outputs, 0)
+        save_state(name, {
+            'engine': engine,
+            'columns': list(panel.columns),
+            'rows': len(panel),
+            'first_key': panel.index[0],
+            'last_key': panel.index[-1],
+            'last_row': panel.iloc[-1].to_numpy(dtype='float64'),
+            'layout': layout
+        })
+    return outputs
+
+def compute_analytics():
+    """
+    Updates every analytics panel from the indicator store.
+    Returns:
+        dict: module name -> metrics DataFrame (panels without stored history are left out).
+    """
+    results = {}
+    for name, spec in ANALYTICS.items():
+        try:
+            panel = analytics_panel(spec)
+            if not panel.empty:
+                results[spec['module']] = update_analytics(name, panel, spec)
+        except Exception as e:
+            print(f"Error computing {name}: {e}")
+    return results
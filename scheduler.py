@@ -0,0 +1,251 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pandas as pd
+
+import market_data
+import metrics
+import resilience
+from fred_cache import get_fred_series, infer_frequency
+from fetch_module_4_data import WB_START_YEAR
+from fetch_tic_data import fetch_tic_panel
+from fetch_gdelt_news import QUERIES, TIMELINE_CACHE_TTL, fetch_gdelt_timeline
+from indicators import plan_requests, request_series_map
+from releases import RECHECK_INTERVAL, SERIES_RELEASE_LAG, TIC_RELEASE_LAG, release_window
+from world_bank import fetch_wb_panel
+
+# How often to poll once the next observation may have been published
+WINDOW_POLL_INTERVAL = {
+    'D': timedelta(hours=1),
+    'W': timedelta(hours=2),
+    'M': timedelta(hours=6),
+    'Q': timedelta(hours=12),
+    'A': timedelta(days=7)
+}
+
+# Daily market tickers are refreshed on a fixed interval
+MARKET_REFRESH_INTERVAL = timedelta(seconds=market_data.MAX_FRAME_AGE)
+
+# A failed refresh is retried after FAILURE_RETRY, doubling per consecutive failure
+FAILURE_RETRY = timedelta(minutes=5)
+MAX_FAILURE_RETRY = timedelta(hours=6)
+
+# Upper bound on concurrent refreshes per source, on top of the pool size
+SOURCE_CONCURRENCY = {
+    'fred': 4,
+    'yahoo': 1,
+    'worldbank': 2,
+    'tic': 1,
+    'gdelt': 1
+}
+
+DEFAULT_MAX_WORKERS = 8
+
+# How often the daemon checks for due jobs
+TICK_INTERVAL = 30  # seconds
+
+def next_refresh(last_observation, frequency, last_checked, release_lag=None):
+    """
+    Returns when a series should next be refreshed.
+    Before its release window a series is only re-checked every RECHECK_INTERVAL
+    (to pick up revisions); inside the window it is polled every WINDOW_POLL_INTERVAL
+    until the new observation arrives.
+    """
+    window = release_window(last_observation, frequency, release_lag)
+    if last_checked < window:
+        return min(window, last_checked + RECHECK_INTERVAL[frequency])
+    return last_checked + WINDOW_POLL_INTERVAL[frequency]
+
+class Job:
+    """
+    A refreshable source.
+    `refresh(force)` returns the observation dates it now has (None on failure); `force`
+    is False on the first run, so a restart is served from whatever is still fresh on disk.
+    Jobs with an `interval` run on that fixed interval, the others follow the release
+    calendar of their frequency (inferred from the returned dates when not given).
+    """
+
+    def __init__(self, name, source, refresh, frequency=None, release_lag=None, interval=None):
+        self.name = name
+        self.source = source
+        self.refresh = refresh
+        self.frequency = frequency
+        self.release_lag = release_lag
+        self.interval = interval
+        self.last_run = None
+        self.last_observation = None
+        self.failures = 0
+
+    def next_due(self, now):
+        if self.last_run is None:
+            return now
+        if self.failures:
+            return self.last_run + min(FAILURE_RETRY * 2 ** (self.failures - 1), MAX_FAILURE_RETRY)
+        if self.interval is not None:
+            return self.last_run + self.interval
+        if self.last_observation is None:
+            return self.last_run + WINDOW_POLL_INTERVAL[self.frequency or 'D']
+        return next_refresh(self.last_observation, self.frequency, self.last_run, self.release_lag)
+
+    def run(self, now=None):
+        """
+        Runs one refresh and records its outcome. Returns True on success.
+        While the source's circuit is open (see resilience) the refresh is skipped and counts as failed.
+        """
+        breaker = resilience.breaker(self.source)
+        dates = None
+        if breaker.allow():
+            try:
+                dates = self.refresh(self.last_run is not None)
+            except Exception as e:
+                print(f"Error refreshing {self.name}: {e}")
+            if dates is None:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        self.last_run = pd.Timestamp(now) if now is not None else pd.Timestamp.now()
+        if dates is None:
+            self.failures += 1
+            return False
+
+        self.failures = 0
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        if len(dates):
+            self.last_observation = dates.max()
+            if self.interval is None and len(dates) > 1:
+                self.frequency = infer_frequency(dates.sort_values())
+        return True
+
+def fred_job(series_id):
+    def refresh(force):
+        s = get_fred_series(series_id, force=force)
+        return s.dropna().index if s is not None else None
+    return Job(f'fred:{series_id}', 'fred', refresh, release_lag=SERIES_RELEASE_LAG.get(series_id))
+
+def market_job(tickers=market_data.ALL_TICKERS):
+    def refresh(force):
+        if force:
+            market_data.clear_cache()
+        return market_data.download_close(list(tickers)).index
+    return Job('yahoo:close', 'yahoo', refresh, interval=MARKET_REFRESH_INTERVAL)
+
+def world_bank_job(indicators, countries):
+    def refresh(force):
+        panel = fetch_wb_panel(list(indicators), list(countries), start_year=WB_START_YEAR)
+        if panel is None:
+            return None
+        years = panel.dropna(subset=['value'])['year'].unique()
+        return pd.to_datetime(pd.Series(years).astype(str), format='%Y')
+    return Job('worldbank:panel', 'worldbank', refresh, frequency='A')
+
+def tic_job():
+    def refresh(force):
+        panel = fetch_tic_panel()
+        if panel is None or not isinstance(panel.columns, pd.DatetimeIndex):
+            return None
+        return panel.columns
+    return Job('tic:mfh', 'tic', refresh, frequency='M', release_lag=TIC_RELEASE_LAG)
+
+def gdelt_job(queries=QUERIES):
+    def refresh(force):
+        timelines = fetch_gdelt_timeline(queries)
+        dates = [s.index for s in timelines.values() if not s.empty]
+        return dates[0].append(dates[1:]) if dates else None
+    return Job('gdelt:timeline', 'gdelt', refresh, interval=timedelta(seconds=TIMELINE_CACHE_TTL))
+
+def build_jobs(plan=None):
+    """Returns one job per planned upstream request (see indicators.plan_requests)."""
+    plan = plan or plan_requests()
+    jobs = []
+    for request in plan.requests.values():
+        if request.source == 'fred':
+            jobs.append(fred_job(request.series_ids[0]))
+        elif request.source == 'yahoo':
+            jobs.append(market_job(request.series_ids))
+        elif request.source == 'worldbank':
+            jobs.append(world_bank_job(request.series_ids, request.countries))
+        elif request.source == 'tic':
+            jobs.append(tic_job())
+        elif request.source == 'gdelt':
+            jobs.append(gdelt_job(request_series_map(request)))
+    return jobs
+
+class RefreshScheduler:
+    """
+    Runs due jobs on a bounded thread pool, with at most SOURCE_CONCURRENCY
+    refreshes per source in flight. A job is never run twice at the same time.
+    """
+
+    def __init__(self, jobs, max_workers=DEFAULT_MAX_WORKERS, source_limits=SOURCE_CONCURRENCY, tick=TICK_INTERVAL):
+        self.jobs = {job.name: job for job in jobs}
+        self.max_workers = max_workers
+        self.tick = tick
+        self._limits = {source: threading.BoundedSemaphore(limit) for source, limit in source_limits.items()}
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pool = None
+        self._thread = None
+
+    def due_jobs(self, now=None):
+        """Returns the jobs that are due at `now` and not already running."""
+        now = pd.Timestamp(now) if now is not None else pd.Timestamp.now()
+        with self._lock:
+            return [job for name, job in self.jobs.items()
+                    if name not in self._running and job.next_due(now) <= now]
+
+    def _run_job(self, job, now):
+        limit = self._limits.get(job.source)
+        try:
+            if limit is None:
+                return job.run(now)
+            with limit:
+                return job.run(now)
+        finally:
+            with self._lock:
+                self._running.discard(job.name)
+
+    def run_pending(self, pool, now=None):
+        """Submits every due job to `pool`. Returns the futures."""
+        futures = []
+        for job in self.due_jobs(now):
+            with self._lock:
+                if job.name in self._running:
+                    continue
+                self._running.add(job.name)
+            futures.append(pool.submit(self._run_job, job, now))
+        return futures
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while not self._stop.is_set():
+                self.run_pending(pool)
+                self._stop.wait(self.tick)
+
+    def start(self):
+        """Starts the daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+if __name__ == "__main__":
+    metrics.enable_json_logs()
+    metrics.start_http_server()
+    scheduler = RefreshScheduler(build_jobs()).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop()
@@ -0,0 +1,392 @@
+import json
+import math
+import struct
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from indicators import INDICATORS
+from market_kpis import COMMODITY_NAMES
+
+# Binary layout: MAGIC, header length (uint32 little-endian), UTF-8 JSON header, then the raw
+# little-endian arrays of every series (int64 epoch seconds, then float64 values) back to back
+MAGIC = b'PDS1'
+HEADER = struct.Struct('<4sI')
+DATE_DTYPE = np.dtype('<i8')
+VALUE_DTYPE = np.dtype('<f8')
+
+# Module 1 columns shown as headline KPIs and charts
+MODULE_1_COLUMNS = ['Fiscal_Unsustainability_Ratio', 'Interest_Revenue_Ratio', 'PublicDebt_GDP',
+                    'FedBalanceSheet_YoY', 'Yield10Y', 'Yield2Y']
+
+def _float(value):
+    """Returns `value` as a plain float, or None when it is missing or not a number."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+def _date(value):
+    """Returns an ISO date string ('2024-06-28'), a year string ('2023') as is, or None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+def source_of(name):
+    """Returns the 'source:series' label of a registered indicator, or 'derived'."""
+    indicator = INDICATORS.get(name)
+    return f"{indicator.source}:{indicator.series_id}" if indicator else 'derived'
+
+class Observation:
+    """One headline value: a plain float (None when missing), the date it refers to and its source."""
+
+    __slots__ = ('value', 'date', 'source')
+
+    def __init__(self, value, date=None, source=None):
+        self.value = _float(value)
+        self.date = _date(date)
+        self.source = source
+
+    def to_dict(self):
+        return {'value': self.value, 'date': self.date, 'source': self.source}
+
+    def __eq__(self, other):
+        return isinstance(other, Observation) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Observation({self.value!r}, {self.date!r}, {self.source!r})"
+
+class TimeSeries:
+    """A chart series as two aligned arrays: int64 epoch seconds (UTC) and float64 values."""
+
+    __slots__ = ('dates', 'values')
+
+    def __init__(self, dates, values):
+        self.dates = np.asarray(dates, dtype=DATE_DTYPE)
+        self.values = np.asarray(values, dtype=VALUE_DTYPE)
+
+    @classmethod
+    def from_pandas(cls, s):
+        """Builds a TimeSeries from a date-indexed pd.Series (timezone-aware indexes are taken as UTC)."""
+        index = pd.DatetimeIndex(s.index)
+        if index.tz is not None:
+            index = index.tz_convert(None)
+        seconds = index.to_numpy(dtype='datetime64[s]').astype(DATE_DTYPE)
+        return cls(seconds, pd.to_numeric(s, errors='coerce').to_numpy(dtype=VALUE_DTYPE))
+
+    def index(self):
+        """Returns the dates as a datetime64[s] array (for charting)."""
+        return self.dates.astype('datetime64[s]')
+
+    def __len__(self):
+        return len(self.values)
+
+    def __eq__(self, other):
+        return (isinstance(other, TimeSeries) and np.array_equal(self.dates, other.dates)
+                and np.array_equal(self.values, other.values, equal_nan=True))
+
+    def __repr__(self):
+        return f"TimeSeries({len(self)} points)"
+
+class ModuleSnapshot:
+    """The KPIs (name -> Observation), chart series (name -> TimeSeries) and text items of one module."""
+
+    __slots__ = ('kpis', 'series', 'text')
+
+    def __init__(self, kpis=None, series=None, text=None):
+        self.kpis = kpis or {}
+        self.series = series or {}
+        self.text = text or {}
+
+    def value(self, name):
+        observation = self.kpis.get(name)
+        return observation.value if observation is not None else None
+
+    def add(self, name, value, date=None, source=None):
+        """Adds a KPI unless its value is missing."""
+        observation = Observation(value, date, source or source_of(name))
+        if observation.value is not None:
+            self.kpis[name] = observation
+
+    def add_series(self, name, s):
+        """Adds a chart series from a pd.Series, skipping missing or empty ones."""
+        if s is not None and len(s):
+            self.series[name] = TimeSeries.from_pandas(s)
+
+    def __eq__(self, other):
+        return (isinstance(other, ModuleSnapshot) and self.kpis == other.kpis
+                and self.series == other.series and self.text == other.text)
+
+class DashboardSnapshot:
+    """
+    A typed dashboard snapshot: when it was built, one ModuleSnapshot per dashboard module and
+    the upstream requests served from their last good value (request key -> age in seconds).
+    Holds only plain floats, strings and numpy arrays, so it is cheap to cache, diff and ship.
+    """
+
+    __slots__ = ('built_at', 'modules', 'stale')
+
+    def __init__(self, built_at, modules, stale=None):
+        self.built_at = built_at
+        self.modules = modules
+        self.stale = stale or {}
+
+    def module(self, name):
+        return self.modules.get(name) or ModuleSnapshot()
+
+    def __eq__(self, other):
+        return (isinstance(other, DashboardSnapshot) and self.built_at == other.built_at
+                and self.modules == other.modules and self.stale == other.stale)
+
+def _last_date(s):
+    """Returns the date of the latest non-NaN observation of a pd.Series, or None."""
+    if s is None:
+        return None
+    s = s.dropna()
+    return s.index[-1] if len(s) else None
+
+def _frame_column(frame, column):
+    return frame[column] if frame is not None and column in frame else None
+
+def module_1_snapshot(df):
+    """Builds the Module 1 snapshot from the quarterly fiscal frame."""
+    module = ModuleSnapshot()
+    if df is None or df.empty:
+        return module
+    for column in MODULE_1_COLUMNS:
+        if column in df:
+            # Headline values are the latest quarter, as in the frame
+            module.add(column, df[column].iloc[-1], df.index[-1])
+            module.add_series(column, df[column])
+    return module
+
+def module_2_snapshot(results, history):
+    """Builds the Module 2 snapshot from the module results and the Dollar_Index/Neutral_Assets history."""
+    module = ModuleSnapshot()
+    results = results or {}
+    dxy = history.get('Dollar_Index')
+    neutral = history.get('Neutral_Assets')
+
+    module.add('Dollar_Index', results.get('Dollar_Index'), _last_date(dxy))
+    tic = results.get('Foreign_Confidence_TIC') or {}
+    module.add('TIC_China', tic.get('China'))
+    module.add('TIC_Japan', tic.get('Japan'))
+    module.add('Foreign_Holdings_Total', results.get('Foreign_Confidence_Total'))
+    reserves = results.get('China_Gold_Reserves') or {}
+    module.add('China_Reserves', reserves.get('value'), reserves.get('year'))  # Trillions of US$
+    for name, column in [('Gold', 'Gold_Price'), ('Bitcoin', 'Bitcoin_Price')]:
+        module.add(name, results.get(column), _last_date(_frame_column(neutral, column)))
+
+    module.add_series('Dollar_Index', dxy)
+    for column in ['Gold_Index', 'Bitcoin_Index', 'Bitcoin_Gold_Ratio']:
+        module.add_series(column, _frame_column(neutral, column))
+    return module
+
+def module_3_snapshot(results, history):
+    """Builds the Module 3 snapshot from the module results and the Energy_Money/Commodities history."""
+    module = ModuleSnapshot()
+    results = results or {}
+    energy_history = history.get('Energy_Money')
+    commodities = history.get('Commodities')
+
+    energy = results.get('Energy_Money') or {}
+    energy_date = _last_date(_frame_column(energy_history, 'Energy_Value'))
+    module.add('Oil', energy.get('Oil_Price'), energy_date)
+    module.add('Energy_Value', energy.get('Energy_Value'), energy_date)
+
+    prices = results.get('Commodities')
+    for ticker, name in COMMODITY_NAMES.items():
+        value = prices.get(ticker) if prices is not None else None
+        module.add(name, value, _last_date(_frame_column(commodities, name)))
+
+    production = results.get('Energy_Production')
+    if production is not None and len(production):
+        # The latest FRED row: named by its date, one value
+        module.add('Crude_Production', production.iloc[0], production.name)
+
+    module.add_series('Energy_Value', _frame_column(energy_history, 'Energy_Value'))
+    for name in COMMODITY_NAMES.values():
+        module.add_series(f'{name}_Index', _frame_column(commodities, f'{name}_Index'))
+    return module
+
+def module_4_snapshot(results):
+    """Builds the Module 4 snapshot from the module results."""
+    module = ModuleSnapshot()
+    results = results or {}
+
+    module.add('US_China_Trade_Balance', results.get('US_China_Trade_Balance'), source='derived')
+    for name, key in [('TradeBalance_Total', 'Trade_Balance_Total'), ('Industrial_Production', 'Industrial_Production')]:
+        row = results.get(key)
+        if row is not None and len(row):
+            module.add(name, row.iloc[0], row.name)
+    module.add('Manuf_GDP_Share', results.get('Manuf_GDP_Share'), results.get('Manuf_GDP_Share_Year'))
+    for metric in ['GDP_Nominal', 'GDP_PPP']:
+        for country in ['USA', 'CHN']:
+            module.add(f'{metric}_{country}', results.get(f'{metric}_{country}'), source=source_of(metric))
+
+    for label, articles in (results.get('News_Mentions') or {}).items():
+        if articles:
+            module.text[f'News_Mentions.{label}'] = articles[0].get('title', '')
+    for label, s in (results.get('News_Volume') or {}).items():
+        module.add_series(f'News_Volume.{label}', s)
+    return module
+
+def add_analytics(module, frame):
+    """
+    Adds the latest value of every rolling metric (see rolling_analytics) as a KPI, and the
+    z-score and correlation columns as chart series.
+    """
+    if frame is None:
+        return module
+    for column in frame.columns:
+        s = frame[column]
+        date = _last_date(s)
+        if date is not None:
+            module.add(column, s.loc[date], date, source='derived')
+        if column.endswith(('_ZScore', '_Correlation')):
+            module.add_series(column, s.dropna())
+    return module
+
+def add_projection(module, projection):
+    """
+    Adds the fan chart of the projected Fiscal Unsustainability Ratio (see fiscal_projection)
+    as 'FUR_Projection_P<percentile>' series, the share of paths crossing 100% within the
+    horizon and the calendar year by which half of them have.
+    """
+    if projection is None:
+        return module
+    for column, s in projection.fans['Fiscal_Unsustainability_Ratio'].items():
+        module.add_series(f'FUR_Projection_{column}', s)
+    crossing = projection.crossing
+    horizon = crossing['by_year'].index[-1]
+    module.add('FUR_Crossing_Probability', crossing['probability'], horizon, source='derived')
+    median = crossing['percentiles'].get(50)
+    if median is not None:
+        module.add('FUR_Crossing_Year', median.year, horizon, source='derived')
+    return module
+
+def from_modules(modules, history, built_at=None, stale=None):
+    """
+    Converts fetch_all_modules() results and the chart history into a DashboardSnapshot.
+    Args:
+        modules (dict): 'module_1' (fiscal frame) and 'module_2' .. 'module_4' result dicts.
+        history (dict): Chart series and frames keyed by name (see dashboard_state.build_snapshot).
+        stale (dict): Request key -> age in seconds of the last good values used (see resilience.stale_keys).
+    """
+    history = history or {}
+    snapshot = DashboardSnapshot(built_at or datetime.now(), {
+        'module_1': module_1_snapshot(modules.get('module_1')),
+        'module_2': module_2_snapshot(modules.get('module_2'), history),
+        'module_3': module_3_snapshot(modules.get('module_3'), history),
+        'module_4': module_4_snapshot(modules.get('module_4'))
+    }, {key: float(age) for key, age in (stale or {}).items()})
+    # Rolling metrics: module name -> frame (see rolling_analytics.compute_analytics)
+    for name, frame in (history.get('Analytics') or {}).items():
+        if name in snapshot.modules:
+            add_analytics(snapshot.modules[name], frame)
+    add_projection(snapshot.modules['module_1'], history.get('Projection'))
+    return snapshot
+
+def _header(snapshot):
+    return {
+        'built_at': snapshot.built_at.isoformat(),
+        'stale': snapshot.stale,
+        'modules': {name: {'kpis': {k: o.to_dict() for k, o in module.kpis.items()},
+                           'text': module.text}
+                    for name, module in snapshot.modules.items()}
+    }
+
+def _modules_from_header(header, series):
+    modules = {}
+    for name, data in header['modules'].items():
+        kpis = {k: Observation(o['value'], o['date'], o['source']) for k, o in data['kpis'].items()}
+        modules[name] = ModuleSnapshot(kpis, series.get(name, {}), dict(data['text']))
+    return DashboardSnapshot(datetime.fromisoformat(header['built_at']), modules, header.get('stale'))
+
+def to_bytes(snapshot):
+    """Serializes a snapshot into the compact binary format (JSON header plus raw arrays)."""
+    header = _header(snapshot)
+    blobs = []
+    layout = []
+    for name, module in snapshot.modules.items():
+        for series_name, ts in module.series.items():
+            layout.append([name, series_name, len(ts)])
+            blobs.append(ts.dates.tobytes())
+            blobs.append(ts.values.tobytes())
+    header['series'] = layout
+    encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return b''.join([HEADER.pack(MAGIC, len(encoded)), encoded] + blobs)
+
+def from_bytes(data):
+    """
+    Loads a snapshot written by to_bytes(). The series arrays are read-only views into `data`, not copies.
+    Raises:
+        ValueError: If `data` is not a snapshot.
+    """
+    magic, length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a dashboard snapshot")
+    header = json.loads(bytes(data[HEADER.size:HEADER.size + length]))
+
+    offset = HEADER.size + length
+    series = {}
+    for module_name, series_name, n in header['series']:
+        dates = np.frombuffer(data, dtype=DATE_DTYPE, count=n, offset=offset)
+        offset += n * DATE_DTYPE.itemsize
+        values = np.frombuffer(data, dtype=VALUE_DTYPE, count=n, offset=offset)
+        offset += n * VALUE_DTYPE.itemsize
+        series.setdefault(module_name, {})[series_name] = TimeSeries(dates, values)
+    return _modules_from_header(header, series)
+
+def to_json(snapshot):
+    """
+    Serializes a snapshot to JSON for web clients: series are {'dates': [ISO dates], 'values': [...]},
+    with null for missing values.
+    """
+    header = _header(snapshot)
+    for name, module in snapshot.modules.items():
+        header['modules'][name]['series'] = {
+            series_name: {
+                'dates': np.datetime_as_string(ts.index()).tolist(),
+                'values': [None if math.isnan(v) else v for v in ts.values.tolist()]
+            }
+            for series_name, ts in module.series.items()
+        }
+    return json.dumps(header, separators=(',', ':'))
+
+def from_json(text):
+    """Loads a snapshot written by to_json()."""
+    header = json.loads(text)
+    series = {}
+    for name, data in header['modules'].items():
+        series[name] = {
+            series_name: TimeSeries(np.array(s['dates'], dtype='datetime64[s]').astype(DATE_DTYPE),
+                                    np.array(s['values'], dtype=VALUE_DTYPE))
+            for series_name, s in data.get('series', {}).items()
+        }
+    return _modules_from_header(header, series)
+
+def diff(old, new):
+    """
+    Compares two snapshots.
+    Returns:
+        dict: 'kpis' ((module, name) -> (old Observation or None, new Observation or None)) and
+        'series' (sorted (module, name) pairs whose series were added, removed or changed).
+    """
+    kpis = {}
+    series = []
+    old_modules = old.modules if old is not None else {}
+    for name in sorted(set(old_modules) | set(new.modules)):
+        before = old_modules.get(name) or ModuleSnapshot()
+        after = new.modules.get(name) or ModuleSnapshot()
+        for key in sorted(set(before.kpis) | set(after.kpis)):
+            if before.kpis.get(key) != after.kpis.get(key):
+                kpis[(name, key)] = (before.kpis.get(key), after.kpis.get(key))
+        for key in sorted(set(before.series) | set(after.series)):
+            if before.series.get(key) != after.series.get(key):
+                series.append((name, key))
+    return {'kpis': kpis, 'series': series}
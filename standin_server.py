@@ -0,0 +1,217 @@
+"""
+Local stand-in for the upstream APIs, for load and concurrency testing without network access.
+
+Serves synthetic payloads (see benchmarks/payloads.py) in the URL shapes the fetchers use:
+    .../fredgraph.csv?id=SERIES[&cosd=YYYY-MM-DD]
+    .../fred/series/observations?series_id=SERIES&realtime_start=...  (ALFRED vintages)
+    .../v2/country/USA;CHN/indicator/A;B?page=N
+    .../api/v2/doc/doc?mode=artlist|timelinevolraw
+    .../mfh.txt
+    .../v8/finance/chart/TICKER?range=1y
+with optional latency, error and rate-limit injection.
+
+Usage:
+    python standin_server.py --port 8765 --latency 0.2 --error-rate 0.05 --rate-limit-rate 0.05 --scale 10
+    POLYDASH_UPSTREAM=http://127.0.0.1:8765 python fetch_all_data.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from benchmarks import payloads
+from metrics import source_for_url
+
+DEFAULT_PORT = 8765
+
+class Faults:
+    """
+    Fault injection settings, shared by all request threads.
+    Args:
+        latency (float): Seconds added to every response.
+        jitter (float): Extra uniformly random latency, up to this many seconds.
+        error_rate (float): Fraction of requests answered with HTTP 500.
+        rate_limit_rate (float): Fraction of requests answered with HTTP 429.
+        retry_after (int): Retry-After header (seconds) sent with 429 responses.
+        scale (int): Payload size multiplier (history length or table rows).
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, retry_after=1, scale=1, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.scale = scale
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Returns (delay seconds, injected status code or None) for one request."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+        if roll < self.error_rate:
+            return delay, 500
+        if roll < self.error_rate + self.rate_limit_rate:
+            return delay, 429
+        return delay, None
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the fault settings, rendered payloads and request statistics."""
+
+    daemon_threads = True
+
+    def __init__(self, address, faults=None):
+        super().__init__(address, _Handler)
+        self.faults = faults or Faults()
+        self.request_counts = Counter()
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._stats_lock = threading.Lock()
+        self._bodies = {}
+        self._bodies_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def body(self, key, render):
+        """Renders a payload once per key and reuses it, so serving cost stays out of the measurements."""
+        with self._bodies_lock:
+            body = self._bodies.get(key)
+        if body is None:
+            body = render()
+            body = body.encode('utf-8') if isinstance(body, str) else body
+            with self._bodies_lock:
+                self._bodies[key] = body
+        return body
+
+    def enter(self, source):
+        with self._stats_lock:
+            self.request_counts[source] += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def leave(self):
+        with self._stats_lock:
+            self._in_flight -= 1
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so client connection pooling is exercised
+
+    def do_GET(self):
+        server = self.server
+        parts = urllib.parse.urlsplit(self.path)
+        query = {k: v[-1] for k, v in urllib.parse.parse_qs(parts.query).items()}
+        source = source_for_url(self.path)
+
+        server.enter(source)
+        try:
+            delay, status = server.faults.draw()
+            if delay:
+                time.sleep(delay)
+            if status == 429:
+                self._send(429, b'Too Many Requests', 'text/plain', {'Retry-After': str(server.faults.retry_after)})
+            elif status is not None:
+                self._send(status, b'Internal Server Error', 'text/plain')
+            else:
+                self._route(source, parts.path, query)
+        finally:
+            server.leave()
+
+    def _route(self, source, path, query):
+        server = self.server
+        scale = server.faults.scale
+
+        if source == 'fred' and 'id' in query:
+            series_id = query['id']
+            body = server.body(('fred', series_id), lambda: payloads.fred_csv(series_id, scale))
+            if 'cosd' in query:
+                body = _filter_csv(body, query['cosd'])
+            self._send(200, body, 'text/csv')
+        elif source == 'fred' and 'series_id' in query:
+            series_id = query['series_id']
+            body = server.body(('alfred', series_id), lambda: json.dumps(payloads.alfred_observations(series_id, scale)))
+            self._send(200, body, 'application/json')
+        elif source == 'worldbank':
+            segments = path.split('/')
+            countries = segments[segments.index('country') + 1].split(';')
+            indicators = segments[segments.index('indicator') + 1].split(';')
+            entries = server.body(('wb', path), lambda: payloads.world_bank_entries(indicators, countries, scale))
+            page = payloads.world_bank_page(entries, int(query.get('page', 1)))
+            self._send(200, json.dumps(page).encode('utf-8'), 'application/json')
+        elif source == 'gdelt':
+            if query.get('mode', '').startswith('timeline'):
+                body = server.body('gdelt', lambda: json.dumps(payloads.gdelt_timeline(scale)))
+            else:
+                body = json.dumps(payloads.GDELT_ARTICLES).encode('utf-8')
+            self._send(200, body, 'application/json')
+        elif source == 'tic':
+            self._send(200, server.body('tic', lambda: payloads.mfh_text(scale)), 'text/plain')
+        elif source == 'yahoo':
+            ticker = urllib.parse.unquote(path.rstrip('/').rsplit('/', 1)[-1])
+            body = server.body(('yahoo', ticker), lambda: json.dumps(payloads.yahoo_chart(ticker, scale)))
+            self._send(200, body, 'application/json')
+        else:
+            self._send(404, b'Not Found', 'text/plain')
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _filter_csv(body, start):
+    """Keeps the header and the rows dated on or after `start`, like FRED's cosd parameter."""
+    # ISO dates sort as strings
+    start = pd.Timestamp(start).strftime('%Y-%m-%d').encode()
+    lines = body.split(b'\n')
+    rows = [line for line in lines[1:] if line and line.split(b',', 1)[0] >= start]
+    return b'\n'.join([lines[0]] + rows)
+
+def start_standin(port=0, host='127.0.0.1', faults=None):
+    """Starts the stand-in on a daemon thread. Returns the server (see its `url`); call shutdown() to stop it."""
+    server = StandinServer((host, port), faults)
+    threading.Thread(target=server.serve_forever, name='standin-server', daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for FRED, World Bank, GDELT, TIC and Yahoo.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds on 429 responses")
+    parser.add_argument('--scale', type=int, default=1, help="Payload size multiplier")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.rate_limit_rate, args.retry_after, args.scale, args.seed)
+    server = StandinServer((args.host, args.port), faults)
+    print(f"Stand-in upstream listening on {server.url}")
+    print(f"Point the fetchers at it with: POLYDASH_UPSTREAM={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,43 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 @pytest.fixture
 def mock_requests_get(mocker):
-    return mocker.patch("requests.get")
+    """
+    Patches http_client.get, through which every fetcher makes its requests (pooled session,
+    retries and metrics). Patching requests.get still works too: http_client.get hands calls
+    to a patched requests.get, so fixtures written against it never reach the network.
+    """
+    return mocker.patch("http_client.get")
 
 @pytest.fixture
 def mock_yfinance_download(mocker):
     return mocker.patch("yfinance.download")
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    # Keep the on-disk data cache out of the repo and fresh for every test
+    monkeypatch.setenv("POLYDASH_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+@pytest.fixture(autouse=True)
+def clear_market_data_cache():
+    # The market-data frame cache is per run; never leak frames between tests
+    import market_data
+    market_data.clear_cache()
+    yield
+    market_data.clear_cache()
+
+@pytest.fixture(autouse=True)
+def clear_gdelt_cache():
+    import fetch_gdelt_news
+    fetch_gdelt_news.clear_cache()
+    yield
+    fetch_gdelt_news.clear_cache()
+
+@pytest.fixture(autouse=True)
+def reset_resilience():
+    # Circuit breakers and last good values are process-wide; start every test with closed circuits
+    import resilience
+    resilience.reset()
+    yield
+    resilience.wait_idle()
+    resilience.reset()
@@ -0,0 +1,43 @@
+import pytest
+import numpy as np
+import pandas as pd
+from alignment import resample_to, build_panel
+from fetch_fiscal_data import build_fiscal_panels, SERIES_MAP
+
+def test_resample_to_explicit_aggregation():
+    monthly = pd.Series([4.0, 4.2, 4.4, 5.0], index=pd.to_datetime(['2024-01-01', '2024-02-01', '2024-03-01', '2024-04-01']))
+
+    assert list(resample_to(monthly, 'QS', 'mean').round(6)) == [4.2, 5.0]
+    assert list(resample_to(monthly, 'QS', 'last')) == [4.4, 5.0]
+
+def test_build_panel_is_compact_and_as_of():
+    daily = pd.Series(np.arange(730, dtype=float), index=pd.date_range('2022-01-01', periods=730, freq='D'))
+    quarterly = pd.Series([1.0, 2.0], index=pd.to_datetime(['2022-01-01', '2022-04-01']))
+
+    panel = build_panel({'daily': daily, 'quarterly': quarterly}, 'QS', {'daily': 'last', 'quarterly': 'last'})
+
+    # One row per quarter, not one per day of the union index
+    assert len(panel) == 8
+    # Quarterly value carried forward as of each later quarter
+    assert panel['quarterly'].iloc[-1] == 2.0
+    assert panel['daily'].iloc[0] == 89.0
+
+def test_fed_balance_sheet_yoy_is_one_year():
+    weeks = pd.date_range('2022-01-05', periods=110, freq='W-WED')
+    walcl = pd.Series(np.linspace(100.0, 209.0, 110), index=weeks)
+    quarters = pd.date_range('2022-01-01', periods=8, freq='QS')
+    data_frames = {name: pd.Series(1.0, index=quarters) for name in SERIES_MAP if name != 'FedBalanceSheet'}
+    data_frames['FedBalanceSheet'] = walcl
+
+    panels = build_fiscal_panels(data_frames)
+    weekly = panels['weekly']
+
+    last = weekly.index[-1]
+    year_ago = last - pd.Timedelta(weeks=52)
+    expected = walcl[last] / walcl[year_ago] - 1
+    assert weekly['FedBalanceSheet_YoY'].iloc[-1] == pytest.approx(expected)
+
+    # Quarterly panel carries the YoY as of quarter end
+    quarterly = panels['quarterly']
+    assert quarterly['FedBalanceSheet_YoY'].iloc[-1] == pytest.approx(expected)
+    assert quarterly['Fiscal_Unsustainability_Ratio'].iloc[-1] == 4.0
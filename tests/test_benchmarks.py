@@ -0,0 +1,35 @@
+import pytest
+import pandas as pd
+from benchmarks import payloads
+from benchmarks.run import offline, run_benchmarks, compare
+from fetch_tic_data import fetch_tic_panel
+from fred_cache import get_fred_series
+
+def test_payloads_round_trip_through_fetchers():
+    with offline(scale=2):
+        panel = fetch_tic_panel()
+        s = get_fred_series('WALCL')
+
+    assert len(panel) == payloads.BASE_TIC_COUNTRIES * 2 + 1  # plus Grand Total
+    assert isinstance(panel.columns, pd.DatetimeIndex)
+    assert len(s) == payloads.BASE_ROWS['W-WED'] * 2
+    assert s.index[-1] == pd.Timestamp('2024-06-26')
+
+def test_scaled_fred_history_stays_unique():
+    s = payloads.fred_csv('DTWEXBGS', scale=100).splitlines()
+    dates = [line.split(',')[0] for line in s[1:]]
+    assert len(dates) == payloads.BASE_ROWS['B'] * 100
+    assert len(set(dates)) == len(dates)
+
+def test_run_parse_benchmarks_and_compare(capsys):
+    results = run_benchmarks(scales=[1], repeat=1, keyword='parse:')
+
+    names = [r['name'] for r in results]
+    assert names[:6] == ['parse:fred_csv_legacy', 'parse:fred_csv', 'parse:fred_csv_c', 'parse:tic_mfh',
+                         'parse:world_bank_json', 'parse:gdelt_timeline_json']
+    assert names[6:] in ([], ['parse:fred_csv_pyarrow'])
+    assert all(r['median_ms'] > 0 and r['peak_mib'] >= 0 for r in results)
+
+    baseline = [dict(r, median_ms=r['median_ms'] / 2) for r in results]
+    assert len(compare(results, baseline, threshold=1.25)) == len(results)
+    assert compare(results, results) == []
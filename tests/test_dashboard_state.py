@@ -0,0 +1,83 @@
+import threading
+from datetime import datetime
+
+import pytest
+import pandas as pd
+from dashboard_state import SnapshotStore, BackgroundRefresher
+from snapshots import from_modules
+from app import create_app, render_tab, snapshot_status, MODULE_TABS
+
+def make_snapshot(built_at=datetime(2024, 6, 1, 12, 0)):
+    index = pd.date_range('2024-01-01', periods=3, freq='D')
+    return from_modules({
+        'module_1': pd.DataFrame({'Fiscal_Unsustainability_Ratio': [0.9, 1.0, 1.1]}, index=index),
+        'module_2': {'Dollar_Index': 121.5, 'Foreign_Confidence_TIC': {'China': '775.0'}},
+        'module_3': {'Energy_Money': None},
+        'module_4': {'News_Volume': {'Tariffs': pd.Series([5.0, 7.0, 9.0], index=index)}}
+    }, {'Dollar_Index': pd.Series([120.0, 121.0, 121.5], index=index)}, built_at)
+
+def test_snapshot_store_swap_returns_previous():
+    store = SnapshotStore()
+    assert store.get() is None
+
+    first, second = make_snapshot(), make_snapshot()
+    assert store.swap(first) is None
+    assert store.swap(second) is first
+    assert store.get() is second
+
+def test_refresher_keeps_previous_snapshot_on_failure():
+    old = make_snapshot()
+    store = SnapshotStore(old)
+
+    def failing_build():
+        raise RuntimeError("upstream down")
+
+    assert BackgroundRefresher(store, build=failing_build).refresh_once() is False
+    assert store.get() is old
+
+def test_refresher_thread_swaps_in_new_snapshot():
+    store = SnapshotStore()
+    built = threading.Event()
+    new = make_snapshot()
+
+    def build():
+        built.set()
+        return new
+
+    refresher = BackgroundRefresher(store, build=build, interval=3600).start()
+    assert built.wait(5)
+    refresher.stop(timeout=5)
+    assert store.get() is new
+
+def test_render_reads_snapshot_only(mocker):
+    fetch = mocker.patch("fetch_all_data.fetch_all_modules")
+    snapshot = make_snapshot()
+
+    for tab in MODULE_TABS:
+        assert render_tab(tab, snapshot) is not None
+    assert render_tab('module_1', None) is not None
+    assert snapshot_status(snapshot) == "Data as of 2024-06-01 12:00"
+    fetch.assert_not_called()
+
+def test_create_app_layout():
+    app = create_app(SnapshotStore(make_snapshot()))
+    layout = str(app.layout)
+    for component_id in ['module-tabs', 'tab-content', 'snapshot-poll']:
+        assert component_id in layout
+
+def test_wsgi_app_starts_refresher_on_first_request():
+    store = SnapshotStore()
+    built = threading.Event()
+
+    def build():
+        built.set()
+        return make_snapshot()
+
+    refresher = BackgroundRefresher(store, build=build, interval=3600)
+    app = create_app(store, refresher)
+    assert not built.is_set()
+
+    assert app.server.test_client().get('/snapshot.json').status_code in (200, 503)
+    assert built.wait(5)
+    refresher.stop(timeout=5)
+    assert store.get() is not None
@@ -0,0 +1,45 @@
+import numpy as np
+from downsampling import lttb, minmax, downsample
+
+def walk(n, seed=0):
+    return np.arange(n, dtype='int64') * 86400, np.cumsum(np.random.default_rng(seed).standard_normal(n))
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x, y = walk(100_000)
+    y[40_000] += 1000
+
+    chosen = lttb(x, y, 500)
+    assert len(chosen) == 500
+    assert chosen[0] == 0 and chosen[-1] == len(y) - 1
+    assert np.all(np.diff(chosen) > 0)
+    assert 40_000 in chosen
+
+def test_minmax_keeps_extremes_within_budget():
+    x, y = walk(10_001, seed=1)
+
+    chosen = minmax(x, y, 300)
+    assert len(chosen) <= 300 and np.all(np.diff(chosen) > 0)
+    assert y.argmin() in chosen and y.argmax() in chosen
+    np.testing.assert_array_equal(minmax(x[:50], y[:50], 300), np.arange(50))
+
+def test_zoomed_range_is_decimated_at_higher_resolution():
+    x, y = walk(50_000)
+    start, end = x[10_000], x[12_000]
+
+    full_x, _ = downsample(x, y, 1000)
+    zoom_x, zoom_y = downsample(x, y, 1000, x_range=(start, end))
+    inside = (zoom_x >= start) & (zoom_x <= end)
+    assert inside.sum() > ((full_x >= start) & (full_x <= end)).sum() * 10
+    # One point beyond each edge, so the line reaches the borders of the view
+    assert zoom_x[0] < start and zoom_x[-1] > end and len(zoom_x) <= 1000
+
+def test_short_series_keep_gaps_and_long_ones_drop_them():
+    x, y = walk(10)
+    y[3] = np.nan
+    short_x, short_y = downsample(x, y, 100)
+    assert len(short_y) == 10 and np.isnan(short_y[3])
+
+    x, y = walk(5000)
+    y[::7] = np.nan
+    _, long_y = downsample(x, y, 100, method='minmax')
+    assert len(long_y) <= 100 and not np.isnan(long_y).any()
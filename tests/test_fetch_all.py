@@ -0,0 +1,82 @@
+import time
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+from fetch_all_data import run_task_graph, fetch_all_modules
+from fetch_fiscal_data import fetch_fiscal_data
+
+def test_run_task_graph_runs_leaves_concurrently():
+    def slow(value):
+        time.sleep(0.2)
+        return value
+
+    tasks = {
+        'a': (lambda: slow(2), []),
+        'b': (lambda: slow(3), []),
+        'c': (lambda: slow(4), []),
+        'product': (lambda a, b, c: a * b * c, ['a', 'b', 'c'])
+    }
+
+    start = time.perf_counter()
+    results = run_task_graph(tasks)
+    elapsed = time.perf_counter() - start
+
+    assert results['product'] == 24
+    # Three 0.2s leaves in parallel, not 0.6s in sequence
+    assert elapsed < 0.5
+
+def test_run_task_graph_failed_task_yields_none():
+    def boom():
+        raise RuntimeError("Source down")
+
+    tasks = {
+        'leaf': (boom, []),
+        'derived': (lambda leaf: leaf is None, ['leaf'])
+    }
+
+    results = run_task_graph(tasks)
+    assert results['leaf'] is None
+    assert results['derived'] is True
+
+def test_run_task_graph_unknown_dependency():
+    with pytest.raises(ValueError):
+        run_task_graph({'a': (lambda x: x, ['missing'])})
+
+def test_fetch_all_modules_matches_module_functions(mock_requests_get, mock_yfinance_download):
+    def side_effect(url, *args, **kwargs):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        if 'fredgraph.csv' in url:
+            series_id = url.split('id=')[-1]
+            mock_resp.content = f"DATE,{series_id}\n2023-01-01,1000.0\n2024-01-01,1200.0\n".encode()
+        elif 'worldbank' in url:
+            countries, indicators = url.split('/country/')[1].split('/indicator/')
+            entries = [{"indicator": {"id": indicator}, "countryiso3code": country, "date": "2024", "value": 2000000000000}
+                       for indicator in indicators.split(';') for country in countries.split(';')]
+            mock_resp.json.return_value = [{"page": 1, "pages": 1}, entries]
+        else:
+            mock_resp.text = "Country  Dec  Jan\nChina, Mainland  790.0  800.1\nJapan  1090.0  1100.1\n"
+            mock_resp.iter_lines.return_value = mock_resp.text.splitlines()
+            mock_resp.json.return_value = {}
+        return mock_resp
+
+    mock_requests_get.side_effect = side_effect
+
+    arrays = [['Close'] * 7, ['CL=F', '^TNX', 'HG=F', 'ZW=F', 'ZC=F', 'GC=F', 'BTC-USD']]
+    columns = pd.MultiIndex.from_tuples(list(zip(*arrays)), names=['Price', 'Ticker'])
+    mock_yfinance_download.return_value = pd.DataFrame([[75.0, 4.2, 4.0, 5.5, 4.5, 2000.0, 60000.0]], columns=columns)
+
+    data = fetch_all_modules()
+
+    pd.testing.assert_frame_equal(data['module_1'], fetch_fiscal_data())
+
+    assert data['module_2']['Foreign_Confidence_TIC'] == {'China': '800.1', 'Japan': '1100.1'}
+    assert data['module_2']['Dollar_Index'] == 1200.0
+    assert data['module_2']['China_Gold_Reserves']['value'] == 2.0
+
+    assert data['module_3']['Energy_Money']['Oil_Price'] == 75.0
+
+    assert data['module_4']['US_China_Trade_Balance'] == 0.0
+    assert data['module_4']['GDP_Nominal_USA'] == 2000000000000
+    assert data['module_4']['GDP_PPP_CHN'] == 2000000000000
+    assert data['module_4']['Manuf_GDP_Share_Year'] == "2024"
@@ -1,8 +1,9 @@
 import pytest
+import numpy as np
 import pandas as pd
 from io import StringIO
 from unittest.mock import MagicMock
-from fetch_fiscal_data import fetch_fiscal_data
+from fetch_fiscal_data import SERIES_MAP, build_fiscal_frame, fetch_fiscal_data
 
 def test_fetch_fiscal_data_success(mock_requests_get):
     # The function calls requests.get multiple times for different IDs.
@@ -21,7 +22,7 @@ def test_fetch_fiscal_data_success(mock_requests_get):
 2024-01-01,1200.0
 """
         mock_resp = MagicMock()
-        mock_resp.text = mock_csv_data
+        mock_resp.content = mock_csv_data.encode()
         mock_resp.status_code = 200
         return mock_resp
 
@@ -52,3 +53,16 @@ def test_fetch_fiscal_data_failure(mock_requests_get):
 
     df = fetch_fiscal_data()
     assert df is None
+
+def test_latest_quarter_kept_when_a_series_lags():
+    quarters = pd.date_range('2023-01-01', periods=6, freq='QS')
+    data = {name: pd.Series(np.linspace(100.0, 150.0, 6), index=quarters)
+            for name in SERIES_MAP if name != 'FedBalanceSheet'}
+    data['FedBalanceSheet'] = pd.Series(7e6, index=pd.date_range('2022-01-05', periods=130, freq='W-WED'))
+    # Debt-to-GDP starts a quarter later and has not printed the latest quarter yet
+    data['PublicDebt_GDP'] = data['PublicDebt_GDP'].iloc[1:-1]
+
+    df = build_fiscal_frame(data, incremental=False)
+    assert df.index[0] == quarters[1] and df.index[-1] == quarters[-1]
+    assert df['Revenue'].iloc[-1] == 150.0
+    assert df['PublicDebt_GDP'].iloc[-1] == df['PublicDebt_GDP'].iloc[-2]
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import fiscal_projection
+from fiscal_projection import starting_point, project, run_paths, crossing_years, DEFAULT_ASSUMPTIONS
+from snapshots import from_modules, to_bytes, from_bytes
+
+START = {'Revenue': 5000.0, 'Interest': 1000.0, 'Mandatory_Proxy': 3500.0, 'PublicDebt_GDP': 120.0,
+         'Yield2Y': 4.0, 'Yield10Y': 4.3, 'GDP': 30000.0, 'date': pd.Timestamp('2025-04-01')}
+
+def test_starting_point_uses_latest_complete_quarter():
+    index = pd.date_range('2024-10-01', periods=3, freq='QS')
+    df = pd.DataFrame({column: [1.0, 2.0, 3.0] for column in fiscal_projection.START_COLUMNS}, index=index)
+    df.loc[index[-1], 'GDP'] = np.nan
+
+    start = starting_point(df)
+    assert start['date'] == index[1] and start['Revenue'] == 2.0
+    assert starting_point(df.drop(columns='Yield2Y')) is None
+
+def test_fan_percentiles_are_ordered_from_the_start():
+    projection = project(START, paths=2000, years=10, seed=1)
+    fan = projection.fans['Fiscal_Unsustainability_Ratio']
+
+    assert len(fan) == 11 and fan.index[-1] == pd.Timestamp('2035-04-01')
+    assert fan.iloc[0].tolist() == pytest.approx([0.9] * 5)
+    assert (fan.diff(axis=1).iloc[:, 1:] >= 0).all().all()
+    assert projection.fans['PublicDebt_GDP'].iloc[0, 0] == pytest.approx(120.0)
+
+def test_chunks_give_the_same_paths_on_any_worker_count(monkeypatch):
+    monkeypatch.setattr(fiscal_projection, 'CHUNK_PATHS', 300)
+    monkeypatch.setattr(fiscal_projection, 'POOL_MIN_PATHS', 0)
+    in_process = run_paths(START, DEFAULT_ASSUMPTIONS, paths=700, years=5, seed=3, workers=1)
+    pooled = run_paths(START, DEFAULT_ASSUMPTIONS, paths=700, years=5, seed=3, workers=2)
+
+    assert in_process['Fiscal_Unsustainability_Ratio'].shape == (6, 700)
+    for name, values in in_process.items():
+        np.testing.assert_array_equal(values, pooled[name])
+
+def test_crossing_years_and_summary():
+    ratio = np.array([[0.9, 0.9, 1.1], [0.95, 1.0, 1.2], [0.99, 1.1, 1.3]])
+    np.testing.assert_array_equal(crossing_years(ratio), [np.nan, 1.0, 0.0])
+
+    # Mandatory spending already above revenue: every path has crossed by the start
+    projection = project(dict(START, Mandatory_Proxy=5500.0), paths=1000, years=5)
+    assert projection.crossing['probability'] == 1.0
+    assert projection.crossing['percentiles'][50] == START['date']
+    assert projection.crossing['by_year'].is_monotonic_increasing
+
+def test_projection_in_snapshot():
+    snapshot = from_modules({}, {'Projection': project(START, paths=500, years=5)}, datetime(2025, 6, 1))
+    module = snapshot.module('module_1')
+
+    assert len(module.series['FUR_Projection_P50']) == 6
+    assert 0.0 <= module.value('FUR_Crossing_Probability') <= 1.0
+    assert from_bytes(to_bytes(snapshot)) == snapshot
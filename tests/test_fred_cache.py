@@ -0,0 +1,84 @@
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from fred_cache import get_fred_series, is_fresh, infer_frequency
+
+def make_response(text):
+    mock_resp = MagicMock()
+    mock_resp.content = text.encode()
+    mock_resp.status_code = 200
+    return mock_resp
+
+def test_get_fred_series_cold_then_fresh(mock_requests_get):
+    # The latest quarter has just started, so its observation cannot be out yet
+    latest = pd.Timestamp.today().to_period('Q').start_time
+    previous = (latest - pd.offsets.QuarterBegin(startingMonth=1)).strftime('%Y-%m-%d')
+    mock_requests_get.return_value = make_response(f"""DATE,W006RC1Q027SBEA
+{previous},5000.0
+{latest:%Y-%m-%d},5100.0
+""")
+
+    s = get_fred_series('W006RC1Q027SBEA')
+    assert s.iloc[-1] == 5100.0
+    assert mock_requests_get.call_count == 1
+    assert 'cosd' not in mock_requests_get.call_args[0][0]
+
+    # Second read is served from disk without touching the network
+    s2 = get_fred_series('W006RC1Q027SBEA')
+    assert mock_requests_get.call_count == 1
+    pd.testing.assert_series_equal(s, s2, check_freq=False)
+
+def test_get_fred_series_incremental_refresh(mock_requests_get):
+    mock_requests_get.return_value = make_response("""DATE,GS10
+2024-01-01,4.0
+2024-02-01,4.1
+""")
+    get_fred_series('GS10')
+
+    # Forced refresh only asks for observations from the last cached date
+    mock_requests_get.return_value = make_response("""DATE,GS10
+2024-02-01,4.15
+2024-03-01,4.2
+""")
+    s = get_fred_series('GS10', force=True)
+
+    assert 'cosd=2024-02-01' in mock_requests_get.call_args[0][0]
+    assert list(s.values) == [4.0, 4.15, 4.2]
+
+def test_get_fred_series_missing_values(mock_requests_get):
+    mock_requests_get.return_value = make_response("""DATE,DTWEXBGS
+2024-01-01,120.5
+2024-01-02,.
+""")
+    s = get_fred_series('DTWEXBGS')
+    assert s.iloc[0] == 120.5
+    assert pd.isna(s.iloc[-1])
+
+def test_get_fred_series_failure(mock_requests_get):
+    mock_requests_get.side_effect = Exception("API Down")
+    assert get_fred_series('WALCL') is None
+
+    # With a cached copy, a failed refresh falls back to it
+    mock_requests_get.side_effect = None
+    mock_requests_get.return_value = make_response("""DATE,WALCL
+2024-01-03,7700000.0
+""")
+    get_fred_series('WALCL')
+    mock_requests_get.side_effect = Exception("API Down")
+    assert get_fred_series('WALCL', force=True).iloc[-1] == 7700000.0
+
+def test_is_fresh_quarterly_until_next_release():
+    index = pd.to_datetime(['2024-01-01', '2024-04-01'])
+    s = pd.Series([1.0, 2.0], index=index)
+    assert infer_frequency(index) == 'Q'
+
+    meta = {'frequency': 'Q', 'last_checked': datetime(2024, 7, 20).isoformat()}
+    # Q2 observation cannot be out before Q3 has started
+    assert is_fresh(s, meta, now=datetime(2024, 8, 1)) is True
+    # Revisions are re-checked every RECHECK_INTERVAL, even before the next release
+    assert is_fresh(s, meta, now=datetime(2024, 8, 25)) is False
+    # Checked a moment ago, but the Q3 advance estimate may be out (late October)
+    meta['last_checked'] = datetime(2024, 10, 28).isoformat()
+    assert is_fresh(s, meta, now=datetime(2024, 10, 28, 12)) is True
+    assert is_fresh(s, meta, now=datetime(2024, 10, 29, 12)) is False
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
-from fetch_gdelt_news import fetch_gdelt_mentions
+from fetch_gdelt_news import fetch_gdelt_mentions, fetch_gdelt_timeline, QUERIES
 
 def test_fetch_gdelt_mentions_success(mock_requests_get):
     # Mock JSON response
@@ -30,3 +30,48 @@ def test_fetch_gdelt_mentions_empty(mock_requests_get):
 
     results = fetch_gdelt_mentions()
     assert results["Tariffs"] == []
+
+def test_fetch_gdelt_mentions_includes_free_trade(mock_requests_get):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {}
+    mock_requests_get.return_value = mock_response
+
+    results = fetch_gdelt_mentions()
+    assert set(results) == {"Tariffs", "Protectionism", "Free_Trade"}
+
+def test_fetch_gdelt_timeline_counts(mock_requests_get):
+    mock_json = {
+        "timeline": [{
+            "series": "Article Count",
+            "data": [
+                {"date": "20240101T000000Z", "value": 120, "norm": 50000},
+                {"date": "20240102T000000Z", "value": 95, "norm": 48000}
+            ]
+        }]
+    }
+    mock_response = MagicMock()
+    mock_response.json.return_value = mock_json
+    mock_requests_get.return_value = mock_response
+
+    results = fetch_gdelt_timeline(timespan='7d')
+
+    assert set(results) == set(QUERIES)
+    assert list(results["Free_Trade"].values) == [120.0, 95.0]
+    assert str(results["Tariffs"].index[0]) == "2024-01-01 00:00:00+00:00"
+    params = mock_requests_get.call_args.kwargs['params']
+    assert params['mode'] == 'timelinevolraw'
+    assert params['timespan'] == '7d'
+
+    # Repeat loads for the same window are served from the cache
+    fetch_gdelt_timeline(timespan='7d')
+    assert mock_requests_get.call_count == len(QUERIES)
+
+    # A different window is a different cache entry
+    fetch_gdelt_timeline(timespan='1d')
+    assert mock_requests_get.call_count == 2 * len(QUERIES)
+
+def test_fetch_gdelt_timeline_failure(mock_requests_get):
+    mock_requests_get.side_effect = Exception("Rate limited")
+
+    results = fetch_gdelt_timeline()
+    assert all(series.empty for series in results.values())
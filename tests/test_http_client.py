@@ -0,0 +1,69 @@
+import pytest
+import requests
+from unittest.mock import MagicMock
+import http_client
+
+def make_response(status_code, headers=None):
+    mock_resp = MagicMock()
+    mock_resp.status_code = status_code
+    mock_resp.headers = headers or {}
+    return mock_resp
+
+@pytest.fixture
+def mock_session(mocker):
+    mocker.patch("time.sleep")
+    session = MagicMock()
+    mocker.patch("http_client.get_session", return_value=session)
+    return session
+
+def test_get_retries_rate_limit_then_succeeds(mock_session):
+    mock_session.get.side_effect = [
+        make_response(429, {'Retry-After': '1'}),
+        make_response(503),
+        make_response(200)
+    ]
+
+    response = http_client.get("https://fred.stlouisfed.org/graph/fredgraph.csv?id=GS10")
+
+    assert response.status_code == 200
+    assert mock_session.get.call_count == 3
+    # Every attempt is bounded by the default timeouts
+    assert mock_session.get.call_args.kwargs['timeout'] == http_client.DEFAULT_TIMEOUT
+
+def test_get_returns_last_error_response_after_retries(mock_session):
+    mock_session.get.return_value = make_response(500)
+
+    response = http_client.get("https://api.worldbank.org/v2/country/USA", max_retries=2)
+
+    assert response.status_code == 500
+    assert mock_session.get.call_count == 3
+
+def test_get_raises_after_repeated_timeouts(mock_session):
+    mock_session.get.side_effect = requests.Timeout("stalled")
+
+    with pytest.raises(requests.Timeout):
+        http_client.get("https://api.gdeltproject.org/api/v2/doc/doc", max_retries=1)
+    assert mock_session.get.call_count == 2
+
+def test_backoff_delay_is_jittered_and_bounded():
+    for attempt in range(10):
+        delay = http_client.backoff_delay(attempt)
+        assert 0 <= delay <= http_client.BACKOFF_MAX
+    assert http_client.backoff_delay(0, retry_after='2') == 2.0
+
+def test_shared_session_is_pooled():
+    http_client.reset_session()
+    session = http_client.get_session()
+    assert session is http_client.get_session()
+    assert 'gzip' in session.headers['Accept-Encoding']
+    http_client.reset_session()
+
+def test_patched_requests_get_is_used_instead_of_the_session(mocker, mock_session):
+    # Tests written against requests.get must keep intercepting every fetcher's requests
+    mock_get = mocker.patch("requests.get", return_value=make_response(200))
+
+    response = http_client.get("https://api.worldbank.org/v2/country/USA", params={'format': 'json'})
+
+    assert response.status_code == 200
+    mock_get.assert_called_once_with("https://api.worldbank.org/v2/country/USA", params={'format': 'json'})
+    assert not mock_session.get.called
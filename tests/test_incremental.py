@@ -0,0 +1,104 @@
+import pytest
+import numpy as np
+import pandas as pd
+import incremental
+from incremental import first_changed_position, recompute_incremental, update_kpis, load_state, read_outputs
+from fetch_fiscal_data import build_fiscal_frame, build_fiscal_panels, SERIES_MAP
+
+def yoy(frame):
+    out = frame.copy()
+    out['YoY'] = frame['level'].pct_change(periods=4)
+    return out
+
+def make_inputs(values, start='2020-01-01'):
+    return pd.DataFrame({'level': values}, index=pd.date_range(start, periods=len(values), freq='QS'))
+
+def test_first_changed_position():
+    prev = make_inputs([1.0, 2.0, np.nan])
+    assert first_changed_position(prev, make_inputs([1.0, 2.0, np.nan])) is None
+    assert first_changed_position(prev, make_inputs([1.0, 2.0, np.nan, 4.0])) == 3
+    assert first_changed_position(prev, make_inputs([1.0, 2.5, np.nan, 4.0])) == 1
+
+def test_recompute_incremental_matches_full_and_only_touches_tail():
+    prev_inputs = make_inputs(list(np.arange(1.0, 41.0)))
+    prev_outputs = yoy(prev_inputs)
+
+    # One revised and one new quarter
+    values = list(np.arange(1.0, 42.0))
+    values[39] = 45.0
+    new_inputs = make_inputs(values)
+
+    seen = []
+    def tracking_yoy(frame):
+        seen.append(len(frame))
+        return yoy(frame)
+
+    result = recompute_incremental(prev_inputs, prev_outputs, new_inputs, tracking_yoy, lookback=4)
+
+    pd.testing.assert_frame_equal(result, yoy(new_inputs), check_freq=False)
+    # Revised row 39 plus its 4-quarter window, plus the new row
+    assert seen == [6]
+
+def test_update_kpis_persists_state():
+    update_kpis('test_yoy', make_inputs([1.0, 2.0, 3.0, 4.0, 5.0]), yoy, lookback=4)
+    state = load_state('test_yoy')
+    assert state['rows'] == 5
+    pd.testing.assert_frame_equal(read_outputs('test_yoy', state['layout'], 5),
+                                  yoy(make_inputs([1.0, 2.0, 3.0, 4.0, 5.0])), check_freq=False)
+
+    result = update_kpis('test_yoy', make_inputs([1.0, 2.0, 3.0, 4.0, 5.0, 6.0]), yoy, lookback=4)
+    assert result['YoY'].iloc[-1] == pytest.approx(6.0 / 2.0 - 1)
+
+def test_update_kpis_writes_only_from_the_first_change(mocker):
+    values = list(np.arange(1.0, 101.0))
+    update_kpis('test_tail', make_inputs(values), yoy, lookback=4)
+    write = mocker.spy(incremental, 'write_outputs')
+
+    # A new quarter and a revision: only the rows from the revision on are written
+    values[97] = 200.0
+    result = update_kpis('test_tail', make_inputs(values + [101.0]), yoy, lookback=4)
+    pd.testing.assert_frame_equal(result, yoy(make_inputs(values + [101.0])), check_freq=False)
+    assert write.call_args[0][2] == 97 and len(write.call_args[0][1]) == 4
+
+    # A different history is recomputed in full
+    result = update_kpis('test_tail', make_inputs(values, start='2019-01-01'), yoy, lookback=4)
+    assert write.call_args[0][2] == 0
+    pd.testing.assert_frame_equal(result, yoy(make_inputs(values, start='2019-01-01')), check_freq=False)
+
+def test_fiscal_panels_incremental_matches_full():
+    quarters = pd.date_range('2010-01-01', periods=40, freq='QS')
+    weeks = pd.date_range('2010-01-06', periods=520, freq='W-WED')
+    rng = np.random.default_rng(1)
+
+    full_history = {name: pd.Series(rng.uniform(100, 200, 40), index=quarters)
+                    for name in SERIES_MAP if name != 'FedBalanceSheet'}
+    full_history['FedBalanceSheet'] = pd.Series(rng.uniform(1e6, 8e6, 520), index=weeks)
+
+    def inputs(n_quarters, n_weeks):
+        data = {name: s.iloc[:n_quarters] for name, s in full_history.items() if name != 'FedBalanceSheet'}
+        data['FedBalanceSheet'] = full_history['FedBalanceSheet'].iloc[:n_weeks]
+        return data
+
+    build_fiscal_panels(inputs(39, 515))
+    newer = inputs(40, 520)
+
+    incremental = build_fiscal_panels(newer)
+    full = build_fiscal_panels(newer, incremental=False)
+
+    pd.testing.assert_frame_equal(incremental['quarterly'], full['quarterly'], check_freq=False)
+    pd.testing.assert_frame_equal(incremental['weekly'], full['weekly'], check_freq=False)
+
+def test_fiscal_revision_deep_in_history_matches_full():
+    quarters = pd.date_range('2000-01-01', periods=100, freq='QS')
+    weeks = pd.date_range('2000-01-05', periods=1300, freq='W-WED')
+    rng = np.random.default_rng(2)
+    data = {name: pd.Series(rng.uniform(100, 200, 100), index=quarters)
+            for name in SERIES_MAP if name != 'FedBalanceSheet'}
+    data['FedBalanceSheet'] = pd.Series(rng.uniform(1e6, 8e6, 1300), index=weeks)
+    build_fiscal_frame(data)
+
+    # A comprehensive revision of Revenue 10 to 20 quarters before the end
+    data['Revenue'] = data['Revenue'].copy()
+    data['Revenue'].iloc[80:90] *= 1.05
+    incremental_frame = build_fiscal_frame(data)
+    pd.testing.assert_frame_equal(incremental_frame, build_fiscal_frame(data, incremental=False), check_freq=False)
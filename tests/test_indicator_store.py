@@ -0,0 +1,74 @@
+import os
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+import indicator_store
+from indicator_store import append_series, read_series, last_date, list_series
+from fred_cache import get_fred_series
+from fetch_tic_data import fetch_tic_data
+
+def test_append_only_new_observations():
+    s = pd.Series([1.0, 2.0, 3.0], index=pd.to_datetime(['2024-01-01', '2024-02-01', '2024-03-01']))
+    assert append_series('fred', 'GS10', s) == 3
+
+    # Overlapping history is ignored; existing rows are never rewritten
+    update = pd.Series([99.0, 4.0], index=pd.to_datetime(['2024-03-01', '2024-04-01']))
+    assert append_series('fred', 'GS10', update) == 1
+
+    stored = read_series('fred', 'GS10')
+    assert list(stored.values) == [1.0, 2.0, 3.0, 4.0]
+    assert last_date('fred', 'GS10') == pd.Timestamp('2024-04-01')
+
+def test_append_after_interrupted_write_keeps_rows_aligned():
+    s = pd.Series([1.0, 2.0], index=pd.to_datetime(['2024-01-01', '2024-02-01']))
+    append_series('fred', 'GS10', s)
+
+    # A crash between the two column writes leaves a value (and half of another) without a date
+    values_path = os.path.join(indicator_store._series_dir('fred', 'GS10'), indicator_store.VALUES_FILE)
+    with open(values_path, 'ab') as f:
+        f.write(np.array([99.0], dtype='f8').tobytes() + b'\x00' * 3)
+
+    append_series('fred', 'GS10', pd.Series([3.0], index=pd.to_datetime(['2024-03-01'])))
+    stored = read_series('fred', 'GS10')
+    assert list(stored.values) == [1.0, 2.0, 3.0]
+    assert stored.index[-1] == pd.Timestamp('2024-03-01')
+
+def test_read_series_date_range_and_memory_map():
+    index = pd.date_range('2000-01-01', periods=10000, freq='D')
+    append_series('yahoo', '^TNX', pd.Series(np.arange(10000, dtype=float), index=index))
+
+    window = read_series('yahoo', '^TNX', start='2010-01-01', end='2010-01-31')
+    assert len(window) == 31
+    assert window.index[0] == pd.Timestamp('2010-01-01')
+    assert list_series('yahoo') == ['^TNX']
+
+def test_read_missing_series_is_empty():
+    assert read_series('worldbank', 'USA.NY.GDP.MKTP.CD').empty
+    assert last_date('worldbank', 'USA.NY.GDP.MKTP.CD') is None
+
+def test_fred_fetch_appends_to_store(mock_requests_get):
+    mock_resp = MagicMock()
+    mock_resp.content = b"DATE,WALCL\n2024-01-03,7700000.0\n2024-01-10,7690000.0\n"
+    mock_requests_get.return_value = mock_resp
+
+    get_fred_series('WALCL')
+
+    assert list(read_series('fred', 'WALCL').values) == [7700000.0, 7690000.0]
+
+def test_tic_fetch_appends_dated_rows(mock_requests_get):
+    mock_resp = MagicMock()
+    mock_resp.iter_lines.return_value = """
+                      2024   2024
+    Country            Feb    Jan
+    China, Mainland  797.7  800.1
+    Japan           1150.5 1100.1
+    """.splitlines()
+    mock_requests_get.return_value = mock_resp
+
+    fetch_tic_data()
+
+    china = read_series('tic', 'China, Mainland')
+    assert list(china.index) == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-02-01')]
+    assert list(china.values) == [800.1, 797.7]
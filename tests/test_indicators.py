@@ -0,0 +1,76 @@
+import pandas as pd
+from unittest.mock import MagicMock
+from indicators import REGISTRY, INDICATORS, Indicator, plan_requests, series_map
+from fetch_all_data import build_task_graph, run_task_graph, request_tasks
+import fetch_fiscal_data
+import market_data
+
+def test_registry_names_are_unique_and_modules_resolve_through_it():
+    assert len(INDICATORS) == len(REGISTRY)
+    assert fetch_fiscal_data.SERIES_MAP == series_map('module_1', 'fred')
+    assert sorted(market_data.ALL_TICKERS) == sorted(i.series_id for i in REGISTRY if i.source == 'yahoo')
+
+def test_plan_collapses_shared_series_and_batches_sources(mocker):
+    registry = REGISTRY + [
+        Indicator('GS10_Copy', 'module_3', 'fred', 'GS10', (), "Same series, second consumer"),
+        Indicator('India_GDP', 'module_3', 'worldbank', 'NY.GDP.MKTP.CD', ('IND',), "Extra country")
+    ]
+    mocker.patch('indicators.REGISTRY', registry)
+    mocker.patch('indicators.INDICATORS', {i.name: i for i in registry})
+
+    plan = plan_requests()
+
+    assert plan.routes['GS10_Copy'] == plan.routes['Yield10Y'] == 'fred:GS10'
+    assert plan.requests['fred:GS10'].indicators == ('Yield10Y', 'GS10_Copy')
+    wb = plan.requests['worldbank']
+    assert wb.series_ids.count('NY.GDP.MKTP.CD') == 1
+    assert set(wb.countries) == {'USA', 'CHN', 'IND'}
+    assert sum(1 for r in plan.requests.values() if r.source == 'yahoo') == 1
+
+def test_gdelt_indicators_sharing_a_query_keep_their_own_query(mocker):
+    registry = list(REGISTRY)
+    position = registry.index(INDICATORS['Tariffs']) + 1
+    registry.insert(position, Indicator('Tariffs_Copy', 'module_4', 'gdelt', 'tariffs', (), "Same query, second consumer"))
+    mocker.patch('indicators.REGISTRY', registry)
+    mocker.patch('indicators.INDICATORS', {i.name: i for i in registry})
+    mock_mentions = mocker.patch('fetch_all_data.fetch_gdelt_mentions', return_value={})
+
+    request = plan_requests().requests['gdelt']
+    tasks = request_tasks('gdelt', request)
+    tasks['gdelt:mentions'][0]()
+
+    assert request.series_ids.count('tariffs') == 1
+    queries = mock_mentions.call_args[0][0]
+    assert queries == {i.name: i.series_id for i in registry if i.source == 'gdelt'}
+    assert queries['Tariffs_Copy'] == queries['Tariffs'] == 'tariffs'
+
+def test_plan_for_a_subset():
+    plan = plan_requests(['Revenue', 'Gold', 'Oil'])
+    assert set(plan.requests) == {'fred:W006RC1Q027SBEA', 'yahoo'}
+    assert plan.requests['yahoo'].series_ids == ('GC=F', 'CL=F')
+
+def test_full_refresh_makes_one_call_per_planned_request(mock_requests_get, mock_yfinance_download):
+    def side_effect(url, *args, **kwargs):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        if 'fredgraph.csv' in url:
+            mock_resp.content = b"DATE,X\n2024-01-01,1.0\n"
+        elif 'worldbank' in url:
+            mock_resp.json.return_value = [{"page": 1, "pages": 1}, []]
+        else:
+            mock_resp.iter_lines.return_value = []
+            mock_resp.json.return_value = {}
+        return mock_resp
+
+    mock_requests_get.side_effect = side_effect
+    mock_yfinance_download.return_value = pd.DataFrame({('Close', t): [1.0] for t in market_data.ALL_TICKERS})
+
+    plan = plan_requests()
+    results = run_task_graph(build_task_graph())
+
+    urls = [call.args[0] for call in mock_requests_get.call_args_list]
+    fred_requests = [key for key in plan.requests if key.startswith('fred:')]
+    assert sum('fredgraph.csv' in url for url in urls) == len(fred_requests)
+    assert sum('worldbank' in url for url in urls) == 1
+    assert mock_yfinance_download.call_count == 1
+    assert results['module_2']['Dollar_Index'] == 1.0
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+import numpy as np
+import pandas as pd
+from market_data import ALL_TICKERS, get_close, clear_cache, cache_frame
+from fetch_energy_money import fetch_energy_money
+from fetch_module_2_data import fetch_neutral_assets
+from fetch_module_3_data import fetch_energy_money_data, fetch_commodity_prices
+
+def make_close_frame(tickers, rows):
+    columns = pd.MultiIndex.from_tuples([('Close', t) for t in tickers], names=['Price', 'Ticker'])
+    return pd.DataFrame(rows, columns=columns)
+
+def test_single_download_serves_every_module(mock_yfinance_download):
+    prices = {'CL=F': 75.0, '^TNX': 4.2, 'HG=F': 4.0, 'ZW=F': 5.5, 'ZC=F': 4.5, 'GC=F': 2000.0, 'BTC-USD': 60000.0}
+    mock_yfinance_download.return_value = make_close_frame(list(prices), [list(prices.values())])
+
+    energy = fetch_energy_money()
+    energy_m3 = fetch_energy_money_data()
+    commodities = fetch_commodity_prices()
+    neutral = fetch_neutral_assets()
+
+    assert mock_yfinance_download.call_count == 1
+    assert sorted(mock_yfinance_download.call_args[0][0]) == sorted(ALL_TICKERS)
+
+    assert energy == energy_m3
+    assert commodities['HG=F'] == 4.0
+    assert list(neutral.columns) == ['GC=F', 'BTC-USD']
+
+def test_clear_cache_forces_new_download(mock_yfinance_download):
+    mock_yfinance_download.return_value = make_close_frame(['CL=F', '^TNX'], [[70.0, 4.0]])
+
+    get_close(['CL=F'])
+    clear_cache()
+    get_close(['CL=F'])
+
+    assert mock_yfinance_download.call_count == 2
+
+def test_get_close_drops_tickers_yahoo_did_not_return(mock_yfinance_download):
+    mock_yfinance_download.return_value = make_close_frame(['CL=F'], [[70.0]])
+
+    data = get_close(['CL=F', '^TNX'])
+    assert list(data.columns) == ['CL=F']
+    # Module 3 treats the incomplete frame as invalid
+    assert fetch_energy_money_data() is None
+
+def test_weekend_bitcoin_rows_carry_futures_forward(mock_yfinance_download):
+    # Friday, then a weekend on which only BTC-USD traded
+    frame = make_close_frame(['GC=F', 'BTC-USD', 'HG=F'], [[2000.0, 60000.0, 4.0],
+                                                           [np.nan, 61000.0, np.nan],
+                                                           [np.nan, 62000.0, np.nan]])
+    frame.index = pd.date_range('2024-06-07', periods=3, freq='D')
+    mock_yfinance_download.return_value = frame
+
+    neutral = fetch_neutral_assets()
+    assert neutral['GC=F'].tolist() == [2000.0] * 3 and neutral['BTC-USD'].iloc[-1] == 62000.0
+    assert fetch_commodity_prices()['HG=F'] == 4.0
+    assert len(get_close(['HG=F'])) == 1
+
+def test_frame_cache_stays_usable_during_a_download(mock_yfinance_download):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_download(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return make_close_frame(['CL=F'], [[70.0]])
+
+    mock_yfinance_download.side_effect = slow_download
+    worker = threading.Thread(target=get_close, args=(['CL=F'],))
+    worker.start()
+    assert started.wait(5)
+
+    # Neither needs the download to finish
+    cache_frame(['^TNX'], make_close_frame(['^TNX'], [[4.0]])['Close'])
+    assert get_close(['^TNX'])['^TNX'].iloc[-1] == 4.0
+    release.set()
+    worker.join(5)
+    assert mock_yfinance_download.call_count == 1
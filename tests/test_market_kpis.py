@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from market_kpis import ffill_columns, align_prices, energy_money_series, neutral_asset_series, commodity_series
+
+def test_ffill_columns_matches_pandas():
+    values = np.array([
+        [np.nan, 1.0],
+        [2.0, np.nan],
+        [np.nan, np.nan],
+        [4.0, 5.0]
+    ])
+    expected = pd.DataFrame(values).ffill().to_numpy()
+    np.testing.assert_array_equal(ffill_columns(values), expected)
+
+def test_align_prices_fills_non_trading_days():
+    index = pd.to_datetime(['2024-01-05', '2024-01-06', '2024-01-07', '2024-01-08'])
+    close = pd.DataFrame({
+        'GC=F': [2050.0, np.nan, np.nan, 2060.0],   # No gold futures on the weekend
+        'BTC-USD': [44000.0, 43800.0, 43900.0, 47000.0]
+    }, index=index)
+
+    aligned = align_prices(close, ['GC=F', 'BTC-USD'])
+    assert list(aligned['GC=F']) == [2050.0, 2050.0, 2050.0, 2060.0]
+
+def test_energy_money_series_full_history():
+    index = pd.date_range('2024-01-01', periods=3, freq='D')
+    close = pd.DataFrame({'CL=F': [70.0, np.nan, 75.0], '^TNX': [4.0, 4.1, 4.2]}, index=index)
+
+    kpis = energy_money_series(close)
+
+    assert len(kpis) == 3
+    assert kpis['Oil_Price'].iloc[1] == 70.0
+    assert kpis['10Y_Yield'].iloc[-1] == 0.042
+    expected_bond_price = 100 / ((1.042) ** 10)
+    assert kpis['Bond_Price'].iloc[-1] == expected_bond_price
+    assert kpis['Energy_Value'].iloc[-1] == expected_bond_price / 75.0
+
+def test_energy_money_series_scales_to_multi_decade_history():
+    index = pd.date_range('1980-01-01', periods=16000, freq='D')
+    rng = np.random.default_rng(0)
+    close = pd.DataFrame({'CL=F': rng.uniform(20, 120, 16000), '^TNX': rng.uniform(1, 15, 16000)}, index=index)
+
+    kpis = energy_money_series(close)
+    assert len(kpis) == 16000
+    assert not kpis.isna().any().any()
+
+def test_neutral_and_commodity_series():
+    index = pd.date_range('2024-01-01', periods=2, freq='D')
+    close = pd.DataFrame({
+        'GC=F': [2000.0, 2200.0], 'BTC-USD': [40000.0, 44000.0],
+        'HG=F': [4.0, 5.0], 'ZW=F': [6.0, 6.0], 'ZC=F': [4.5, 4.5]
+    }, index=index)
+
+    neutral = neutral_asset_series(close)
+    assert neutral['Bitcoin_Gold_Ratio'].iloc[-1] == 20.0
+    assert neutral['Gold_Index'].iloc[-1] == pytest.approx(110.0)
+
+    commodities = commodity_series(close)
+    assert commodities['Copper'].iloc[-1] == 5.0
+    assert commodities['Copper_Index'].iloc[-1] == pytest.approx(125.0)
@@ -0,0 +1,99 @@
+import json
+import urllib.request
+from datetime import datetime
+
+import pytest
+import pandas as pd
+import requests
+from unittest.mock import MagicMock
+import metrics
+import http_client
+from fred_cache import get_fred_series
+from market_data import get_close
+from world_bank import fetch_wb_panel
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+def samples(name, **labels):
+    return [s for s in metrics.snapshot().get(name, [])
+            if all(s['labels'].get(k) == str(v) for k, v in labels.items())]
+
+def test_http_client_records_latency_retries_and_bytes(mocker):
+    mocker.patch("time.sleep")
+    session = MagicMock()
+    mocker.patch("http_client.get_session", return_value=session)
+    ok = MagicMock(status_code=200, headers={}, content=b"DATE,GS10\n2024-01-01,4.0")
+    session.get.side_effect = [requests.ConnectionError("reset"), MagicMock(status_code=503, headers={}), ok]
+
+    http_client.get("https://fred.stlouisfed.org/graph/fredgraph.csv?id=GS10")
+
+    assert samples('polydash_retries_total', source='fred')[0]['value'] == 2
+    assert samples('polydash_requests_total', source='fred', status=503)[0]['value'] == 1
+    assert samples('polydash_response_bytes_total', source='fred', series='GS10')[0]['value'] == len(ok.content)
+    assert samples('polydash_request_seconds', source='fred', series='GS10')[0]['count'] == 1
+
+def test_fred_cache_hits_misses_and_errors(mock_requests_get):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.content = f"DATE,WALCL\n{datetime.now():%Y-%m-%d},7300.0".encode()
+    mock_requests_get.return_value = mock_resp
+
+    get_fred_series('WALCL')
+    get_fred_series('WALCL')
+    mock_requests_get.side_effect = requests.HTTPError("404")
+    get_fred_series('MISSING')
+
+    assert samples('polydash_cache_total', source='fred', series='WALCL', result='miss')[0]['value'] == 1
+    assert samples('polydash_cache_total', source='fred', series='WALCL', result='hit')[0]['value'] == 1
+    assert samples('polydash_parse_seconds', source='fred', series='WALCL')[0]['count'] == 1
+    assert samples('polydash_errors_total', source='fred', series='MISSING')[0]['value'] == 1
+
+def test_yahoo_frame_cache_hits_and_misses(mock_yfinance_download):
+    columns = pd.MultiIndex.from_tuples([('Close', 'CL=F'), ('Close', '^TNX')], names=['Price', 'Ticker'])
+    mock_yfinance_download.return_value = pd.DataFrame([[70.0, 4.0]], columns=columns)
+
+    get_close(['CL=F'])
+    get_close(['^TNX'])
+    get_close(['CL=F'])
+
+    assert mock_yfinance_download.call_count == 1
+    assert samples('polydash_cache_total', source='yahoo', result='miss')[0]['value'] == 1
+    assert samples('polydash_cache_total', source='yahoo', result='hit')[0]['value'] == 2
+
+def test_world_bank_parse_time_includes_json_decoding(mock_requests_get):
+    response = MagicMock(status_code=200)
+    response.json.side_effect = ValueError("truncated body")
+    mock_requests_get.return_value = response
+
+    assert fetch_wb_panel(['NY.GDP.MKTP.CD'], ['USA']) is None
+    assert samples('polydash_parse_seconds', source='worldbank')[0]['count'] == 1
+
+def test_prometheus_text_and_http_endpoint():
+    metrics.inc('polydash_errors_total', source='tic')
+    metrics.observe('polydash_parse_seconds', 0.2, source='tic')
+
+    text = metrics.to_prometheus()
+    assert '# TYPE polydash_errors_total counter' in text
+    assert 'polydash_errors_total{source="tic"} 1' in text
+    assert 'polydash_parse_seconds_bucket{source="tic",le="0.1"} 0' in text
+    assert 'polydash_parse_seconds_bucket{source="tic",le="0.25"} 1' in text
+    assert 'polydash_parse_seconds_count{source="tic"} 1' in text
+
+    server = metrics.start_http_server(port=0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json") as response:
+            data = json.load(response)
+        assert data['polydash_errors_total'][0] == {'labels': {'source': 'tic'}, 'value': 1}
+    finally:
+        server.shutdown()
+
+def test_structured_log_events(caplog):
+    with caplog.at_level('WARNING', logger='polydash'):
+        metrics.record_error('worldbank', ValueError("Invalid value"))
+    event = json.loads(caplog.records[-1].getMessage())
+    assert event == {'event': 'fetch_error', 'source': 'worldbank', 'error': 'ValueError', 'message': 'Invalid value'}
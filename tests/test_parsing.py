@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+import parsing
+from parsing import read_fred_csv, world_bank_columns, timeline_arrays
+
+ENGINES = ['c'] + (['pyarrow'] if parsing.pa is not None else [])
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_read_fred_csv_typed_with_missing_marker(engine):
+    body = b"observation_date,DTWEXBGS\n2024-01-02,120.5\n2024-01-03,.\n2024-01-04,121\n"
+    s = read_fred_csv(body, engine=engine)
+
+    assert s.dtype == 'float64'
+    assert s.index.name == 'DATE'
+    assert list(s.index) == list(pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04']))
+    assert s.iloc[0] == 120.5 and np.isnan(s.iloc[1]) and s.iloc[2] == 121.0
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_read_fred_csv_engines_agree_and_accept_text(engine):
+    text = "DATE,X\n2024-01-01 06:00:00,1.5\n2024-01-02,\n"
+    pd.testing.assert_series_equal(read_fred_csv(text, engine=engine), read_fred_csv(text.encode(), engine='c'))
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_read_fred_csv_unknown_marker_falls_back_to_nan(engine):
+    s = read_fred_csv(b"DATE,X\n2024-01-01,1.0\n2024-02-01,ND\n", engine=engine)
+    assert s.iloc[0] == 1.0 and np.isnan(s.iloc[1])
+
+def test_world_bank_columns_are_typed():
+    entries = [
+        {"indicator": {"id": "NY.GDP.MKTP.CD"}, "countryiso3code": "USA", "date": "2023", "value": 2.5e13},
+        {"indicator": {"id": "NY.GDP.MKTP.CD"}, "countryiso3code": "USA", "date": "2022", "value": None},
+        {"indicator": {"id": "NY.GDP.MKTP.CD"}, "countryiso3code": "USA", "date": "", "value": 1.0}
+    ]
+    columns = world_bank_columns(entries, ['NY.GDP.MKTP.CD'], ['USA'])
+
+    assert columns['year'].dtype == 'int64' and list(columns['year']) == [2023, 2022]
+    assert columns['value'].dtype == 'float64' and np.isnan(columns['value'][1])
+
+def test_timeline_arrays():
+    data = {"timeline": [{"data": [{"date": "20240628T120000Z", "value": 3}, {"date": "20240628T121500Z", "value": 5}]}]}
+    index, values = timeline_arrays(data)
+
+    assert index[1] == pd.Timestamp('2024-06-28 12:15', tz='UTC')
+    assert values.dtype == 'float64' and list(values) == [3.0, 5.0]
+    assert len(timeline_arrays({})[1]) == 0
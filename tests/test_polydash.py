@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+import polydash
+
+REPO_ROOT = os.path.dirname(os.path.abspath(polydash.__file__))
+
+def test_fetch_imports_only_what_the_target_uses():
+    # Fresh interpreter, so modules already imported by the test session do not count
+    code = ("import sys, polydash; polydash.load('fetch_gdelt_news', 'fetch_gdelt_mentions'); "
+            "print(sorted(m for m in ('pandas', 'yfinance', 'dash') if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=REPO_ROOT)
+    assert out.stdout.strip() == '[]'
+
+def test_market_data_defers_yfinance():
+    code = "import sys, fetch_module_2_data; print('yfinance' in sys.modules)"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=REPO_ROOT)
+    assert out.stdout.strip() == 'False'
+
+def test_fetch_command_prints_result(mock_requests_get, capsys):
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = {"articles": [{"title": "Tariffs rise"}]}
+    mock_requests_get.return_value = mock_resp
+
+    assert polydash.main(['fetch', 'gdelt', '--timings']) == 0
+
+    captured = capsys.readouterr()
+    result = json.loads(captured.out[captured.out.index('{'):])
+    assert result['Tariffs'] == [{"title": "Tariffs rise"}]
+    assert 'imports' in captured.err and 'fetch' in captured.err
+
+def test_measure_import_reports_packages():
+    report = polydash.measure_import('fetch_tic_data')
+    assert report['total'] > 0
+    assert 'pandas' in report['packages']
+    assert 'yfinance' not in report['packages']
+
+def test_unknown_fetch_target():
+    with pytest.raises(SystemExit):
+        polydash.main(['fetch', 'nope'])
+
+def test_serve_runs_a_single_refresher(monkeypatch):
+    import app
+    monkeypatch.setattr(app.refresher, 'build', lambda: None)
+    monkeypatch.setattr(app.refresher, 'interval', 3600)
+
+    def run(**kwargs):
+        # The first request would start the refresher too
+        app.server.test_client().get('/metrics.json')
+
+    monkeypatch.setattr(app.app, 'run', run)
+    try:
+        assert polydash.main(['serve']) == 0
+        threads = [t for t in threading.enumerate() if t.name == 'snapshot-refresher' and t.is_alive()]
+        assert len(threads) == 1
+    finally:
+        app.refresher.stop(timeout=5)
@@ -0,0 +1,86 @@
+import threading
+
+from unittest.mock import MagicMock
+import resilience
+from resilience import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from fetch_all_data import request_tasks
+from indicators import plan_requests
+
+def test_failure_serves_last_good_value_from_disk(monkeypatch):
+    assert resilience.fetch('fred:GS10', 'fred', lambda: 4.2) == (4.2, 0.0, False)
+    monkeypatch.setattr(resilience, 'REVALIDATE_SECONDS', 0)
+
+    # A restarted process reads the last good value back from the cache dir
+    resilience.reset()
+    value, age, stale = resilience.fetch('fred:GS10', 'fred', lambda: None)
+    assert value == 4.2 and age >= 0
+    assert resilience.wait_idle(timeout=5)
+    # The failed revalidation flags the value from the next fetch on
+    assert resilience.fetch('fred:GS10', 'fred', lambda: None).stale
+    assert resilience.stale_keys().keys() == {'fred:GS10'}
+
+    assert resilience.fetch('fred:GS2', 'fred', lambda: None) == (None, None, False)
+
+def test_slow_call_does_not_hold_up_the_last_good_value(monkeypatch):
+    resilience.fetch('tic', 'tic', lambda: 'old')
+    release = threading.Event()
+
+    def slow():
+        release.wait()
+        return 'new'
+
+    # Young values are served without a call at all
+    func = MagicMock(return_value='new')
+    assert resilience.fetch('tic', 'tic', func).value == 'old'
+    func.assert_not_called()
+
+    monkeypatch.setattr(resilience, 'REVALIDATE_SECONDS', 0)
+    result = resilience.fetch('tic', 'tic', slow)
+    assert result.value == 'old' and not result.stale
+
+    release.set()
+    assert resilience.wait_idle(timeout=5)
+    assert resilience.last_good('tic')[0] == 'new'
+
+def test_circuit_opens_after_repeated_failures_and_probes_once():
+    breaker = CircuitBreaker('gdelt', threshold=2, open_seconds=60)
+    breaker.record_failure(now=0)
+    assert breaker.state(now=0) == CLOSED
+    breaker.record_failure(now=0)
+    assert breaker.state(now=10) == OPEN and not breaker.allow(now=10)
+
+    assert breaker.state(now=61) == HALF_OPEN
+    assert breaker.allow(now=61) and not breaker.allow(now=61)
+    breaker.record_failure(now=61)
+    assert breaker.state(now=100) == OPEN
+
+    breaker.record_success()
+    assert breaker.state() == CLOSED and breaker.allow()
+
+def test_open_circuit_skips_the_source(monkeypatch):
+    resilience.fetch('yahoo', 'yahoo', lambda: 'frame')
+    monkeypatch.setattr(resilience, 'REVALIDATE_SECONDS', 0)
+    for _ in range(resilience.FAILURE_THRESHOLD):
+        resilience.fetch('yahoo', 'yahoo', lambda: None)
+        assert resilience.wait_idle(timeout=5)
+
+    func = MagicMock(return_value='fresh')
+    result = resilience.fetch('yahoo', 'yahoo', func)
+    assert result.value == 'frame' and result.stale
+    func.assert_not_called()
+
+def test_throttled_gdelt_leaf_serves_last_good_articles(mock_requests_get, monkeypatch):
+    response = MagicMock()
+    response.json.return_value = {"articles": [{"title": "Tariffs rise"}]}
+    mock_requests_get.return_value = response
+    request = plan_requests(['Tariffs']).requests['gdelt']
+    leaf, _ = request_tasks('gdelt', request)['gdelt:mentions']
+    assert leaf()['Tariffs'] == [{"title": "Tariffs rise"}]
+
+    # Every query failing comes back as empty lists, which must not replace the articles
+    monkeypatch.setattr(resilience, 'REVALIDATE_SECONDS', 0)
+    mock_requests_get.side_effect = ConnectionError("429 Too Many Requests")
+    assert leaf()['Tariffs'] == [{"title": "Tariffs rise"}]
+    assert resilience.wait_idle(timeout=5)
+    assert leaf()['Tariffs'] == [{"title": "Tariffs rise"}]
+    assert 'gdelt:mentions' in resilience.stale_keys()
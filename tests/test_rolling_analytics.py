@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import rolling_analytics
+from rolling_analytics import AnalyticsEngine, update_analytics, compute_analytics, metric_columns
+from indicator_store import append_series
+from indicators import INDICATORS
+from snapshots import from_modules
+
+SPEC = {
+    'module': 'module_2',
+    'freq': 'D',
+    'aggregations': {'A': 'last', 'B': 'last'},
+    'window': 20,
+    'lag': 5,
+    'correlation_window': 10,
+    'pairs': {'A_B': ('A', 'B')}
+}
+
+def make_panel(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='D')
+    panel = pd.DataFrame({name: 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))) for name in 'AB'}, index=index)
+    panel.iloc[:15, 1] = np.nan   # B starts later
+    panel.iloc[60, 0] = np.nan    # A has a gap
+    return panel
+
+def stream(engine, panel):
+    rows = [engine.update(row) for row in panel.to_dict('records')]
+    return pd.DataFrame(rows, index=panel.index, columns=metric_columns(engine.spec))
+
+def test_streaming_matches_vectorized_backfill_and_pandas():
+    panel = make_panel()
+    batch = AnalyticsEngine(SPEC).backfill(panel)
+
+    pd.testing.assert_frame_equal(stream(AnalyticsEngine(SPEC), panel), batch, atol=1e-9)
+
+    b = panel['B'].dropna()
+    expected = ((b - b.rolling(20).mean()) / b.rolling(20).std()).reindex(panel.index)
+    pd.testing.assert_series_equal(batch['B_ZScore'], expected, check_names=False, atol=1e-9)
+    pd.testing.assert_series_equal(batch['B_Drawdown'].dropna(), (b / b.rolling(20).max() - 1).dropna(),
+                                   check_names=False, atol=1e-12)
+    assert batch['A_B_Correlation'].dropna().between(-1, 1).all()
+
+def test_backfill_primes_streaming_state():
+    panel = make_panel()
+    engine = AnalyticsEngine(SPEC)
+    engine.backfill(panel.iloc[:80])
+
+    tail = stream(engine, panel.iloc[80:])
+
+    pd.testing.assert_frame_equal(tail, AnalyticsEngine(SPEC).backfill(panel).iloc[80:], atol=1e-9)
+
+def test_update_analytics_streams_appended_rows_and_backfills_revisions(mocker):
+    panel = make_panel()
+    backfill = mocker.spy(AnalyticsEngine, 'backfill')
+
+    update_analytics('test', panel.iloc[:100], SPEC)
+    write = mocker.spy(rolling_analytics, 'write_outputs')
+    appended = update_analytics('test', panel, SPEC)
+    assert backfill.call_count == 1
+    # Only the metrics of the appended rows are written
+    assert write.call_args[0][2] == 100 and len(write.call_args[0][1]) == 20
+    pd.testing.assert_frame_equal(appended, AnalyticsEngine(SPEC).backfill(panel), atol=1e-9)
+
+    assert update_analytics('test', panel, SPEC).equals(appended)
+    assert backfill.call_count == 2  # One was the reference backfill above
+
+    # The last saved row changed: the panel is backfilled
+    revised = panel.copy()
+    revised.iloc[-1, 0] *= 1.1
+    update_analytics('test', revised, SPEC)
+    assert backfill.call_count == 3
+
+def test_compute_analytics_from_store_into_snapshot():
+    index = pd.bdate_range('2022-01-03', periods=400)
+    rng = np.random.default_rng(1)
+    for spec in rolling_analytics.ANALYTICS.values():
+        for name in spec['aggregations']:
+            indicator = INDICATORS[name]
+            append_series(indicator.source, indicator.series_id,
+                          pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index)))), index=index))
+
+    results = compute_analytics()
+
+    assert set(results) == {'module_2', 'module_3'}
+    assert results['module_2'].index.dayofweek.max() < 5
+    assert results['module_2']['Gold_Dollar_Correlation'].notna().any()
+    snapshot = from_modules({}, {'Analytics': results})
+    module = snapshot.module('module_2')
+    assert module.value('Gold_Dollar_Correlation') == results['module_2']['Gold_Dollar_Correlation'].iloc[-1]
+    assert 'Gold_ZScore' in module.series and 'Gold_YoY' not in module.series
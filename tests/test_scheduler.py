@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+from scheduler import Job, RefreshScheduler, release_window, next_refresh, fred_job, tic_job, build_jobs
+
+def test_quarterly_series_sleeps_until_release_window():
+    last_obs = pd.Timestamp('2024-04-01')  # Q2 2024, published late July
+    window = release_window(last_obs, 'Q')
+    assert window == pd.Timestamp('2024-10-01') + timedelta(days=28)
+
+    # Before the window, only the monthly revision check
+    checked = pd.Timestamp('2024-08-01')
+    assert next_refresh(last_obs, 'Q', checked) == checked + timedelta(days=30)
+    checked = pd.Timestamp('2024-10-20')
+    assert next_refresh(last_obs, 'Q', checked) == window
+
+    # Inside the window, poll twice a day
+    checked = pd.Timestamp('2024-11-01')
+    assert next_refresh(last_obs, 'Q', checked) == checked + timedelta(hours=12)
+
+def test_weekly_series_polled_from_day_after_next_wednesday():
+    last_obs = pd.Timestamp('2024-06-05')  # Wednesday
+    assert release_window(last_obs, 'W') == pd.Timestamp('2024-06-13')
+    assert next_refresh(last_obs, 'W', pd.Timestamp('2024-06-06 18:00')) == pd.Timestamp('2024-06-07 18:00')
+    assert next_refresh(last_obs, 'W', pd.Timestamp('2024-06-13 09:00')) == pd.Timestamp('2024-06-13 11:00')
+
+def test_tic_window_opens_the_month_after_next():
+    # July 2024 data, the month after the latest (June), came out on September 18
+    job = tic_job()
+    job.last_observation, job.last_run = pd.Timestamp('2024-06-01'), pd.Timestamp('2024-08-20')
+    assert release_window(job.last_observation, job.frequency, job.release_lag) == pd.Timestamp('2024-09-19')
+    assert job.next_due(job.last_run) == pd.Timestamp('2024-08-27')
+
+def test_job_infers_frequency_and_backs_off_on_failure():
+    dates = pd.date_range('2023-01-01', periods=6, freq='QS')
+    results = [dates, None]
+    job = Job('fred:TEST', 'fred', lambda force: results.pop(0))
+    now = pd.Timestamp('2024-05-01')
+
+    assert job.next_due(now) == now
+    assert job.run(now)
+    assert job.frequency == 'Q'
+    assert job.last_observation == pd.Timestamp('2024-04-01')
+    assert job.next_due(now) > now + timedelta(days=20)
+
+    assert not job.run(now)
+    assert job.next_due(now) == now + timedelta(minutes=5)
+
+def test_fred_job_forces_only_after_first_run(mock_requests_get):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    latest = pd.Timestamp.today().normalize()
+    mock_resp.content = f"DATE,WALCL\n{latest - timedelta(days=7):%Y-%m-%d},7300.0\n{latest:%Y-%m-%d},7290.0".encode()
+    mock_requests_get.return_value = mock_resp
+
+    job = fred_job('WALCL')
+    assert job.run(latest + timedelta(hours=12))
+    assert mock_requests_get.call_count == 1
+
+    # Served from the fresh on-disk cache on a restart, forced once scheduled
+    assert fred_job('WALCL').run(latest + timedelta(hours=12))
+    assert mock_requests_get.call_count == 1
+    assert job.run(latest + timedelta(days=1))
+    assert mock_requests_get.call_count == 2
+    assert job.frequency == 'W'
+
+def test_scheduler_bounds_concurrency_per_source():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def refresh(force):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        threading.Event().wait(0.05)
+        with lock:
+            active[0] -= 1
+        return pd.DatetimeIndex(['2024-01-01'])
+
+    jobs = [Job(f'fred:{i}', 'fred', refresh, interval=timedelta(hours=1)) for i in range(6)]
+    scheduler = RefreshScheduler(jobs, max_workers=6, source_limits={'fred': 2})
+    now = pd.Timestamp('2024-06-01')
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = scheduler.run_pending(pool, now)
+        assert len(futures) == 6
+        wait(futures)
+
+    assert peak[0] == 2
+    assert scheduler.due_jobs(now) == []
+    assert len(scheduler.due_jobs(now + timedelta(hours=1))) == 6
+
+def test_build_jobs_deduplicates_series():
+    names = [job.name for job in build_jobs()]
+    assert len(names) == len(set(names))
+    assert 'fred:WALCL' in names and 'yahoo:close' in names and 'worldbank:panel' in names
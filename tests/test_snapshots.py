@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from snapshots import from_modules, to_bytes, from_bytes, to_json, from_json, diff
+
+def make_snapshot(dollar_index=121.5):
+    index = pd.date_range('2024-01-01', periods=3, freq='D')
+    return from_modules({
+        'module_1': pd.DataFrame({'Fiscal_Unsustainability_Ratio': [0.9, np.nan, 1.1]}, index=index),
+        'module_2': {'Dollar_Index': dollar_index, 'Foreign_Confidence_TIC': {'China': '775.0'}},
+        'module_3': {'Energy_Money': None},
+        'module_4': {'News_Volume': {'Tariffs': pd.Series([5.0, 7.0, 9.0], index=index)}}
+    }, {'Dollar_Index': pd.Series([120.0, 121.0, dollar_index], index=index)}, datetime(2024, 6, 1, 12, 0))
+
+def test_binary_and_json_round_trip():
+    snapshot = make_snapshot()
+
+    assert from_bytes(to_bytes(snapshot)) == snapshot
+    assert from_json(to_json(snapshot)) == snapshot
+    assert snapshot.module('module_2').value('Dollar_Index') == 121.5
+    assert snapshot.module('module_3').value('Energy_Money') is None
+
+def test_json_writes_missing_values_as_null():
+    data = json.loads(to_json(make_snapshot()))
+    ratio = data['modules']['module_1']['series']['Fiscal_Unsustainability_Ratio']
+    assert ratio['values'][1] is None
+    assert ratio['dates'][0].startswith('2024-01-01')
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError):
+        from_bytes(b'PK\x03\x04' + bytes(16))
+
+def test_diff_reports_changed_kpis_and_series():
+    changes = diff(make_snapshot(), make_snapshot(dollar_index=122.0))
+
+    old, new = changes['kpis'][('module_2', 'Dollar_Index')]
+    assert (old.value, new.value) == (121.5, 122.0)
+    assert ('module_2', 'Dollar_Index') in changes['series']
+    assert ('module_1', 'Fiscal_Unsustainability_Ratio') not in changes['series']
+    assert len(diff(None, make_snapshot())['kpis']) > 0
+
+def test_stale_sources_round_trip():
+    snapshot = from_modules({}, {}, datetime(2024, 6, 1, 12, 0), stale={'tic': 7200.0})
+
+    assert from_bytes(to_bytes(snapshot)).stale == {'tic': 7200.0}
+    assert from_json(to_json(snapshot)) == snapshot
@@ -0,0 +1,76 @@
+import pytest
+import pandas as pd
+import http_client
+import market_data
+import metrics
+from config import source_url
+from standin_server import Faults, start_standin
+from fred_cache import FRED_CSV_URL, get_fred_series
+from world_bank import fetch_wb_panel
+from fetch_tic_data import fetch_tic_panel
+from fetch_gdelt_news import fetch_gdelt_timeline
+from vintage_store import fetch_alfred, series_as_of
+
+@pytest.fixture
+def standin(monkeypatch):
+    servers = []
+
+    def start(**faults):
+        server = start_standin(faults=Faults(seed=0, **faults))
+        servers.append(server)
+        monkeypatch.setenv('POLYDASH_UPSTREAM', server.url)
+        return server
+
+    http_client.reset_session()
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    http_client.reset_session()
+
+def test_source_url_overrides(monkeypatch):
+    assert source_url(FRED_CSV_URL) == FRED_CSV_URL
+    monkeypatch.setenv('POLYDASH_UPSTREAM', 'http://127.0.0.1:9000')
+    assert source_url(FRED_CSV_URL) == 'http://127.0.0.1:9000/graph/fredgraph.csv'
+    monkeypatch.setenv('POLYDASH_FRED_URL', 'http://fred.local/csv')
+    assert source_url(FRED_CSV_URL, 'POLYDASH_FRED_URL') == 'http://fred.local/csv'
+
+def test_fetchers_against_standin(standin):
+    server = standin()
+
+    s = get_fred_series('WALCL')
+    assert len(s) == 1170
+    assert get_fred_series('WALCL', force=True).index[-1] == s.index[-1]
+
+    panel = fetch_wb_panel(['NY.GDP.MKTP.CD', 'NV.IND.MANF.ZS'], ['USA', 'CHN'], start_year=2014)
+    assert set(panel['country']) == {'USA', 'CHN'}
+
+    assert 'China, Mainland' in fetch_tic_panel().index
+    assert fetch_alfred('GDPC1') == 1234
+    assert series_as_of('GDPC1', '2000-06-30').index[-1] == pd.Timestamp('2000-01-01')
+    assert len(fetch_gdelt_timeline({'Tariffs': 'tariffs'})['Tariffs']) == 8640
+
+    close = market_data.download_close(['GC=F', 'BTC-USD'])
+    assert list(close.columns) == ['BTC-USD', 'GC=F']
+    assert close.index[-1] == pd.Timestamp('2024-06-28')
+
+    assert server.request_counts['fred'] == 3
+    assert server.request_counts['yahoo'] == 2
+
+def test_rate_limits_are_retried(standin, mocker):
+    mocker.patch('time.sleep')
+    server = standin(rate_limit_rate=0.5, retry_after=0)
+    metrics.reset()
+
+    for series_id in ['GS10', 'GS2', 'INDPRO', 'WALCL']:
+        assert get_fred_series(series_id) is not None
+
+    retries = sum(s['value'] for s in metrics.snapshot().get('polydash_retries_total', []))
+    assert server.request_counts['fred'] == 4 + retries
+    assert retries > 0
+
+def test_injected_errors_surface_as_failures(standin, mocker):
+    mocker.patch('time.sleep')
+    standin(error_rate=1.0)
+    assert get_fred_series('GS10') is None
+    assert fetch_tic_panel() is None
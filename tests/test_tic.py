@@ -15,6 +15,7 @@ def test_fetch_tic_data_parsing(mock_requests_get):
 
     mock_response = MagicMock()
     mock_response.text = mock_text
+    mock_response.iter_lines.return_value = mock_text.splitlines()
     mock_response.status_code = 200
     mock_requests_get.return_value = mock_response
 
@@ -34,7 +35,7 @@ def test_fetch_fred_proxy(mock_requests_get):
 2024-01-01,7500.5
 """
     mock_response = MagicMock()
-    mock_response.text = mock_csv
+    mock_response.content = mock_csv.encode()
     mock_response.status_code = 200
     mock_requests_get.return_value = mock_response
 
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from tic_parser import parse_mfh_lines, load_mfh_archive
+
+MFH_SEP_2024 = """
+                        MAJOR FOREIGN HOLDERS OF TREASURY SECURITIES
+                                 (in billions of dollars)
+                              HOLDINGS 1/ AT END OF PERIOD
+
+                         2024    2024    2024
+        Country           Sep     Aug     Jul
+        -------         ------  ------  ------
+
+        Japan           1122.8  1129.4  1111.3
+        China, Mainland  772.0   774.6   775.4
+        United Kingdom   765.6   754.2   746.1
+        Taiwan           n.a.    284.2   281.8
+        Grand Total     8673.4  8634.3  8505.6
+
+ Of which:
+        For. Official   3876.8  3859.1  3821.2
+"""
+
+MFH_OCT_2024 = """
+                         2024    2024
+        Country           Oct     Sep
+        Japan           1130.0  1123.0
+        China, Mainland  760.0   772.0
+        Grand Total     8700.0  8680.0
+"""
+
+def test_parse_mfh_lines_full_table():
+    panel = parse_mfh_lines(MFH_SEP_2024.splitlines())
+
+    assert list(panel.index) == ['Japan', 'China, Mainland', 'United Kingdom', 'Taiwan', 'Grand Total']
+    assert isinstance(panel.columns, pd.DatetimeIndex)
+    # Months are sorted ascending regardless of file order
+    assert list(panel.columns) == list(pd.to_datetime(['2024-07-01', '2024-08-01', '2024-09-01']))
+    assert panel.loc['China, Mainland', pd.Timestamp('2024-09-01')] == 772.0
+    assert panel.dtypes.unique().tolist() == [np.dtype('float64')]
+    assert np.isnan(panel.loc['Taiwan', pd.Timestamp('2024-09-01')])
+
+def test_parse_mfh_lines_accepts_bytes_stream():
+    panel = parse_mfh_lines(line.encode('latin-1') for line in MFH_SEP_2024.splitlines())
+    assert panel.loc['Japan'].iloc[-1] == 1122.8
+
+def test_parse_mfh_lines_without_table():
+    assert parse_mfh_lines(["Page not found"]).empty
+
+def test_load_mfh_archive_deduplicates_revisions(tmp_path):
+    (tmp_path / 'mfh_2024_09.txt').write_text(MFH_SEP_2024)
+    (tmp_path / 'mfh_2024_10.txt').write_text(MFH_OCT_2024)
+
+    history = load_mfh_archive(str(tmp_path), max_workers=2)
+
+    assert list(history.columns) == list(pd.to_datetime(['2024-07-01', '2024-08-01', '2024-09-01', '2024-10-01']))
+    # September as revised in the October release
+    assert history.loc['Japan', pd.Timestamp('2024-09-01')] == 1123.0
+    assert history.loc['Japan', pd.Timestamp('2024-07-01')] == 1111.3
+    assert history.loc['China, Mainland', pd.Timestamp('2024-10-01')] == 760.0
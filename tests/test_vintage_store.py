@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+import vintage_store
+from vintage_store import ingest_alfred, record_vintage, value_as_of, series_as_of, vintage_dates
+from benchmarks import payloads
+from fred_cache import get_fred_series
+from fetch_fiscal_data import SERIES_MAP, fetch_fiscal_vintages, fiscal_data_as_of
+
+GDP_VINTAGES = [
+    {"date": "2024-01-01", "realtime_start": "2024-04-25", "realtime_end": "2024-05-29", "value": "100.0"},
+    {"date": "2024-01-01", "realtime_start": "2024-05-30", "realtime_end": "9999-12-31", "value": "101.0"},
+    {"date": "2024-04-01", "realtime_start": "2024-07-25", "realtime_end": "9999-12-31", "value": "103.0"},
+    # Published once, then withdrawn
+    {"date": "2023-10-01", "realtime_start": "2024-01-25", "realtime_end": "2024-02-27", "value": "99.0"}
+]
+
+def test_value_as_of_follows_alfred_realtime_ranges():
+    assert ingest_alfred('GDP', GDP_VINTAGES) == 5
+    assert ingest_alfred('GDP', GDP_VINTAGES) == 0
+
+    assert value_as_of('GDP', '2024-01-01', '2024-04-24') is None
+    assert value_as_of('GDP', '2024-01-01', '2024-04-25') == 100.0
+    assert value_as_of('GDP', '2024-01-01', '2024-05-30') == 101.0
+    assert value_as_of('GDP', '2023-10-01', '2024-02-01') == 99.0
+    assert np.isnan(value_as_of('GDP', '2023-10-01', '2024-03-01'))
+    assert value_as_of('GDP', '2022-01-01', '2024-03-01') is None
+
+def test_series_as_of_has_no_look_ahead():
+    ingest_alfred('GDP', GDP_VINTAGES)
+
+    assert series_as_of('GDP', '2024-06-30').to_dict() == {pd.Timestamp('2024-01-01'): 101.0}
+    assert series_as_of('GDP', '2024-08-01').tolist() == [101.0, 103.0]
+    assert series_as_of('GDP', '2023-01-01').empty
+    assert len(vintage_dates('GDP')) == 5
+
+def test_record_vintage_keeps_only_revisions():
+    s = pd.Series([1.0, 2.0], index=pd.to_datetime(['2024-01-01', '2024-04-01']))
+    assert record_vintage('X', s, known='2024-05-01') == 2
+    assert record_vintage('X', s, known='2024-06-01') == 0
+    assert record_vintage('X', s.replace(2.0, 2.5), known='2024-07-01') == 1
+
+    assert series_as_of('X', '2024-06-15').tolist() == [1.0, 2.0]
+    assert series_as_of('X', '2024-07-15').tolist() == [1.0, 2.5]
+
+def test_append_after_interrupted_write_keeps_rows_aligned():
+    s = pd.Series([1.0], index=pd.to_datetime(['2024-01-01']))
+    record_vintage('X', s, known='2024-05-01')
+
+    # A crash after the value and known-date writes leaves a row without its period
+    directory = vintage_store._series_dir('X')
+    with open(os.path.join(directory, vintage_store.VALUES_FILE), 'ab') as f:
+        f.write(np.array([99.0]).tobytes())
+    with open(os.path.join(directory, vintage_store.KNOWN_FILE), 'ab') as f:
+        f.write(np.array(['2024-05-02'], dtype='M8[D]').tobytes())
+
+    assert record_vintage('X', pd.Series([2.0], index=pd.to_datetime(['2024-04-01'])), known='2024-06-01') == 1
+    assert series_as_of('X', '2024-06-15').tolist() == [1.0, 2.0]
+
+def test_fred_fetch_records_todays_vintage(mock_requests_get):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.content = b"DATE,GS10\n2024-01-01,4.0\n2024-02-01,4.2\n"
+    mock_requests_get.return_value = mock_resp
+
+    get_fred_series('GS10')
+
+    assert series_as_of('GS10', pd.Timestamp.today()).tolist() == [4.0, 4.2]
+    assert series_as_of('GS10', pd.Timestamp.today() - pd.Timedelta(days=1)).empty
+
+def test_fiscal_kpis_as_of_from_alfred(mock_requests_get):
+    def side_effect(url, *args, **kwargs):
+        series_id = vintage_store.urllib.parse.parse_qs(vintage_store.urllib.parse.urlparse(url).query)['series_id'][0]
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = payloads.alfred_observations(series_id)
+        return mock_resp
+
+    mock_requests_get.side_effect = side_effect
+    assert all(rows > 0 for rows in fetch_fiscal_vintages().values())
+    mock_requests_get.reset_mock()
+
+    df = fiscal_data_as_of('2000-06-30')
+
+    assert mock_requests_get.call_count == 0
+    assert df.index[-1] == pd.Timestamp('2000-01-01')
+    assert set(SERIES_MAP) <= set(df.columns)
+    assert 'Fiscal_Unsustainability_Ratio' in df
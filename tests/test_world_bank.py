@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from world_bank import fetch_wb_panel, latest_entry, to_cube
+from fetch_module_4_data import fetch_world_bank_panel, world_bank_results
+
+def make_entry(indicator, country, year, value):
+    return {"indicator": {"id": indicator}, "countryiso3code": country, "date": str(year), "value": value}
+
+def make_response(payload):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = payload
+    return mock_resp
+
+def test_fetch_wb_panel_batches_and_paginates(mock_requests_get):
+    mock_requests_get.side_effect = [
+        make_response([{"page": 1, "pages": 2}, [
+            make_entry('NY.GDP.MKTP.CD', 'USA', 2023, 27.7e12),
+            make_entry('NY.GDP.MKTP.CD', 'USA', 2024, None),
+            make_entry('NY.GDP.MKTP.CD', 'CHN', 2023, 17.8e12)
+        ]]),
+        make_response([{"page": 2, "pages": 2}, [
+            make_entry('NY.GDP.MKTP.PP.CD', 'USA', 2023, 27.7e12),
+            make_entry('NY.GDP.MKTP.PP.CD', 'CHN', 2023, 34.6e12)
+        ]])
+    ]
+
+    panel = fetch_wb_panel(['NY.GDP.MKTP.CD', 'NY.GDP.MKTP.PP.CD'], ['USA', 'CHN'], start_year=2020, end_year=2024)
+
+    assert mock_requests_get.call_count == 2
+    url = mock_requests_get.call_args_list[0][0][0]
+    assert url.endswith('/country/USA;CHN/indicator/NY.GDP.MKTP.CD;NY.GDP.MKTP.PP.CD')
+    params = mock_requests_get.call_args_list[1].kwargs['params']
+    assert params['page'] == 2
+    assert params['source'] == 2
+    assert params['date'] == '2020:2024'
+
+    assert list(panel.columns) == ['indicator', 'country', 'year', 'value']
+    assert len(panel) == 5
+
+    # Latest non-empty year, not the empty 2024 row
+    assert latest_entry(panel, 'NY.GDP.MKTP.CD', 'USA') == {'date': '2023', 'value': 27.7e12}
+    assert latest_entry(panel, 'NY.GDP.MKTP.PP.CD', 'CHN')['value'] == 34.6e12
+
+    cube = to_cube(panel)
+    assert cube.loc[('NY.GDP.MKTP.CD', 'CHN'), 2023] == 17.8e12
+    assert np.isnan(cube.loc[('NY.GDP.MKTP.CD', 'USA'), 2024])
+
+def test_fetch_wb_panel_api_error(mock_requests_get):
+    mock_requests_get.return_value = make_response([{"message": [{"id": "120", "value": "Invalid value"}]}])
+    assert fetch_wb_panel(['BAD.CODE'], ['USA']) is None
+
+def test_module_4_world_bank_results_single_call(mock_requests_get):
+    mock_requests_get.return_value = make_response([{"page": 1, "pages": 1}, [
+        make_entry('NV.IND.MANF.ZS', 'USA', 2023, 10.3),
+        make_entry('NY.GDP.MKTP.CD', 'USA', 2023, 27.7e12),
+        make_entry('NY.GDP.MKTP.CD', 'CHN', 2023, 17.8e12)
+    ]])
+
+    manuf_share, economic_scale = world_bank_results(fetch_world_bank_panel())
+
+    assert mock_requests_get.call_count == 1
+    assert manuf_share == {'date': '2023', 'value': 10.3}
+    assert economic_scale['GDP_Nominal']['CHN']['value'] == 17.8e12
+    assert economic_scale['GDP_PPP']['USA'] is None
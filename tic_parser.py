@@ -0,0 +1,139 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MONTHS = {m: i for i, m in enumerate(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], start=1)}
+
+# Values such as "n.a." or "*" in a numeric column
+MISSING_MARKERS = {'n.a.', 'na', '*', '-', '--'}
+
+# The country table ends with this row; "Of which" breakdowns follow it
+TABLE_END_LABEL = 'Grand Total'
+
+def _month_number(token):
+    return MONTHS.get(token[:3].title()) if token.isalpha() else None
+
+def _parse_month_header(tokens, previous):
+    """
+    Detects the month header row ('Country  Sep  Aug ...').
+    Returns:
+        list: Month-start Timestamps when the row above holds the years, month labels
+        when it does not, or None if `tokens` is not a month header.
+    """
+    months = []
+    for token in reversed(tokens):
+        number = _month_number(token)
+        if number is None:
+            break
+        months.append((token, number))
+    months.reverse()
+
+    if len(months) < 2 or len(tokens) - len(months) > 1:
+        return None
+
+    years = previous[-len(months):] if len(previous) >= len(months) else []
+    if len(previous) == len(months) and all(len(t) == 4 and t.isdigit() for t in years):
+        return [pd.Timestamp(year=int(y), month=m, day=1) for y, (_, m) in zip(years, months)]
+    return [label for label, _ in months]
+
+def _parse_values(tokens):
+    values = np.empty(len(tokens))
+    for i, token in enumerate(tokens):
+        if token.lower() in MISSING_MARKERS:
+            values[i] = np.nan
+            continue
+        try:
+            values[i] = float(token.replace(',', ''))
+        except ValueError:
+            return None
+    return values
+
+def parse_mfh_lines(lines):
+    """
+    Parses the TIC "Major Foreign Holders of Treasury Securities" table in one pass over its lines.
+    Lines can come straight from a streamed response, so the file is never held in memory.
+    Args:
+        lines (iterable): str or bytes lines of mfh.txt.
+    Returns:
+        pd.DataFrame: Holdings in Billions, one row per country and one float column per month
+        (month-start Timestamps in ascending order when the header has years). Empty if no table is found.
+    """
+    columns = None
+    previous = []
+    labels = []
+    rows = []
+
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('latin-1')
+        tokens = line.split()
+        if not tokens:
+            continue
+
+        if columns is None:
+            columns = _parse_month_header(tokens, previous)
+            previous = tokens
+            continue
+
+        n = len(columns)
+        if len(tokens) <= n:
+            continue
+        values = _parse_values(tokens[-n:])
+        if values is None:
+            continue
+
+        label = ' '.join(tokens[:-n])
+        if label not in labels:
+            labels.append(label)
+            rows.append(values)
+        if label == TABLE_END_LABEL:
+            break
+
+    if columns is None or not rows:
+        return pd.DataFrame()
+
+    panel = pd.DataFrame(np.vstack(rows), index=pd.Index(labels, name='Country'), columns=columns)
+    if isinstance(columns[0], pd.Timestamp):
+        panel.columns = pd.DatetimeIndex(columns, name='Month')
+        panel = panel.sort_index(axis=1)
+    return panel
+
+def parse_mfh_file(path):
+    """Parses an archived mfh.txt file line by line."""
+    with open(path, 'rb') as f:
+        return parse_mfh_lines(f)
+
+def load_mfh_archive(directory, max_workers=None):
+    """
+    Bulk-ingests a directory of archived monthly mfh files into one history panel.
+    Files are parsed in parallel processes. Where releases overlap, the value from the
+    most recent release (the file with the latest month) wins, since it carries revisions.
+    Returns:
+        pd.DataFrame: Country x month panel with deduplicated month columns in ascending order.
+    """
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                   if os.path.isfile(os.path.join(directory, name)))
+    if not paths:
+        return pd.DataFrame()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        panels = list(pool.map(parse_mfh_file, paths))
+
+    dated = []
+    for path, panel in zip(paths, panels):
+        if panel.empty or not isinstance(panel.columns, pd.DatetimeIndex):
+            print(f"Skipping {path}: no dated TIC table found")
+            continue
+        dated.append(panel)
+
+    if not dated:
+        return pd.DataFrame()
+
+    # Oldest release first, so later releases overwrite revised months
+    dated.sort(key=lambda panel: panel.columns.max())
+    history = pd.concat([panel.stack().rename('value') for panel in dated]).reset_index()
+    history = history.drop_duplicates(subset=['Country', 'Month'], keep='last')
+    return history.pivot(index='Country', columns='Month', values='value').sort_index(axis=1)
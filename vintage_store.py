@@ -0,0 +1,317 @@
+"""
+Point-in-time (bitemporal) store of FRED series vintages.
+
+Every observation is recorded with the date it became known (its ALFRED realtime_start),
+so a series can be read back exactly as it was published on any past date:
+    value_as_of('GS10', '2020-03-01', as_of='2020-04-15')   # one period, as known then
+    series_as_of('GS10', as_of='2020-04-15')                # full history, as known then
+
+Each series is three append-only column files of equal length under
+<cache_dir>/vintages/<series>/: observation period, known date and value. A NaN value
+records that the observation was withdrawn.
+"""
+import os
+import threading
+import urllib.parse
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import http_client
+import metrics
+from config import cache_dir, source_url
+from parsing import DATE_UNIT
+
+# ALFRED observations endpoint (FRED API). Needs an API key in FRED_API_KEY.
+ALFRED_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+# ALFRED's realtime range covering every vintage
+REALTIME_START = '1776-07-04'
+REALTIME_END = '9999-12-31'
+
+PERIODS_FILE = 'periods.M8'  # datetime64[D], observation date
+KNOWN_FILE = 'known.M8'      # datetime64[D], first day the value was current
+VALUES_FILE = 'values.f8'    # float64, NaN when withdrawn
+
+DAY_DTYPE = np.dtype('M8[D]')
+VALUE_DTYPE = np.dtype('f8')
+
+# Index keys pack (period rank, known day) into one int64, so an as-of lookup is one binary search
+_DAY_BITS = 32
+_DAY_OFFSET = 1 << 31  # Known days before 1970 are negative
+
+_locks = {}
+_locks_guard = threading.Lock()
+_indexes = {}
+
+def vintage_dir():
+    """Returns the root directory of the vintage store."""
+    return os.path.join(cache_dir(), 'vintages')
+
+def _series_dir(series_id):
+    return os.path.join(vintage_dir(), urllib.parse.quote(series_id, safe=''))
+
+def _series_lock(series_id):
+    with _locks_guard:
+        return _locks.setdefault(series_id, threading.Lock())
+
+def _day(value):
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+def _days(values):
+    return np.asarray(pd.DatetimeIndex(values).values.astype(DAY_DTYPE))
+
+class VintageIndex:
+    """
+    In-memory index of one series' vintages, sorted by (period, known date).
+    Rows recorded later win over rows with the same period and known date.
+    """
+
+    __slots__ = ('periods', 'keys', 'values', 'length')
+
+    def __init__(self, periods, known, values):
+        self.length = len(values)
+        # lexsort is stable, so append order breaks ties
+        order = np.lexsort((known, periods))
+        periods, known = periods[order], known[order]
+        self.values = values[order]
+        self.periods, ranks = np.unique(periods, return_inverse=True)
+        self.keys = self._key(ranks, known)
+
+    @staticmethod
+    def _key(ranks, days):
+        return (np.asarray(ranks, dtype='int64') << _DAY_BITS) | (days.astype('int64') + _DAY_OFFSET)
+
+    def lookup(self, ranks, as_of):
+        """
+        Returns (positions, found) of the rows current on `as_of` for each period rank.
+        `found` is False for periods not yet published on that date.
+        """
+        positions = np.searchsorted(self.keys, self._key(ranks, np.asarray(as_of, dtype=DAY_DTYPE)), side='right') - 1
+        found = positions >= 0
+        found[found] = (self.keys[positions[found]] >> _DAY_BITS) == np.asarray(ranks)[found]
+        return positions, found
+
+    def value_as_of(self, period, as_of):
+        rank = np.searchsorted(self.periods, period)
+        if rank == len(self.periods) or self.periods[rank] != period:
+            return None
+        positions, found = self.lookup(np.array([rank]), as_of)
+        return float(self.values[positions[0]]) if found[0] else None
+
+    def series_as_of(self, as_of):
+        positions, found = self.lookup(np.arange(len(self.periods)), as_of)
+        values = self.values[positions[found]]
+        periods = self.periods[found]
+        known = ~np.isnan(values)
+        return periods[known], values[known]
+
+_COLUMNS = [(PERIODS_FILE, DAY_DTYPE), (KNOWN_FILE, DAY_DTYPE), (VALUES_FILE, VALUE_DTYPE)]
+
+def _column_paths(directory):
+    return [os.path.join(directory, name) for name, _ in _COLUMNS]
+
+def _common_length(paths):
+    # Values and known dates are written before periods, so a row only counts once every column holds it
+    return min(os.path.getsize(path) // dtype.itemsize for path, (_, dtype) in zip(paths, _COLUMNS))
+
+def _read_columns(series_id):
+    paths = _column_paths(_series_dir(series_id))
+    if not all(os.path.exists(path) for path in paths):
+        return np.empty(0, dtype=DAY_DTYPE), np.empty(0, dtype=DAY_DTYPE), np.empty(0, dtype=VALUE_DTYPE)
+
+    length = _common_length(paths)
+    return tuple(np.fromfile(path, dtype=dtype, count=length) for path, (_, dtype) in zip(paths, _COLUMNS))
+
+def _truncate_columns(directory):
+    """
+    Cuts the three column files to the rows they have in common. An append interrupted
+    between the writes leaves values without periods, which would misalign every later row.
+    """
+    paths = _column_paths(directory)
+    existing = [path for path in paths if os.path.exists(path)]
+    length = _common_length(paths) if len(existing) == len(paths) else 0
+    for path, (_, dtype) in zip(paths, _COLUMNS):
+        if path in existing and os.path.getsize(path) != length * dtype.itemsize:
+            os.truncate(path, length * dtype.itemsize)
+
+def _stored_rows(series_id):
+    path = os.path.join(_series_dir(series_id), PERIODS_FILE)
+    return os.path.getsize(path) // DAY_DTYPE.itemsize if os.path.exists(path) else 0
+
+def get_index(series_id):
+    """
+    Returns the VintageIndex of a series, rebuilt only when rows were appended since the last call.
+    """
+    # Keyed by directory, so a different cache dir never sees another store's index
+    key = _series_dir(series_id)
+    rows = _stored_rows(series_id)
+    index = _indexes.get(key)
+    if index is None or index.length != rows:
+        index = VintageIndex(*_read_columns(series_id))
+        _indexes[key] = index
+    return index
+
+def clear_cache():
+    """Drops the in-memory indexes (the column files are kept)."""
+    _indexes.clear()
+
+def append_vintages(series_id, periods, known, values):
+    """
+    Appends vintage rows, skipping those that do not change what was known on their date.
+    Args:
+        periods, known: Observation dates and the dates their values became known.
+        values: Float values; NaN marks a withdrawn observation.
+    Returns:
+        int: Number of rows appended.
+    """
+    periods, known = _days(periods), _days(known)
+    values = np.asarray(values, dtype=VALUE_DTYPE)
+    if len(values) == 0:
+        return 0
+
+    with _series_lock(series_id):
+        index = get_index(series_id)
+        # Value each row's period held on the row's own known date, where it had been published
+        current = np.full(len(values), np.nan)
+        published = np.zeros(len(values), dtype=bool)
+        ranks = np.searchsorted(index.periods, periods)
+        stored = ranks < len(index.periods)
+        stored[stored] = index.periods[ranks[stored]] == periods[stored]
+        positions, found = index.lookup(ranks[stored], known[stored])
+        rows = np.flatnonzero(stored)[found]
+        current[rows] = index.values[positions[found]]
+        published[rows] = True
+        # A withdrawal (NaN) is a change too, unless the stored value was already withdrawn
+        changed = ~(published & ((current == values) | (np.isnan(current) & np.isnan(values))))
+        if not changed.any():
+            return 0
+
+        directory = _series_dir(series_id)
+        os.makedirs(directory, exist_ok=True)
+        _truncate_columns(directory)
+        with open(os.path.join(directory, VALUES_FILE), 'ab') as f:
+            f.write(values[changed].tobytes())
+        with open(os.path.join(directory, KNOWN_FILE), 'ab') as f:
+            f.write(known[changed].tobytes())
+        with open(os.path.join(directory, PERIODS_FILE), 'ab') as f:
+            f.write(periods[changed].tobytes())
+        return int(changed.sum())
+
+def record_vintage(series_id, s, known=None):
+    """
+    Records a fetched series as known on `known` (today by default). Only new and revised
+    observations are stored. Store errors are reported but never fail the fetch.
+    Args:
+        s (pd.Series): Values indexed by observation date; missing values are skipped.
+    Returns:
+        int: Number of rows appended.
+    """
+    try:
+        s = pd.to_numeric(s, errors='coerce').dropna()
+        known = _day(known or date.today())
+        return append_vintages(series_id, s.index, np.full(len(s), known), s.to_numpy(dtype=VALUE_DTYPE))
+    except Exception as e:
+        print(f"Error recording vintage of {series_id}: {e}")
+        return 0
+
+def alfred_rows(observations):
+    """
+    Converts ALFRED observations (date, realtime_start, realtime_end, value) into vintage rows.
+    An observation whose last realtime range closes without a successor was withdrawn; it gets
+    a NaN row on the day after its realtime_end.
+    Returns:
+        tuple: (periods, known, values) arrays.
+    """
+    if not observations:
+        return np.empty(0, dtype=DAY_DTYPE), np.empty(0, dtype=DAY_DTYPE), np.empty(0, dtype=VALUE_DTYPE)
+    df = pd.DataFrame(observations, columns=['date', 'realtime_start', 'realtime_end', 'value'])
+    periods = pd.to_datetime(df['date']).values.astype(DAY_DTYPE)
+    starts = pd.to_datetime(df['realtime_start']).values.astype(DAY_DTYPE)
+    # '9999-12-31' is outside pandas' datetime range
+    ends = df['realtime_end'].to_numpy(dtype=str).astype(DAY_DTYPE)
+    values = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=VALUE_DTYPE)
+
+    # Ranges closing on the day before another range of the same period starts are revisions
+    period_days, start_days, end_days = periods.astype('int64'), starts.astype('int64'), ends.astype('int64')
+    successors = set(zip(period_days.tolist(), start_days.tolist()))
+    open_end = np.datetime64(REALTIME_END, 'D').astype('int64')
+    withdrawn = np.array([end != open_end and (period, end + 1) not in successors
+                          for period, end in zip(period_days.tolist(), end_days.tolist())], dtype=bool)
+    return (np.concatenate([periods, periods[withdrawn]]),
+            np.concatenate([starts, ends[withdrawn] + np.timedelta64(1, 'D')]),
+            np.concatenate([values, np.full(withdrawn.sum(), np.nan)]))
+
+def ingest_alfred(series_id, observations):
+    """Appends ALFRED observations (see alfred_rows()). Returns the number of rows appended."""
+    return append_vintages(series_id, *alfred_rows(observations))
+
+def build_alfred_url(series_id, api_key=None):
+    """Builds the ALFRED URL for every vintage of a series (api_key defaults to FRED_API_KEY)."""
+    params = {
+        'series_id': series_id,
+        'realtime_start': REALTIME_START,
+        'realtime_end': REALTIME_END,
+        'file_type': 'json',
+        'api_key': api_key or os.environ.get('FRED_API_KEY', '')
+    }
+    return f"{source_url(ALFRED_URL, 'POLYDASH_ALFRED_URL')}?{urllib.parse.urlencode(params)}"
+
+def fetch_alfred(series_id, api_key=None):
+    """
+    Downloads every vintage of a series from ALFRED (or the stand-in) into the store.
+    Args:
+        api_key (str): FRED API key; the FRED_API_KEY environment variable when None.
+    Returns:
+        int: Number of rows appended, or None if failure.
+    """
+    try:
+        response = http_client.get(build_alfred_url(series_id, api_key))
+        response.raise_for_status()
+        with metrics.timed('polydash_parse_seconds', source='fred', series=series_id):
+            observations = response.json().get('observations', [])
+        return ingest_alfred(series_id, observations)
+    except Exception as e:
+        print(f"Error fetching vintages of {series_id}: {e}")
+        metrics.record_error('fred', e, series_id)
+        return None
+
+def value_as_of(series_id, period, as_of):
+    """
+    Returns the value of one observation as it was known on `as_of`, or None if it was not
+    published yet (NaN if it had been withdrawn).
+    """
+    return get_index(series_id).value_as_of(_day(period), _day(as_of))
+
+def series_as_of(series_id, as_of):
+    """
+    Returns the full history of a series as it was published on `as_of`.
+    Returns:
+        pd.Series: Float values indexed by observation date (empty if nothing was known yet).
+    """
+    periods, values = get_index(series_id).series_as_of(_day(as_of))
+    return pd.Series(values, index=pd.DatetimeIndex(periods.astype(f'M8[{DATE_UNIT}]'), name='DATE'), name=series_id)
+
+def panel_as_of(series_ids, as_of):
+    """
+    Returns {name: series as published on `as_of`} for a {name: series_id} map,
+    leaving out series with nothing known yet.
+    """
+    panel = {}
+    for name, series_id in series_ids.items():
+        s = series_as_of(series_id, as_of)
+        if not s.empty:
+            panel[name] = s
+    return panel
+
+def vintage_dates(series_id):
+    """Returns the sorted distinct dates on which the stored series changed."""
+    return np.unique(_read_columns(series_id)[1])
+
+def list_series():
+    """Returns the ids of every series with stored vintages."""
+    directory = vintage_dir()
+    if not os.path.isdir(directory):
+        return []
+    return sorted(urllib.parse.unquote(name) for name in os.listdir(directory))
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import http_client
+from config import source_url
+import metrics
+from indicator_store import store_series
+from parsing import world_bank_columns
+
+WB_API_URL = "https://api.worldbank.org/v2"
+
+# World Development Indicators. The API needs an explicit source to serve several indicators in one call.
+WDI_SOURCE = 2
+
+# Rows per page; pages are followed until the API reports the last one
+PER_PAGE = 1000
+
+G20_COUNTRIES = ['ARG', 'AUS', 'BRA', 'CAN', 'CHN', 'DEU', 'FRA', 'GBR', 'IDN', 'IND',
+                 'ITA', 'JPN', 'KOR', 'MEX', 'RUS', 'SAU', 'TUR', 'USA', 'ZAF']
+
+PANEL_COLUMNS = ['indicator', 'country', 'year', 'value']
+
+def build_wb_url(indicators, countries):
+    """Builds the API URL for several countries and indicators (semicolon-separated lists)."""
+    return f"{source_url(WB_API_URL, 'POLYDASH_WORLDBANK_URL')}/country/{';'.join(countries)}/indicator/{';'.join(indicators)}"
+
+def fetch_wb_panel(indicators, countries, start_year=None, end_year=None):
+    """
+    Fetches many World Bank indicators for many countries in as few calls as possible.
+    Args:
+        indicators (list): Indicator codes, e.g. ['NY.GDP.MKTP.CD', 'NY.GDP.MKTP.PP.CD'].
+        countries (list): ISO3 country codes, e.g. ['USA', 'CHN'] or G20_COUNTRIES.
+        start_year, end_year (int): Optional year range; full history when omitted.
+    Returns:
+        pd.DataFrame: Tidy panel with 'indicator', 'country', 'year', 'value' columns
+        (value NaN where the World Bank has no data), or None if failure.
+    """
+    params = {'format': 'json', 'per_page': PER_PAGE}
+    if len(indicators) > 1:
+        params['source'] = WDI_SOURCE
+    if start_year is not None or end_year is not None:
+        params['date'] = f"{start_year or 1960}:{end_year or datetime.now().year}"
+
+    url = build_wb_url(indicators, countries)
+    pages_columns = []
+    page, pages = 1, 1
+    try:
+        while page <= pages:
+            response = http_client.get(url, params=dict(params, page=page))
+            response.raise_for_status()
+            # Decoding the JSON body is most of the parse time
+            with metrics.timed('polydash_parse_seconds', source='worldbank'):
+                data = response.json()
+                meta = data[0] if data else {}
+                if 'message' in meta:
+                    raise ValueError(meta['message'])
+                pages = int(meta.get('pages', 1) or 1)
+                if len(data) > 1 and data[1]:
+                    pages_columns.append(world_bank_columns(data[1], indicators, countries))
+            page += 1
+    except Exception as e:
+        print(f"Error fetching World Bank {';'.join(indicators)} for {';'.join(countries)}: {e}")
+        metrics.record_error('worldbank', e)
+        return None
+
+    columns = {column: np.concatenate([page[column] for page in pages_columns])
+               for column in PANEL_COLUMNS} if pages_columns else {}
+    panel = pd.DataFrame(columns, columns=PANEL_COLUMNS)
+    panel = panel.drop_duplicates(subset=['indicator', 'country', 'year'], keep='last')
+    panel = panel.sort_values(['indicator', 'country', 'year'], ignore_index=True)
+
+    for (indicator, country), group in panel.groupby(['indicator', 'country']):
+        index = pd.to_datetime(group['year'].astype(str), format='%Y')
+        store_series('worldbank', f"{country}.{indicator}", pd.Series(group['value'].to_numpy(), index=index))
+
+    return panel
+
+def latest_entry(panel, indicator, country):
+    """
+    Returns the latest non-empty observation in the shape of a World Bank API entry.
+    Returns:
+        dict: {'date': '2023', 'value': float}, or None if there is none.
+    """
+    if panel is None or panel.empty:
+        return None
+    rows = panel[(panel['indicator'] == indicator) & (panel['country'] == country)].dropna(subset=['value'])
+    if rows.empty:
+        return None
+    row = rows.loc[rows['year'].idxmax()]
+    return {'date': str(row['year']), 'value': float(row['value'])}
+
+def to_cube(panel):
+    """Pivots a tidy panel into an indicator x country x year frame (indicator/country rows, year columns)."""
+    return panel.pivot(index=['indicator', 'country'], columns='year', values='value')